@@ -0,0 +1,118 @@
+"""Benchmark offline batch denoising against a pass-through LADSPA plugin.
+
+python -m benchmarks.batch --files 8 --seconds 30 --workers 1 4
+python -m benchmarks.batch --plugin ~/.ladspa/libdeep_filter_ladspa.so
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from core.audio_file import WavWriter
+from core.batch_processor import BatchProcessor, output_path_for, process_file
+from models.batch_job import BatchJob
+
+SOURCE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "passthrough_ladspa.c"
+)
+RATE = 48000
+
+
+def build_passthrough(directory: str) -> str:
+    """Compile pass-through plugin, return path of the .so"""
+    path = os.path.join(directory, "passthrough.so")
+    subprocess.run(
+        [os.environ.get("CC", "cc"), "-shared", "-fPIC", "-O2", "-o", path, SOURCE],
+        check=True,
+    )
+    return path
+
+
+def write_signal(path: str, seconds: float, channels: int = 1, seed: int = 0):
+    """Write noisy sine as 16-bit WAV"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * RATE), dtype=np.float32) / RATE
+    signal = 0.3 * np.sin(2 * np.pi * 440 * t) + 0.05 * rng.standard_normal(len(t))
+    frames = np.repeat(signal.astype(np.float32)[:, None], channels, axis=1)
+    writer = WavWriter(path, RATE, channels)
+    writer.write(frames)
+    writer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--channels", type=int, default=1)
+    parser.add_argument("--block-size", type=int, default=1024)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--plugin", help="LADSPA .so, default compiled pass-through")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="deepfilter-batch-")
+    try:
+        plugin = args.plugin or build_passthrough(directory)
+        jobs = []
+        for i in range(args.files):
+            path = os.path.join(directory, f"input{i}.wav")
+            write_signal(path, args.seconds, args.channels, seed=i)
+            jobs.append(
+                BatchJob(
+                    path, output_path_for(path), plugin, block_size=args.block_size
+                )
+            )
+
+        # Pass-through must reproduce the input exactly
+        check = process_file(jobs[0])
+        identical = None
+        if not args.plugin and check.success:
+            with open(jobs[0].input_path, "rb") as a, open(
+                check.output_path, "rb"
+            ) as b:
+                identical = a.read() == b.read()
+
+        results = []
+        for workers in args.workers:
+            start = time.perf_counter()
+            batch = BatchProcessor(workers).run(jobs)
+            wall = time.perf_counter() - start
+            audio = sum(result.duration for result in batch)
+            results.append(
+                {
+                    "workers": workers,
+                    "files": len(jobs),
+                    "errors": [r.error for r in batch if not r.success],
+                    "audio_seconds": round(audio, 2),
+                    "wall_seconds": round(wall, 3),
+                    "realtime_factor": round(wall / audio, 5) if audio else None,
+                    "per_file_realtime_factor": round(
+                        max(r.realtime_factor for r in batch), 5
+                    ),
+                }
+            )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(
+        json.dumps(
+            {
+                "meta": {"timestamp": time.time(), "block_size": args.block_size},
+                "passthrough_identical": identical,
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    return 0 if identical is not False else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Compare CPU of channel-matched chains with forced 48 kHz mono chains.
+
+python -m benchmarks.chain_formats --rates 48000 44100 --channels 1 2
+python -m benchmarks.chain_formats --plugin ~/.ladspa/libdeep_filter_ladspa.so
+
+Conversions run in numpy as a stand-in for the PipeWire adapters: channels
+are averaged for the downmix and linearly interpolated for the resampler.
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.batch import build_passthrough
+from core.config_manager import ATTENUATION_CONTROL
+from models.filter_chain_config import MONO_LABEL, PLUGIN_RATE, matched_format
+from system.ladspa_host import DataPointer, LadspaPlugin
+
+
+def source_signal(rate: int, channels: int, seconds: float) -> np.ndarray:
+    """Noisy tone with slightly different channels, frames x channels"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(rate * seconds), dtype=np.float32) / rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    return np.stack(
+        [tone + 0.05 * rng.standard_normal(len(t)) for _ in range(channels)], axis=1
+    ).astype(np.float32)
+
+
+def run_path(
+    plugin_path: str,
+    label: str,
+    samples: np.ndarray,
+    rate: int,
+    block_size: int,
+) -> Dict[str, object]:
+    """CPU seconds of conversion and plugin per second of source audio"""
+    plugin = LadspaPlugin(plugin_path, label)
+    chain_channels = len(plugin.audio_inputs)
+    out_size = int(round(block_size * PLUGIN_RATE / rate))
+    inputs = np.zeros((chain_channels, out_size), dtype=np.float32)
+    outputs = np.zeros((chain_channels, out_size), dtype=np.float32)
+    source_x = np.arange(block_size, dtype=np.float32)
+    chain_x = np.linspace(0, block_size - 1, out_size, dtype=np.float32)
+    resample = rate != PLUGIN_RATE
+    downmix = samples.shape[1] != chain_channels
+
+    convert_s = plugin_s = 0.0
+    n_blocks = len(samples) // block_size
+    clock = time.process_time
+    with plugin.instantiate(PLUGIN_RATE, {ATTENUATION_CONTROL: 100.0}) as instance:
+        for port, buffer in zip(plugin.audio_inputs, inputs):
+            instance.connect(port, buffer.ctypes.data_as(DataPointer))
+        for port, buffer in zip(plugin.audio_outputs, outputs):
+            instance.connect(port, buffer.ctypes.data_as(DataPointer))
+
+        for i in range(n_blocks):
+            start = clock()
+            block = samples[i * block_size : (i + 1) * block_size]
+            if downmix:
+                block = block.mean(axis=1, keepdims=True)
+            for channel in range(chain_channels):
+                if resample:
+                    inputs[channel] = np.interp(chain_x, source_x, block[:, channel])
+                else:
+                    inputs[channel] = block[:, channel]
+            converted = clock()
+            instance.run(out_size)
+            plugin_s += clock() - converted
+            convert_s += converted - start
+
+    audio_seconds = n_blocks * block_size / rate
+    return {
+        "label": label,
+        "chain_channels": chain_channels,
+        "downmix": downmix,
+        "resample": resample,
+        "convert_cpu": round(convert_s / audio_seconds, 5),
+        "plugin_cpu": round(plugin_s / audio_seconds, 5),
+        "total_cpu": round((convert_s + plugin_s) / audio_seconds, 5),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rates", type=int, nargs="+", default=[48000, 44100])
+    parser.add_argument("--channels", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--block-size", type=int, default=1024)
+    parser.add_argument("--plugin", help="LADSPA .so, default compiled pass-through")
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="deepfilter-formats-")
+    try:
+        plugin = args.plugin or build_passthrough(directory)
+        results = []
+        for rate in args.rates:
+            for channels in args.channels:
+                samples = source_signal(rate, channels, args.seconds)
+                label = matched_format(channels)[0]
+                results.append(
+                    {
+                        "source": f"{channels}ch {rate}Hz",
+                        "forced_mono": run_path(
+                            plugin, MONO_LABEL, samples, rate, args.block_size
+                        ),
+                        "matched": run_path(
+                            plugin, label, samples, rate, args.block_size
+                        ),
+                    }
+                )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(
+        json.dumps(
+            {
+                "meta": {
+                    "timestamp": time.time(),
+                    "block_size": args.block_size,
+                    "plugin": args.plugin or "passthrough",
+                },
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Minimal pipewire-pulse native protocol server for PulseClient."""
+
+import os
+import socket
+import struct
+import threading
+from typing import Dict, List, Tuple
+
+from benchmarks.fake_tools import serial
+from system.pulse_client import (
+    COMMAND_AUTH,
+    COMMAND_CHANNEL,
+    COMMAND_ERROR,
+    COMMAND_GET_MODULE_INFO,
+    COMMAND_GET_MODULE_INFO_LIST,
+    COMMAND_GET_SERVER_INFO,
+    COMMAND_GET_SOURCE_INFO,
+    COMMAND_GET_SOURCE_INFO_LIST,
+    COMMAND_LOAD_MODULE,
+    COMMAND_REPLY,
+    COMMAND_SET_CLIENT_NAME,
+    COMMAND_UNLOAD_MODULE,
+    DESCRIPTOR_SIZE,
+    PROTOCOL_VERSION_MASK,
+    TagReader,
+    TagWriter,
+)
+
+SERVER_VERSION = 35
+ERROR_NO_ENTITY = 5
+ERROR_NOT_SUPPORTED = 19
+
+
+class FakePulseServer:
+    """Serve module and source lists over a Unix socket"""
+
+    def __init__(self, socket_path: str, state: dict, version: int = SERVER_VERSION):
+        self.socket_path = socket_path
+        self.version = version
+        self.sources: List[Tuple[int, str, str]] = [
+            (serial(node_id), name, description)
+            for node_id, name, description in state["sources"]
+        ]
+        self.modules: Dict[int, Tuple[str, str]] = {
+            module_id: (name, args) for module_id, name, args in state["modules"]
+        }
+        self.next_module = state["next_module"]
+        self.default_sink = state["default_sink"]
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    def start(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self._sock.bind(self.socket_path)
+        self._sock.listen()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def stop(self):
+        self._sock.close()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    @staticmethod
+    def _recv_exact(conn: socket.socket, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError
+            data += chunk
+        return bytes(data)
+
+    def _handle(self, conn: socket.socket):
+        try:
+            while True:
+                length = struct.unpack(
+                    ">IIIII", self._recv_exact(conn, DESCRIPTOR_SIZE)
+                )[0]
+                request = TagReader(self._recv_exact(conn, length))
+                command = request.u32()
+                tag = request.u32()
+                reply = self._reply(command, tag, request)
+                conn.sendall(
+                    struct.pack(">IIIII", len(reply.data), COMMAND_CHANNEL, 0, 0, 0)
+                    + bytes(reply.data)
+                )
+        except (ConnectionError, OSError):
+            conn.close()
+
+    def _reply(self, command: int, tag: int, request: TagReader) -> TagWriter:
+        reply = TagWriter().u32(COMMAND_REPLY).u32(tag)
+
+        if command == COMMAND_AUTH:
+            # Both sides speak the lower version from here on
+            self.version = min(self.version, request.u32() & PROTOCOL_VERSION_MASK)
+            reply.u32(self.version)
+        elif command == COMMAND_SET_CLIENT_NAME:
+            reply.u32(1)
+        elif command == COMMAND_LOAD_MODULE:
+            name, args = request.string(), request.string()
+            self.modules[self.next_module] = (name, args or "")
+            reply.u32(self.next_module)
+            self.next_module += 1
+        elif command == COMMAND_UNLOAD_MODULE:
+            if self.modules.pop(request.u32(), None) is None:
+                return TagWriter().u32(COMMAND_ERROR).u32(tag).u32(ERROR_NO_ENTITY)
+        elif command == COMMAND_GET_MODULE_INFO_LIST:
+            for module_id, (name, args) in self.modules.items():
+                reply.u32(module_id).string(name).string(args).u32(0xFFFFFFFF)
+                reply.proplist({})
+        elif command == COMMAND_GET_MODULE_INFO:
+            module_id = request.u32()
+            if module_id not in self.modules:
+                return TagWriter().u32(COMMAND_ERROR).u32(tag).u32(ERROR_NO_ENTITY)
+            name, args = self.modules[module_id]
+            reply.u32(module_id).string(name).string(args).u32(0xFFFFFFFF)
+            reply.proplist({})
+        elif command == COMMAND_GET_SERVER_INFO:
+            reply.string("PulseAudio (on PipeWire)").string("15.0.0")
+            reply.string("user").string("host")
+            reply.data += b"a" + struct.pack(">BBI", 3, 2, 48000)
+            reply.string(self.default_sink).string(None).u32(0)
+        elif command == COMMAND_GET_SOURCE_INFO_LIST:
+            for index, name, description in self.sources:
+                self._write_source(reply, self.version, index, name, description)
+        elif command == COMMAND_GET_SOURCE_INFO:
+            wanted = request.u32()
+            for index, name, description in self.sources:
+                if index == wanted:
+                    self._write_source(reply, self.version, index, name, description)
+                    break
+            else:
+                return TagWriter().u32(COMMAND_ERROR).u32(tag).u32(ERROR_NO_ENTITY)
+        else:
+            return TagWriter().u32(COMMAND_ERROR).u32(tag).u32(ERROR_NOT_SUPPORTED)
+        return reply
+
+    @staticmethod
+    def _write_source(
+        reply: TagWriter, version: int, index: int, name: str, description: str
+    ):
+        """Write source info in the layout of protocol version"""
+        reply.u32(index).string(name).string(description)
+        reply.data += b"a" + struct.pack(">BBI", 3, 1, 48000)  # sample spec
+        reply.data += b"m\x01\x00"  # channel map
+        reply.u32(0xFFFFFFFF)  # owner module
+        reply.data += b"v\x01" + struct.pack(">I", 0x10000) + b"0"  # volume, mute
+        reply.u32(0xFFFFFFFF).string(None)  # monitor of sink
+        reply.data += b"U" + bytes(8)  # latency
+        reply.string("PipeWire").u32(0)  # driver, flags
+        reply.proplist({"device.class": "sound"})
+        reply.data += b"U" + bytes(8)  # configured latency
+        reply.data += b"V" + struct.pack(">I", 0x10000)  # base volume
+        reply.u32(0).u32(0x10001).u32(0xFFFFFFFF)  # state, steps, card
+        reply.u32(1)  # ports
+        reply.string("analog-input").string("Microphone").u32(0)
+        if version >= 24:
+            reply.u32(2)  # available
+        if version >= 34:
+            reply.string(None).u32(0)  # availability group, type
+        reply.string("analog-input")  # active port
+        if version >= 22:
+            reply.data += b"B\x01" + b"fB\x01"  # one PCM format
+            reply.proplist({})
@@ -0,0 +1,373 @@
+"""Scriptable stand-ins for pactl, pw-cli, pw-dump and systemctl.
+
+State lives in the JSON file named by FAKE_PW_STATE, so every call sees
+modules loaded by earlier calls. FAKE_PW_LATENCY_MS adds a fixed delay.
+"""
+
+import json
+import os
+import re
+import signal
+import sys
+import time
+
+FILTER_NODES = ["effect_input.deep_filter", "effect_output.deep_filter"]
+# Pulse indexes are object serials, which differ from PipeWire global ids
+SERIAL_OFFSET = 1000
+
+
+def serial(node_id: int) -> int:
+    return node_id + SERIAL_OFFSET
+
+
+def generate_state(n_sources: int, n_modules: int, connected: bool = True) -> dict:
+    """Build synthetic graph with n sources and n modules"""
+    sources = [
+        [100 + i, f"alsa_input.usb-Mic_{i}.mono-fallback", f"USB Microphone {i}"]
+        for i in range(n_sources)
+    ]
+    modules = [
+        [536870912 + i, "module-null-sink", f"sink_name=null_{i}"]
+        for i in range(n_modules)
+    ]
+    if connected and sources:
+        modules.append(
+            [
+                536870912 + n_modules,
+                "module-loopback",
+                f"source={sources[0][1]} sink=effect_input.deep_filter latency_msec=20",
+            ]
+        )
+    return {
+        "sources": sources,
+        "modules": modules,
+        "next_module": 536870912 + n_modules + 1,
+        "default_sink": "alsa_output.speakers",
+        "filter_nodes": list(FILTER_NODES),
+        # Graph runs without xruns down to these settings
+        "stable_quantum": 128,
+        "stable_latency_ms": 6,
+        "force_quantum": 0,
+        "errors": 0,
+    }
+
+
+def load_state() -> dict:
+    with open(os.environ["FAKE_PW_STATE"]) as f:
+        return json.load(f)
+
+
+def save_state(state: dict):
+    path = os.environ["FAKE_PW_STATE"]
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def parse_args(args: str) -> dict:
+    return dict(arg.split("=", 1) for arg in args.split() if "=" in arg)
+
+
+def node_objects(state: dict) -> list:
+    """Nodes as pw-dump would report them"""
+    nodes = [
+        {"id": node_id, "name": name, "description": desc, "class": "Audio/Source"}
+        for node_id, name, desc in state["sources"]
+    ]
+    nodes.append(
+        {
+            "id": 40,
+            "name": state["default_sink"],
+            "description": "Speakers",
+            "class": "Audio/Sink",
+        }
+    )
+    for offset, name in enumerate(state.get("filter_nodes", FILTER_NODES)):
+        nodes.append(
+            {
+                "id": 50 + offset,
+                "name": name,
+                "description": "DeepFilter",
+                "class": (
+                    "Audio/Source" if name.startswith("effect_output") else "Audio/Sink"
+                ),
+            }
+        )
+
+    next_id = 10000
+    for module_id, name, args in state["modules"]:
+        if name != "module-loopback":
+            continue
+        parsed = parse_args(args)
+        for media_class, target in (
+            ("Stream/Input/Audio", parsed.get("source")),
+            ("Stream/Output/Audio", parsed.get("sink")),
+        ):
+            nodes.append(
+                {
+                    "id": next_id,
+                    "name": f"loopback-{module_id}",
+                    "description": "Loopback",
+                    "class": media_class,
+                    "module": module_id,
+                    "target": target,
+                }
+            )
+            next_id += 1
+    return nodes
+
+
+def pactl(argv: list) -> int:
+    state = load_state()
+    command = argv[:2]
+    if not argv:
+        return 1
+
+    if command == ["list", "sources"] and len(argv) == 2:
+        for node_id, name, desc in state["sources"]:
+            print(
+                f"Source #{serial(node_id)}\n\tState: SUSPENDED\n\tName: {name}\n"
+                f"\tDescription: {desc}\n\tDriver: PipeWire\n"
+                f"\tSample Specification: s16le 1ch 48000Hz\n"
+            )
+    elif command == ["list", "modules"]:
+        for module_id, name, args in state["modules"]:
+            print(f"{module_id}\t{name}\t{args}\t")
+    elif argv[0] == "load-module":
+        module_id = state["next_module"]
+        state["next_module"] += 1
+        state["modules"].append([module_id, argv[1], " ".join(argv[2:])])
+        save_state(state)
+        print(module_id)
+    elif argv[0] == "unload-module":
+        before = len(state["modules"])
+        state["modules"] = [m for m in state["modules"] if str(m[0]) != argv[1]]
+        if len(state["modules"]) == before:
+            print("Failure: No such entity", file=sys.stderr)
+            return 1
+        state.get("moved", {}).pop(argv[1], None)
+        save_state(state)
+    elif argv[0] == "move-sink-input":
+        for node in node_objects(state):
+            if str(serial(node["id"])) == argv[1] and node["class"].startswith(
+                "Stream/Output"
+            ):
+                break
+        else:
+            print("Failure: No such entity", file=sys.stderr)
+            return 1
+        # Like pipewire-pulse, the module keeps its args and only the links change
+        state.setdefault("moved", {})[str(node["module"])] = argv[2]
+        save_state(state)
+    elif argv[0] == "suspend-sink":
+        suspended = set(state.get("suspended", []))
+        if argv[2] == "1":
+            suspended.add(argv[1])
+        else:
+            suspended.discard(argv[1])
+        state["suspended"] = sorted(suspended)
+        save_state(state)
+    elif argv[0] == "get-default-sink":
+        print(state["default_sink"])
+    elif argv[0] == "subscribe":
+        while True:
+            time.sleep(3600)
+    else:
+        print(f"fake pactl: unsupported {argv}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def pw_dump(argv: list) -> int:
+    state = load_state()
+    nodes = node_objects(state)
+    ids = {node["name"]: node["id"] for node in nodes}
+    moved = state.get("moved", {})
+    objects = []
+    for node in nodes:
+        props = {
+            "node.name": node["name"],
+            "node.description": node["description"],
+            "media.class": node["class"],
+            "object.serial": serial(node["id"]),
+        }
+        if "module" in node:
+            props["pulse.module.id"] = node["module"]
+            props["target.object"] = node["target"]
+        objects.append(
+            {
+                "id": node["id"],
+                "type": "PipeWire:Interface:Node",
+                "info": {"props": props},
+            }
+        )
+        if "module" not in node:
+            continue
+        if node["class"] == "Stream/Output/Audio":
+            link = (node["id"], ids.get(moved.get(str(node["module"]), node["target"])))
+        else:
+            link = (ids.get(node["target"]), node["id"])
+        if None not in link:
+            objects.append(
+                {
+                    "id": 20000 + len(objects),
+                    "type": "PipeWire:Interface:Link",
+                    "info": {"output-node-id": link[0], "input-node-id": link[1]},
+                }
+            )
+    for module_id, args in state.get("static_modules", {}).items():
+        objects.append(
+            {
+                "id": int(module_id),
+                "type": "PipeWire:Interface:Module",
+                "info": {"name": "libpipewire-module-filter-chain", "args": args},
+            }
+        )
+    print(json.dumps(objects))
+    return 0
+
+
+def _host_nodes(args: str) -> int:
+    """Add nodes named in module args until terminated, like pw-cli -m"""
+    names = re.findall(r'node\.name\s*=\s*"([^"]+)"', args)
+    state = load_state()
+    state["filter_nodes"] = state.get("filter_nodes", []) + names
+    state["hosts"] = state.get("hosts", []) + [os.getpid()]
+    save_state(state)
+
+    def unload(signum, frame):
+        state = load_state()
+        nodes = state.get("filter_nodes", [])
+        for name in names:
+            if name in nodes:
+                nodes.remove(name)
+        state["hosts"] = [pid for pid in state.get("hosts", []) if pid != os.getpid()]
+        save_state(state)
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, unload)
+    while True:
+        time.sleep(3600)
+
+
+def pw_cli(argv: list) -> int:
+    if argv[:1] == ["-m"] and argv[1:2] in (["load-module"], ["create-node"]):
+        return _host_nodes(argv[-1])
+    if argv[:2] == ["ls", "Node"]:
+        for node in node_objects(load_state()):
+            print(
+                f"\tid {node['id']}, type PipeWire:Interface:Node/3\n"
+                f'\t\tnode.name = "{node["name"]}"\n'
+                f'\t\tnode.description = "{node["description"]}"\n'
+                f'\t\tmedia.class = "{node["class"]}"'
+            )
+    elif argv[:1] == ["set-param"]:
+        return 0
+    elif argv[:1] == ["destroy"]:
+        state = load_state()
+        args = state.get("static_modules", {}).pop(argv[1], None)
+        if args is None:
+            return 1
+        for name in re.findall(r'node\.name\s*=\s*"([^"]+)"', args):
+            if name in state["filter_nodes"]:
+                state["filter_nodes"].remove(name)
+        save_state(state)
+    elif argv[:1] == ["info"]:
+        for node in node_objects(load_state()):
+            if str(node["id"]) == argv[1]:
+                print(
+                    f"\tid: {node['id']}\n\tproperties:\n"
+                    f'\t\tnode.name = "{node["name"]}"\n'
+                    f'\t\tnode.description = "{node["description"]}"\n'
+                    f'\t\tmedia.class = "{node["class"]}"'
+                )
+                return 0
+        return 1
+    else:
+        return 1
+    return 0
+
+
+def systemctl(argv: list) -> int:
+    if "restart" not in argv:
+        return 0
+
+    state = load_state()
+    state["modules"] = [m for m in state["modules"] if m[1] != "module-loopback"]
+    state["moved"] = {}
+    # Runtime hosts lose their connection and exit
+    for pid in state.pop("hosts", []):
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    state["filter_nodes"] = []
+    state["static_modules"] = {}
+    config_path = os.environ.get("FAKE_PW_CONFIG", "")
+    if os.path.isfile(config_path):
+        with open(config_path) as f:
+            content = f.read()
+        state["filter_nodes"] = re.findall(r'node\.name\s*=\s*"([^"]+)"', content)
+        for offset, block in enumerate(content.split("filter-chain")[1:]):
+            state["static_modules"][str(70 + offset)] = block
+    save_state(state)
+    return 0
+
+
+def pw_metadata(argv: list) -> int:
+    if argv[-2:-1] != ["clock.force-quantum"]:
+        return 1
+    state = load_state()
+    state["force_quantum"] = int(argv[-1])
+    save_state(state)
+    return 0
+
+
+def _xrunning(state: dict) -> bool:
+    """Whether current quantum or loopback latency is below stable limits"""
+    quantum = state.get("force_quantum", 0)
+    if quantum and quantum < state["stable_quantum"]:
+        return True
+    for _, name, args in state["modules"]:
+        latency = parse_args(args).get("latency_msec")
+        if name == "module-loopback" and latency:
+            if int(latency) < state["stable_latency_ms"]:
+                return True
+    return False
+
+
+def pw_top(argv: list) -> int:
+    state = load_state()
+    if _xrunning(state):
+        state["errors"] += 1
+        save_state(state)
+    print("S   ID  QUANT   RATE    WAIT    BUSY   W/Q   B/Q  ERR FORMAT           NAME")
+    for node in node_objects(state):
+        errors = state["errors"] if node["class"].startswith("Audio/") else 0
+        print(
+            f"R {node['id']:>4}   1024  48000  10.7us  19.8us  0.00  0.00 "
+            f"{errors:>4}   F32P 1 48000 {node['name']}"
+        )
+    return 0
+
+
+TOOLS = {
+    "pactl": pactl,
+    "pw-dump": pw_dump,
+    "pw-cli": pw_cli,
+    "systemctl": systemctl,
+    "pw-metadata": pw_metadata,
+    "pw-top": pw_top,
+}
+
+
+def main() -> int:
+    latency_ms = float(os.environ.get("FAKE_PW_LATENCY_MS", "0"))
+    if latency_ms:
+        time.sleep(latency_ms / 1000)
+    tool, argv = sys.argv[1], sys.argv[2:]
+    return TOOLS[tool](argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
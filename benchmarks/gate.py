@@ -0,0 +1,74 @@
+"""Benchmark silence gate detection against the CPU it can save.
+
+python -m benchmarks.gate --seconds 60 --attack-ms 20 30 60
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.silence_gate import BLOCK_MS, DETECT_RATE, EnergyDetector
+
+
+def talk(seconds: float, rng: np.random.Generator) -> np.ndarray:
+    """Alternating 2 s of loud noise and 3 s of near silence"""
+    samples = np.empty(int(seconds * DETECT_RATE), dtype=np.float32)
+    period = 5 * DETECT_RATE
+    for start in range(0, len(samples), period):
+        level = np.full(period, 0.001, dtype=np.float32)
+        level[: 2 * DETECT_RATE] = 0.1
+        chunk = samples[start : start + period]
+        chunk[:] = rng.standard_normal(len(chunk)) * level[: len(chunk)]
+    return samples
+
+
+def run(
+    samples: np.ndarray, attack_ms: int, threshold_db: float, hold_ms: int
+) -> Dict[str, object]:
+    """Feed reads of the gate's size through the detector"""
+    detector = EnergyDetector(threshold_db, hold_ms)
+    read_size = max(1, attack_ms // 2 // BLOCK_MS) * detector.block_size
+    reads = len(samples) // read_size
+    quiet = 0
+    cpu_start = time.process_time()
+    for index in range(reads):
+        if not detector.update(samples[index * read_size : (index + 1) * read_size]):
+            quiet += 1
+    cpu_seconds = time.process_time() - cpu_start
+    audio_seconds = reads * read_size / DETECT_RATE
+
+    return {
+        "attack_ms": attack_ms,
+        "read_ms": read_size * 1000 // DETECT_RATE,
+        "audio_seconds": round(audio_seconds, 2),
+        "cpu_seconds": round(cpu_seconds, 4),
+        "core_percent": round(cpu_seconds / audio_seconds * 100, 3),
+        "bypassed_percent": round(100.0 * quiet / reads, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--attack-ms", type=int, nargs="+", default=[20, 30, 60])
+    parser.add_argument("--threshold", type=float, default=-45.0)
+    parser.add_argument("--hold", type=int, default=1500)
+    args = parser.parse_args(argv)
+
+    samples = talk(args.seconds, np.random.default_rng(0))
+    results = [
+        run(samples, attack_ms, args.threshold, args.hold)
+        for attack_ms in args.attack_ms
+    ]
+    print(
+        json.dumps({"meta": {"timestamp": time.time()}, "results": results}, indent=2)
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Benchmark level meter block processing against real-time budget.
+
+python -m benchmarks.meters --seconds 60 --spectrum
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.level_meter import BLOCK_SIZE, RATE, LevelMeter
+
+
+def run(seconds: float, spectrum: bool, frame_rate: float) -> Dict[str, object]:
+    """Feed synthetic audio through meter as fast as possible"""
+    frames = [0]
+
+    def on_frame(reading):
+        frames[0] += 1
+
+    meter = LevelMeter("bench", on_frame, spectrum=spectrum, frame_rate=frame_rate)
+    n_blocks = int(seconds * RATE / BLOCK_SIZE)
+    rng = np.random.default_rng(0)
+    source = (rng.standard_normal(BLOCK_SIZE * 64) * 0.1).astype(np.float32)
+    # Blocks are views into source, like the reused capture buffer
+    blocks = [source[i : i + BLOCK_SIZE] for i in range(0, len(source), BLOCK_SIZE)]
+
+    # Frame clock follows simulated audio time, not wall time
+    clock = [0.0]
+    time_monotonic = time.monotonic
+    time.monotonic = lambda: clock[0]
+    try:
+        for block in blocks[:4]:
+            meter.process_block(block)
+
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        cpu_start = time.process_time()
+        for index in range(n_blocks):
+            clock[0] = index * BLOCK_SIZE / RATE
+            meter.process_block(blocks[index % len(blocks)])
+        cpu_seconds = time.process_time() - cpu_start
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        time.monotonic = time_monotonic
+
+    return {
+        "spectrum": spectrum,
+        "audio_seconds": round(n_blocks * BLOCK_SIZE / RATE, 2),
+        "cpu_seconds": round(cpu_seconds, 4),
+        "core_percent": round(cpu_seconds / (n_blocks * BLOCK_SIZE / RATE) * 100, 3),
+        "frames": frames[0],
+        "retained_bytes": after - before,
+        "peak_traced_bytes": peak,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--spectrum", action="store_true")
+    parser.add_argument("--frame-rate", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    results = [run(args.seconds, False, args.frame_rate)]
+    if args.spectrum:
+        results.append(run(args.seconds, True, args.frame_rate))
+    print(
+        json.dumps({"meta": {"timestamp": time.time()}, "results": results}, indent=2)
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
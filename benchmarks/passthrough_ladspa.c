@@ -0,0 +1,133 @@
+/* Minimal LADSPA plugin for benchmarks: copies input to output.
+ *
+ * Same labels and control name as the DeepFilterNet plugin, so it can stand
+ * in for libdeep_filter_ladspa.so without the model.
+ *
+ * cc -shared -fPIC -O2 -o passthrough.so passthrough_ladspa.c
+ */
+
+#include <stdlib.h>
+#include <string.h>
+
+typedef float LADSPA_Data;
+typedef void *LADSPA_Handle;
+
+typedef struct {
+    int HintDescriptor;
+    LADSPA_Data LowerBound;
+    LADSPA_Data UpperBound;
+} LADSPA_PortRangeHint;
+
+typedef struct _LADSPA_Descriptor {
+    unsigned long UniqueID;
+    const char *Label;
+    int Properties;
+    const char *Name;
+    const char *Maker;
+    const char *Copyright;
+    unsigned long PortCount;
+    const int *PortDescriptors;
+    const char *const *PortNames;
+    const LADSPA_PortRangeHint *PortRangeHints;
+    void *ImplementationData;
+    LADSPA_Handle (*instantiate)(const struct _LADSPA_Descriptor *, unsigned long);
+    void (*connect_port)(LADSPA_Handle, unsigned long, LADSPA_Data *);
+    void (*activate)(LADSPA_Handle);
+    void (*run)(LADSPA_Handle, unsigned long);
+    void (*run_adding)(LADSPA_Handle, unsigned long);
+    void (*set_run_adding_gain)(LADSPA_Handle, LADSPA_Data);
+    void (*deactivate)(LADSPA_Handle);
+    void (*cleanup)(LADSPA_Handle);
+} LADSPA_Descriptor;
+
+enum { PORT_INPUT = 0x1, PORT_OUTPUT = 0x2, PORT_CONTROL = 0x4, PORT_AUDIO = 0x8 };
+
+typedef struct {
+    LADSPA_Data *ports[5];
+} Passthrough;
+
+static const int port_descriptors[] = {
+    PORT_INPUT | PORT_AUDIO,
+    PORT_OUTPUT | PORT_AUDIO,
+    PORT_INPUT | PORT_CONTROL,
+};
+static const char *const port_names[] = {
+    "Audio In",
+    "Audio Out",
+    "Attenuation Limit (dB)",
+};
+static const LADSPA_PortRangeHint port_hints[] = {
+    {0, 0, 0},
+    {0, 0, 0},
+    {0x1 | 0x2 | 0x140, 0, 100},
+};
+
+static const int stereo_port_descriptors[] = {
+    PORT_INPUT | PORT_AUDIO,
+    PORT_INPUT | PORT_AUDIO,
+    PORT_OUTPUT | PORT_AUDIO,
+    PORT_OUTPUT | PORT_AUDIO,
+    PORT_INPUT | PORT_CONTROL,
+};
+static const char *const stereo_port_names[] = {
+    "Audio In L",
+    "Audio In R",
+    "Audio Out L",
+    "Audio Out R",
+    "Attenuation Limit (dB)",
+};
+static const LADSPA_PortRangeHint stereo_port_hints[] = {
+    {0, 0, 0},
+    {0, 0, 0},
+    {0, 0, 0},
+    {0, 0, 0},
+    {0x1 | 0x2 | 0x140, 0, 100},
+};
+
+static LADSPA_Handle instantiate(const LADSPA_Descriptor *d, unsigned long rate) {
+    (void)d;
+    (void)rate;
+    return calloc(1, sizeof(Passthrough));
+}
+
+static void connect_port(LADSPA_Handle h, unsigned long port, LADSPA_Data *data) {
+    ((Passthrough *)h)->ports[port] = data;
+}
+
+static void run(LADSPA_Handle h, unsigned long count) {
+    Passthrough *p = h;
+    if (p->ports[0] != p->ports[1])
+        memmove(p->ports[1], p->ports[0], count * sizeof(LADSPA_Data));
+}
+
+static void run_stereo(LADSPA_Handle h, unsigned long count) {
+    Passthrough *p = h;
+    for (int i = 0; i < 2; i++)
+        if (p->ports[i] != p->ports[i + 2])
+            memmove(p->ports[i + 2], p->ports[i], count * sizeof(LADSPA_Data));
+}
+
+static void cleanup(LADSPA_Handle h) { free(h); }
+
+static const LADSPA_Descriptor descriptor = {
+    1, "deep_filter_mono", 0, "Passthrough", "", "None",
+    3, port_descriptors, port_names, port_hints, NULL,
+    instantiate, connect_port, NULL, run, NULL, NULL, NULL, cleanup,
+};
+
+static const LADSPA_Descriptor stereo_descriptor = {
+    2, "deep_filter_stereo", 0, "Passthrough (stereo)", "", "None",
+    5, stereo_port_descriptors, stereo_port_names, stereo_port_hints, NULL,
+    instantiate, connect_port, NULL, run_stereo, NULL, NULL, NULL, cleanup,
+};
+
+const LADSPA_Descriptor *ladspa_descriptor(unsigned long index) {
+    switch (index) {
+    case 0:
+        return &descriptor;
+    case 1:
+        return &stereo_descriptor;
+    default:
+        return NULL;
+    }
+}
@@ -0,0 +1,366 @@
+"""Benchmark PipeWire hot paths against fake pactl/pw-cli/systemctl.
+
+python -m benchmarks.run --sizes 10 100 1000 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import fake_tools
+from benchmarks.fake_pulse_server import FakePulseServer
+
+TOOL_NAMES = ["pactl", "pw-cli", "pw-dump", "systemctl", "pw-metadata", "pw-top"]
+
+
+class FakeEnvironment:
+    """Put fake tools on PATH and point the app at a temporary state"""
+
+    def __init__(self, n_sources: int, n_modules: int, latency_ms: float = 0):
+        self.state = fake_tools.generate_state(n_sources, n_modules)
+        self.latency_ms = latency_ms
+        self.directory = ""
+        self._saved_env: Dict[str, Optional[str]] = {}
+        self.pulse_server: Optional[FakePulseServer] = None
+
+    def __enter__(self) -> "FakeEnvironment":
+        self.directory = tempfile.mkdtemp(prefix="deepfilter-bench-")
+        bin_dir = os.path.join(self.directory, "bin")
+        os.makedirs(bin_dir)
+        script = os.path.abspath(fake_tools.__file__)
+        for tool in TOOL_NAMES:
+            path = os.path.join(bin_dir, tool)
+            with open(path, "w") as f:
+                f.write(f'#!/bin/sh\nexec "{sys.executable}" "{script}" {tool} "$@"\n')
+            os.chmod(path, 0o755)
+
+        self.state_path = os.path.join(self.directory, "state.json")
+        self.config_path = os.path.join(
+            self.directory, "pipewire.conf.d", "99-deepfilter.conf"
+        )
+        self.reset()
+
+        socket_path = os.path.join(self.directory, "native")
+        self.pulse_server = FakePulseServer(socket_path, self.state)
+        self.pulse_server.start()
+
+        self._set_env("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+        self._set_env("FAKE_PW_STATE", self.state_path)
+        self._set_env("FAKE_PW_LATENCY_MS", str(self.latency_ms))
+        self._set_env("PULSE_SERVER", f"unix:{socket_path}")
+        self._set_env("FAKE_PW_CONFIG", self.config_path)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.pulse_server:
+            self.pulse_server.stop()
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _set_env(self, key: str, value: str):
+        self._saved_env.setdefault(key, os.environ.get(key))
+        os.environ[key] = value
+
+    def reset(self):
+        """Restore initial fake graph"""
+        with open(self.state_path, "w") as f:
+            json.dump(self.state, f)
+
+    def output(self, *argv: str) -> str:
+        return subprocess.run(argv, capture_output=True, text=True).stdout
+
+    def connector(self):
+        from core.connector import DeepFilterConnector
+
+        connector = DeepFilterConnector()
+        connector.settings.config_path = self.config_path
+        connector.settings.latency_path = os.path.join(self.directory, "latency.json")
+        connector.settings.device_latency.clear()
+        connector.settings.profiles_path = os.path.join(self.directory, "profiles.json")
+        connector.settings.profiles.clear()
+        connector.settings.active_profiles.clear()
+        connector.settings.state_path = os.path.join(self.directory, "cache.json")
+        connector._restore_state()
+        connector.sessions.clear()
+        connector.settings.sessions.clear()
+        connector._load_sessions_from_config()
+        return connector
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    iterations: int,
+    size: int,
+    items: int = 0,
+    setup: Optional[Callable[[], object]] = None,
+) -> Dict[str, object]:
+    """Time func, calling untimed setup before each iteration"""
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    result = {
+        "name": name,
+        "size": size,
+        "iterations": iterations,
+        "mean_ms": round(statistics.mean(samples), 4),
+        "p50_ms": round(samples[len(samples) // 2], 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "max_ms": round(samples[-1], 4),
+    }
+    if items:
+        result["items_per_s"] = round(items / (statistics.mean(samples) / 1000))
+    return result
+
+
+def run_size(
+    size: int, latency_ms: float, iterations: int, parse_iterations: int
+) -> List[Dict[str, object]]:
+    """Run all benchmarks on graph with size sources and size modules"""
+    results = []
+    with FakeEnvironment(size, size, latency_ms) as env:
+        from core.device_manager import DeviceManager
+        from system.pipewire_controller import PipeWireController
+
+        manager = DeviceManager()
+        dump = env.output("pw-dump")
+        sources = env.output("pactl", "list", "sources")
+        results.append(
+            measure(
+                "parse_pw_dump",
+                lambda: manager.load_graph(dump),
+                parse_iterations,
+                size,
+                items=size,
+            )
+        )
+        results.append(
+            measure(
+                "parse_pactl_sources",
+                lambda: manager.load_sources(sources),
+                parse_iterations,
+                size,
+                items=size,
+            )
+        )
+        results.append(
+            measure("refresh_devices", manager.refresh_devices, iterations, size)
+        )
+
+        connector = env.connector()
+        results.append(
+            measure(
+                "check_existing_connection",
+                connector.check_existing_connection,
+                iterations,
+                size,
+                setup=connector._invalidate_snapshot,
+            )
+        )
+
+        # Launch: cached state first, then one refresh in the background
+        connector.save_state()
+        results.append(
+            measure(
+                "load_state",
+                connector.config_manager.load_state,
+                parse_iterations,
+                size,
+            )
+        )
+
+        def stop_monitor():
+            connector.device_monitor.stop()
+            connector._invalidate_snapshot()
+
+        results.append(
+            measure(
+                "refresh_cold", connector.refresh, iterations, size, setup=stop_monitor
+            )
+        )
+        connector.device_monitor.stop()
+
+        device = connector.get_devices()[-1]
+
+        def reset_connection():
+            env.reset()
+            connector.sessions.clear()
+
+        results.append(
+            measure(
+                "connect_microphone",
+                lambda: connector.connect_microphone(device),
+                iterations,
+                size,
+                setup=reset_connection,
+            )
+        )
+
+        def toggle_attenuation():
+            connector.settings.noise_attenuation = (
+                50.0 if connector.settings.noise_attenuation != 50.0 else 60.0
+            )
+
+        # First apply writes the config file and takes the restart path
+        connector.apply_settings()
+        results.append(
+            measure(
+                "apply_settings_live",
+                connector.apply_settings,
+                iterations,
+                size,
+                setup=toggle_attenuation,
+            )
+        )
+        results.append(
+            measure("apply_settings_noop", connector.apply_settings, iterations, size)
+        )
+        results.append(
+            measure(
+                "start_monitoring",
+                connector.start_monitoring,
+                iterations,
+                size,
+                setup=env.reset,
+            )
+        )
+
+        # Two warm profile chains, switching only moves the loopback stream
+        connector.stop_monitoring()
+        connector.save_profile("meeting", 20.0)
+        connector.save_profile("open office", 100.0)
+        connector.connect_microphone(device)
+        names = ["meeting", "open office"]
+
+        def switch_profile():
+            names.reverse()
+            success, message = connector.switch_profile(device.name, names[0])
+            if not success:
+                raise RuntimeError(message)
+
+        results.append(measure("switch_profile", switch_profile, iterations, size))
+
+        # Quantum change of a dedicated chain: reload of that chain only
+        from core.chain_host import ChainHost
+        from models.latency_profile import LatencyProfile
+
+        connector.settings.chain_loading = "runtime"
+        connector.settings.chains_path = os.path.join(env.directory, "chains.json")
+        connector.chain_host = ChainHost(connector.controller, connector.config_manager)
+        dedicated = next(
+            d for d in connector.get_devices() if d.name not in connector.sessions
+        )
+        success, message = connector.connect_microphone(dedicated, dedicated=True)
+        if not success:
+            raise RuntimeError(message)
+
+        def toggle_quantum():
+            quantum = connector.settings.latency_for(dedicated.name).quantum
+            connector.settings.device_latency[dedicated.name] = LatencyProfile(
+                20, 512 if quantum == 256 else 256
+            )
+
+        def reload_chain():
+            success, message = connector.apply_settings()
+            if "chains loaded" not in message:
+                raise RuntimeError(message)
+
+        results.append(
+            measure(
+                "apply_settings_runtime_reload",
+                reload_chain,
+                iterations,
+                size,
+                setup=toggle_quantum,
+            )
+        )
+        connector.chain_host.stop_all()
+
+        # Status from the daemon's memory, compare with check_existing_connection
+        import threading
+
+        from core.daemon import ControlDaemon
+        from system.daemon_client import DaemonClient
+
+        socket_path = os.path.join(env.directory, "control.sock")
+        daemon = ControlDaemon(connector, socket_path)
+        daemon.bind()
+        threading.Thread(target=daemon.serve, daemon=True).start()
+        client = DaemonClient(socket_path)
+        results.append(
+            measure("daemon_status", lambda: client.call("status"), iterations, size)
+        )
+        client.close()
+        daemon.stop()
+
+        native = PipeWireController("native")
+        results.append(
+            measure("native_list_modules", native.list_modules, iterations, size)
+        )
+        subprocess_controller = PipeWireController("subprocess")
+        results.append(
+            measure(
+                "subprocess_list_modules",
+                subprocess_controller.list_modules,
+                iterations,
+                size,
+            )
+        )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--parse-iterations", type=int, default=100)
+    parser.add_argument("--output", help="JSON file, default stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        results += run_size(
+            size, args.latency_ms, args.iterations, args.parse_iterations
+        )
+
+    report = json.dumps(
+        {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "latency_ms": args.latency_ms,
+                "timestamp": time.time(),
+            },
+            "results": results,
+        },
+        indent=2,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Benchmark control-path latency and CPU as the number of sessions grows.
+
+python -m benchmarks.sessions --sessions 1 2 4 8
+python -m benchmarks.sessions --pipewire-cpu 10   # real daemon, 10 s sample
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.run import FakeEnvironment, measure
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def _cpu_ms() -> float:
+    """CPU time of this process and its finished children"""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total * 1000
+
+
+def run_sessions(count: int, latency_ms: float, iterations: int) -> List[Dict]:
+    """Time connecting, updating and inspecting count dedicated sessions"""
+    results = []
+    with FakeEnvironment(count, 0, latency_ms) as env:
+        connector = env.connector()
+        devices = connector.get_devices()[:count]
+
+        def reset():
+            env.reset()
+            connector.sessions.clear()
+            connector.settings.sessions.clear()
+            if os.path.exists(env.config_path):
+                os.unlink(env.config_path)
+
+        def connect_all():
+            for device in devices:
+                success, message = connector.connect_microphone(device, True)
+                if not success:
+                    raise RuntimeError(message)
+
+        cpu_start = _cpu_ms()
+        results.append(measure("connect_dedicated", connect_all, 1, count, setup=reset))
+        results[-1]["cpu_ms"] = round(_cpu_ms() - cpu_start, 1)
+
+        def bump_attenuation():
+            for device in devices:
+                connector.set_attenuation(
+                    connector.settings.sessions[device.name] % 100 + 1, device.name
+                )
+            connector.apply_settings()
+
+        for name, func in (
+            ("apply_live", bump_attenuation),
+            ("check_existing_connection", connector.check_existing_connection),
+        ):
+            cpu_start = _cpu_ms()
+            results.append(measure(name, func, iterations, count))
+            results[-1]["cpu_ms"] = round((_cpu_ms() - cpu_start) / iterations, 1)
+    return results
+
+
+def _pipewire_pids() -> List[int]:
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/comm") as f:
+                if f.read().strip() == "pipewire":
+                    pids.append(int(entry))
+        except OSError:
+            continue
+    return pids
+
+
+def _process_ticks(pid: int) -> int:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime and stime, fields 14 and 15 of stat
+    return int(fields[11]) + int(fields[12])
+
+
+def sample_pipewire_cpu(seconds: float) -> Optional[float]:
+    """CPU usage of running pipewire daemons in percent of one core"""
+    pids = _pipewire_pids()
+    if not pids:
+        return None
+    start = sum(_process_ticks(pid) for pid in pids)
+    time.sleep(seconds)
+    ticks = sum(_process_ticks(pid) for pid in pids) - start
+    return round(ticks / CLOCK_TICKS / seconds * 100, 2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--pipewire-cpu",
+        type=float,
+        metavar="SECONDS",
+        help="Also sample CPU of the real pipewire daemon",
+    )
+    parser.add_argument("--output", help="JSON file, default stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    for count in args.sessions:
+        results += run_sessions(count, args.latency_ms, args.iterations)
+
+    report = {"meta": {"timestamp": time.time()}, "results": results}
+    if args.pipewire_cpu:
+        report["pipewire_cpu_percent"] = sample_pipewire_cpu(args.pipewire_cpu)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
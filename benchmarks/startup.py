@@ -0,0 +1,122 @@
+"""Benchmark headless CLI startup against fake PipeWire tools.
+
+python -m benchmarks.startup --iterations 20 --max-ms 150
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import threading
+from typing import List, Optional, Tuple
+
+from benchmarks.run import FakeEnvironment, measure
+from core.daemon import ControlDaemon
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules `status` must not import, locally and against the daemon
+LOCAL_HEAVY = ("flet", "asyncio")
+DAEMON_HEAVY = LOCAL_HEAVY + ("core.connector", "core.remote_connector", "dataclasses")
+
+
+def run_python(*argv: str, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *argv],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, **env},
+    )
+
+
+def imported(modules: Tuple[str, ...], **env: str) -> List[str]:
+    """Which of modules `cli status` imports"""
+    check = run_python(
+        "-c",
+        "import sys, cli; cli.main(['status']); "
+        f"print(sorted(m for m in {modules!r} if m in sys.modules))",
+        **env,
+    )
+    return json.loads(check.stdout.strip().splitlines()[-1].replace("'", '"'))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--sources", type=int, default=10)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        help="Fail if median `status` time against the daemon exceeds this",
+    )
+    parser.add_argument("--output", help="JSON file, default stdout")
+    args = parser.parse_args(argv)
+
+    with FakeEnvironment(args.sources, args.sources) as env:
+        results = [
+            measure(
+                "python_baseline",
+                lambda: run_python("-c", "pass"),
+                args.iterations,
+                args.sources,
+            ),
+            measure(
+                "import_cli",
+                lambda: run_python("-c", "import cli, core.connector"),
+                args.iterations,
+                args.sources,
+            ),
+            measure(
+                "cli_status_local",
+                lambda: run_python("-m", "cli", "status", DEEPFILTER_DAEMON="0"),
+                args.iterations,
+                args.sources,
+            ),
+        ]
+        heavy_modules = imported(LOCAL_HEAVY, DEEPFILTER_DAEMON="0")
+
+        # Daemon on the default socket of the CLI processes
+        runtime_dir = os.path.join(env.directory, "run")
+        daemon = ControlDaemon(
+            env.connector(), os.path.join(runtime_dir, "deepfilter_ui", "control.sock")
+        )
+        daemon.bind()
+        threading.Thread(target=daemon.serve, daemon=True).start()
+        try:
+            results.append(
+                measure(
+                    "cli_status",
+                    lambda: run_python(
+                        "-m", "cli", "status", XDG_RUNTIME_DIR=runtime_dir
+                    ),
+                    args.iterations,
+                    args.sources,
+                )
+            )
+            heavy_modules += imported(DAEMON_HEAVY, XDG_RUNTIME_DIR=runtime_dir)
+        finally:
+            daemon.stop()
+
+    status = next(r for r in results if r["name"] == "cli_status")
+    passed = args.max_ms is None or status["p50_ms"] <= args.max_ms
+    report = json.dumps(
+        {
+            "meta": {"timestamp": time.time(), "max_ms": args.max_ms},
+            "heavy_modules_imported": heavy_modules,
+            "passed": passed and not heavy_modules,
+            "results": results,
+        },
+        indent=2,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 0 if passed and not heavy_modules else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
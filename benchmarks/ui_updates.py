@@ -0,0 +1,98 @@
+"""Benchmark client messages of coalesced UI updates against direct page.update().
+
+python -m benchmarks.ui_updates --ticks 200 --tick-hz 120
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+from ui.update_scheduler import Throttle, UpdateScheduler
+
+
+class FakeControl:
+    """Control with a serialized size"""
+
+    def __init__(self, size: int):
+        self.size = size
+
+
+class FakePage:
+    """Counts update messages and their approximate bytes"""
+
+    def __init__(self, controls: List[FakeControl]):
+        self.controls = controls
+        self.messages = 0
+        self.bytes = 0
+
+    def update(self, *controls):
+        self.messages += 1
+        # Whole-page update walks and diffs every control
+        self.bytes += sum(c.size for c in (controls or self.controls))
+
+
+def simulate(coalesced: bool, ticks: int, tick_hz: float) -> Dict[str, object]:
+    """Slider drag, then a connect-like handler with several updates"""
+    controls = [FakeControl(200) for _ in range(60)]
+    label = controls[0]
+    page = FakePage(controls)
+    backend_calls = [0]
+
+    def set_attenuation(value):
+        backend_calls[0] += 1
+
+    scheduler = UpdateScheduler(page)
+    throttled = Throttle(set_attenuation)
+
+    for i in range(ticks):
+        if coalesced:
+            throttled(float(i))
+            scheduler.schedule(label)
+        else:
+            set_attenuation(float(i))
+            page.update()
+        time.sleep(1 / tick_hz)
+    time.sleep(0.3)
+    slider = {
+        "messages": page.messages,
+        "bytes": page.bytes,
+        "backend_calls": backend_calls[0],
+    }
+
+    page.messages = page.bytes = 0
+    # Start handler, snackbar and completion each updated the page
+    for _ in range(3):
+        if coalesced:
+            scheduler.schedule()
+        else:
+            page.update()
+    time.sleep(0.1)
+    return {
+        "slider_drag": slider,
+        "handler": {"messages": page.messages, "bytes": page.bytes},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--tick-hz", type=float, default=120.0)
+    args = parser.parse_args(argv)
+
+    print(
+        json.dumps(
+            {
+                "meta": {"ticks": args.ticks, "tick_hz": args.tick_hz},
+                "direct": simulate(False, args.ticks, args.tick_hz),
+                "coalesced": simulate(True, args.ticks, args.tick_hz),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
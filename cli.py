@@ -0,0 +1,623 @@
+"""Headless DeepFilter control, without Flet.
+
+python -m cli status
+python -m cli list
+python -m cli connect [DEVICE]
+python -m cli disconnect
+python -m cli set-attenuation DB
+python -m cli set-latency MS [--quantum N] [--device DEVICE]
+python -m cli tune [DEVICE]
+python -m cli profiles
+python -m cli save-profile NAME DB
+python -m cli remove-profile NAME
+python -m cli switch-profile [NAME] [--device DEVICE]
+python -m cli measure-latency [DEVICE] [--probes N] [--history]
+python -m cli dsp [--samples N] [--interval S] [--alert PCT]
+python -m cli gate [on|off|stats] [--threshold DB] [--hold MS] [--attack MS]
+python -m cli daemon [--socket PATH]
+python -m cli denoise FILE... [-o DIR] [-j WORKERS]
+python -m cli profile [--block-sizes N...] [--rates HZ...] [--attenuation DB...]
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+# Commands served by the daemon when one is running
+REMOTE_COMMANDS = {
+    "status",
+    "list",
+    "connect",
+    "disconnect",
+    "set-attenuation",
+    "set-latency",
+    "profiles",
+    "save-profile",
+    "remove-profile",
+    "switch-profile",
+    "tune",
+    "measure-latency",
+    "dsp",
+    "gate",
+    "denoise",
+}
+
+
+def _find_device(devices: list, query: Optional[str]):
+    """Match device by name or description, exact first, then substring"""
+    if not query:
+        return devices[0] if devices else None
+
+    for device in devices:
+        if query in (device.name, device.description):
+            return device
+
+    query = query.lower()
+    for device in devices:
+        if query in device.name.lower() or query in device.description.lower():
+            return device
+    return None
+
+
+def cmd_list(connector, args) -> int:
+    devices = connector.get_devices()
+    connector.check_existing_connection()
+    for device in devices:
+        marker = "*" if device.name in connector.sessions else " "
+        spec = f"\t{device.sample_spec}" if device.sample_spec else ""
+        print(f"{marker} {device.description}\t{device.name}{spec}")
+    return 0
+
+
+def cmd_status(connector, args) -> int:
+    connector.check_existing_connection()
+    _print_status(
+        [
+            (session.device_name, session.sink, session.loopback_id)
+            for session in connector.sessions.values()
+        ],
+        [
+            (config.device, config.profile, config.controls)
+            for config in connector.config_manager.read_configs() or []
+        ],
+    )
+    return 0
+
+
+def _status_from_daemon(socket_path: str) -> int:
+    """Status straight from the daemon's memory, only the socket client loaded"""
+    from system.daemon_client import DaemonClient, DaemonError
+
+    try:
+        status = DaemonClient(socket_path).call("status")
+    except DaemonError as e:
+        print(f"Daemon error: {e}")
+        return 1
+    _print_status(
+        [
+            (session["device_name"], session["sink"], session["loopback_id"])
+            for session in status["sessions"]
+        ],
+        [
+            (chain["device"], chain["profile"], chain["controls"])
+            for chain in status["chains"]
+        ],
+    )
+    return 0
+
+
+def _print_status(sessions: list, chains: list):
+    if not sessions:
+        print("Not connected")
+    for device_name, sink, loopback_id in sessions:
+        print(f"Connected: {device_name} -> {sink} (module {loopback_id})")
+
+    for device, profile, controls in chains:
+        chain = device or (f"profile {profile}" if profile else "shared chain")
+        for name, value in controls.items():
+            print(f"{chain}: {name} = {value}")
+
+
+def cmd_connect(connector, args) -> int:
+    connected_source = connector.check_existing_connection()
+    device = _find_device(connector.get_devices(), args.device)
+    if not device:
+        print("Device not found", file=sys.stderr)
+        return 1
+
+    if device.name in connector.sessions:
+        print(f"Already connected: {device.display}")
+        return 0
+    if connected_source and not args.dedicated:
+        # Shared chain takes one microphone
+        connector.disconnect_microphone()
+
+    success, message = connector.connect_microphone(device, dedicated=args.dedicated)
+    print(f"{message}: {device.display}" if success else f"Error: {message}")
+    return 0 if success else 1
+
+
+def cmd_disconnect(connector, args) -> int:
+    connector.check_existing_connection()
+    device = None
+    if args.device:
+        device = _find_device(connector.get_devices(), args.device)
+        if not device:
+            print("Device not found", file=sys.stderr)
+            return 1
+
+    success, message = connector.disconnect_microphone(device)
+    print(message if success else f"Error: {message}")
+    return 0 if success else 1
+
+
+def cmd_set_attenuation(connector, args) -> int:
+    if not 0 <= args.db <= 100:
+        print("Attenuation must be between 0 and 100 dB", file=sys.stderr)
+        return 1
+
+    device_name = None
+    if args.device:
+        device = _find_device(connector.get_devices(), args.device)
+        if not device:
+            print("Device not found", file=sys.stderr)
+            return 1
+        device_name = device.name
+
+    connector.set_attenuation(round(args.db, 1), device_name)
+    connector.check_existing_connection()
+    success, message = connector.apply_settings()
+    print(message if success else f"Error: {message}")
+    return 0 if success else 1
+
+
+def cmd_set_latency(connector, args) -> int:
+    connector.check_existing_connection()
+    device = _find_device(connector.get_devices(), args.device)
+    if not device:
+        print("Device not found", file=sys.stderr)
+        return 1
+
+    success, message = connector.set_latency(device, args.ms, args.quantum)
+    print(message if success else f"Error: {message}")
+    return 0 if success else 1
+
+
+def cmd_profiles(connector, args) -> int:
+    connector.check_existing_connection()
+    settings = connector.settings
+    if not settings.profiles:
+        print("No profiles")
+    for name, profile in sorted(settings.profiles.items()):
+        devices = [d for d, p in sorted(settings.active_profiles.items()) if p == name]
+        suffix = f"\t<- {', '.join(devices)}" if devices else ""
+        print(f"{name}\t{profile.attenuation} dB{suffix}")
+    return 0
+
+
+def cmd_save_profile(connector, args) -> int:
+    if not 0 <= args.db <= 100:
+        print("Attenuation must be between 0 and 100 dB", file=sys.stderr)
+        return 1
+
+    connector.check_existing_connection()
+    success, message = connector.save_profile(args.name, round(args.db, 1))
+    print(message if success else f"Error: {message}")
+    return 0 if success else 1
+
+
+def cmd_remove_profile(connector, args) -> int:
+    connector.check_existing_connection()
+    success, message = connector.remove_profile(args.name)
+    print(message if success else f"Error: {message}")
+    return 0 if success else 1
+
+
+def cmd_switch_profile(connector, args) -> int:
+    connected_source = connector.check_existing_connection()
+    if args.device:
+        device = _find_device(connector.get_devices(), args.device)
+        if not device:
+            print("Device not found", file=sys.stderr)
+            return 1
+        device_name = device.name
+    elif connected_source:
+        device_name = connected_source
+    else:
+        print("No microphone connected, use --device", file=sys.stderr)
+        return 1
+
+    success, message = connector.switch_profile(device_name, args.name)
+    print(message if success else f"Error: {message}")
+    return 0 if success else 1
+
+
+def cmd_tune(connector, args) -> int:
+    connector.check_existing_connection()
+    device = _find_device(connector.get_devices(), args.device)
+    if not device:
+        print("Device not found", file=sys.stderr)
+        return 1
+
+    success, message = connector.tune_latency(device, args.settle, progress=print)
+    print(message if success else f"Error: {message}")
+    return 0 if success else 1
+
+
+def cmd_measure_latency(connector, args) -> int:
+    from models.latency_measurement import group_by_settings
+
+    if args.history:
+        measurements = connector.config_manager.load_latency_measurements()
+        for key, group in group_by_settings(measurements).items():
+            delays = ", ".join(f"{m.delay_ms:.1f}" for m in group)
+            print(f"{key}: {delays} ms (jitter {group[-1].jitter_ms:.2f} ms)")
+        return 0
+
+    connector.check_existing_connection()
+    device_name = None
+    if args.device:
+        device = _find_device(connector.get_devices(), args.device)
+        if not device:
+            print("Device not found", file=sys.stderr)
+            return 1
+        device_name = device.name
+
+    measurement, message = connector.measure_latency(
+        device_name, args.probes, progress=print
+    )
+    print(message if measurement else f"Error: {message}")
+    return 0 if measurement else 1
+
+
+def cmd_dsp(connector, args) -> int:
+    import time
+
+    from core.dsp_monitor import DspMonitor, sparkline
+
+    alert = args.alert
+    if alert is None:
+        alert = connector.settings.dsp_alert_percent
+
+    def show_alert(series):
+        print(
+            f"Alert: {series.label} at {series.load.last():.1f}% DSP load "
+            f"(threshold {alert:g}%)"
+        )
+
+    monitor = DspMonitor(
+        connector.controller, connector.dsp_targets, alert, on_alert=show_alert
+    )
+    for i in range(args.samples):
+        if i:
+            time.sleep(args.interval)
+        if not monitor.sample():
+            print("Error: pw-top is not available", file=sys.stderr)
+            return 1
+
+    if not monitor.series:
+        print("No DeepFilter nodes running")
+    for label, series in sorted(monitor.series.items()):
+        print(f"{sparkline(list(series.load)):<{args.samples}}  {series.summary()}")
+    return 0
+
+
+def cmd_gate(connector, args) -> int:
+    from core.remote_connector import RemoteConnector
+
+    connector.check_existing_connection()
+    if args.action == "off":
+        success, message = connector.stop_gate()
+        print(message)
+        return 0 if success else 1
+
+    if args.action == "on":
+        remote = isinstance(connector, RemoteConnector)
+        success, message = connector.start_gate(
+            None if remote else _print_gate(connector),
+            args.threshold,
+            args.hold,
+            args.attack,
+        )
+        print(message)
+        if not success:
+            return 1
+        if not remote:
+            # Without the daemon, gating ends with this process
+            import time
+
+            print("Gating until Ctrl+C")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                stats = connector.gate_stats()
+                connector.stop_gate()
+                for entry in stats:
+                    print(entry.summary())
+                return 0
+
+    stats = connector.gate_stats()
+    if not stats:
+        print("Silence gate is off")
+    for entry in stats:
+        print(entry.summary())
+    return 0
+
+
+def _print_gate(connector):
+    """Callback printing the gate that changed"""
+
+    def show():
+        for entry in connector.gate_stats():
+            print(entry.summary(), flush=True)
+
+    return show
+
+
+def cmd_daemon(connector, args) -> int:
+    from core.daemon import run_daemon
+
+    return run_daemon(connector, args.socket)
+
+
+def cmd_denoise(connector, args) -> int:
+    from core.batch_processor import BatchProcessor, output_path_for
+    from core.remote_connector import RemoteConnector
+    from models.batch_job import BatchJob
+
+    if args.attenuation is not None:
+        connector.settings.noise_attenuation = args.attenuation
+    elif isinstance(connector, RemoteConnector):
+        # Attenuation the daemon runs with, not the one last saved
+        connector.check_existing_connection()
+    config = connector.config_manager.desired_config()
+    jobs = [
+        BatchJob(
+            path,
+            output_path_for(path, args.output_dir),
+            config.plugin,
+            config.label,
+            config.controls,
+            args.block_size,
+        )
+        for path in args.files
+    ]
+
+    def show_progress(progress):
+        name = os.path.basename(jobs[progress.index].input_path)
+        print(
+            f"\r[{progress.index + 1}/{len(jobs)}] {name} {progress.fraction:.0%} "
+            f"(real-time factor {progress.realtime_factor:.3f})",
+            end="",
+            file=sys.stderr,
+        )
+
+    results = BatchProcessor(args.workers).run(jobs, show_progress)
+    print(file=sys.stderr)
+
+    failed = 0
+    for result in results:
+        if result.success:
+            print(
+                f"{result.output_path}: {result.duration:.1f} s in "
+                f"{result.seconds:.1f} s (real-time factor {result.realtime_factor:.3f})"
+            )
+        else:
+            failed += 1
+            print(f"Error: {result.input_path}: {result.error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def cmd_profile(connector, args) -> int:
+    import json
+
+    from core.plugin_profiler import PluginProfiler, config_key
+
+    def show_result(result):
+        key = config_key(result)
+        if key is None:
+            print(f"Error: {result['error']}", file=sys.stderr)
+            return
+        print(
+            f"{key}: real-time factor {result['realtime_factor']}, "
+            f"p99 {result['block_us']['p99']} us of {result['block_budget_us']} us",
+            file=sys.stderr,
+        )
+
+    profiler = PluginProfiler(connector.config_manager, isolate=not args.no_isolate)
+    results = profiler.sweep(
+        args.block_sizes,
+        args.rates,
+        args.attenuation,
+        args.signals,
+        args.seconds,
+        show_result,
+    )
+    report = json.dumps({"results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+    return 1 if any("error" in result for result in results) else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli", description="Control DeepFilterNet noise suppression"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("status", help="Show connection and attenuation").set_defaults(
+        func=cmd_status
+    )
+    commands.add_parser("list", help="List microphones").set_defaults(func=cmd_list)
+
+    connect = commands.add_parser("connect", help="Connect microphone")
+    connect.add_argument("device", nargs="?", help="Name or description")
+    connect.add_argument(
+        "--dedicated",
+        action="store_true",
+        help="Use own filter chain, so several microphones can be connected",
+    )
+    connect.set_defaults(func=cmd_connect)
+
+    disconnect = commands.add_parser("disconnect", help="Disconnect microphone")
+    disconnect.add_argument(
+        "device", nargs="?", help="Name or description, default shared chain"
+    )
+    disconnect.set_defaults(func=cmd_disconnect)
+
+    attenuation = commands.add_parser(
+        "set-attenuation", help="Set attenuation limit in dB"
+    )
+    attenuation.add_argument("db", type=float)
+    attenuation.add_argument("--device", help="Device with dedicated chain")
+    attenuation.set_defaults(func=cmd_set_attenuation)
+
+    latency = commands.add_parser(
+        "set-latency", help="Set loopback latency in ms and graph quantum"
+    )
+    latency.add_argument("ms", type=int)
+    latency.add_argument(
+        "--quantum", type=int, help="Samples per cycle, 0 for PipeWire default"
+    )
+    latency.add_argument("--device", help="Name or description")
+    latency.set_defaults(func=cmd_set_latency)
+
+    commands.add_parser("profiles", help="List noise profiles").set_defaults(
+        func=cmd_profiles
+    )
+
+    save_profile = commands.add_parser(
+        "save-profile", help="Add noise profile with own chain, or change it"
+    )
+    save_profile.add_argument("name")
+    save_profile.add_argument("db", type=float, help="Attenuation limit in dB")
+    save_profile.set_defaults(func=cmd_save_profile)
+
+    remove_profile = commands.add_parser("remove-profile", help="Remove noise profile")
+    remove_profile.add_argument("name")
+    remove_profile.set_defaults(func=cmd_remove_profile)
+
+    switch_profile = commands.add_parser(
+        "switch-profile", help="Move microphone to chain of noise profile"
+    )
+    switch_profile.add_argument(
+        "name", nargs="?", help="Profile, omit to return to own chain"
+    )
+    switch_profile.add_argument(
+        "--device", help="Name or description, default shared chain microphone"
+    )
+    switch_profile.set_defaults(func=cmd_switch_profile)
+
+    tune = commands.add_parser(
+        "tune", help="Find lowest latency that runs without xruns"
+    )
+    tune.add_argument("device", nargs="?", help="Name or description")
+    tune.add_argument(
+        "--settle", type=float, default=3.0, help="Seconds to watch each step"
+    )
+    tune.set_defaults(func=cmd_tune)
+
+    measure = commands.add_parser(
+        "measure-latency", help="Measure filter chain delay with probe chirps"
+    )
+    measure.add_argument(
+        "device", nargs="?", help="Microphone of chain, default shared"
+    )
+    measure.add_argument("--probes", type=int, default=20)
+    measure.add_argument(
+        "--history", action="store_true", help="Compare stored measurements"
+    )
+    measure.set_defaults(func=cmd_measure_latency)
+
+    daemon = commands.add_parser(
+        "daemon", help="Own routing and serve it to the GUI and scripts"
+    )
+    daemon.add_argument("--socket", help="Unix socket path, default in runtime dir")
+    daemon.set_defaults(func=cmd_daemon)
+
+    dsp = commands.add_parser(
+        "dsp", help="Show DSP load and xruns of chains and loopbacks"
+    )
+    dsp.add_argument("--samples", type=int, default=5)
+    dsp.add_argument(
+        "--interval", type=float, default=2.0, help="Seconds between samples"
+    )
+    dsp.add_argument(
+        "--alert", type=float, help="Load in percent to alert at, default 80"
+    )
+    dsp.set_defaults(func=cmd_dsp)
+
+    gate = commands.add_parser(
+        "gate", help="Bypass chains while microphones are silent, to save CPU"
+    )
+    gate.add_argument("action", nargs="?", choices=["on", "off", "stats"])
+    gate.add_argument(
+        "--threshold", type=float, help="Level in dBFS below which is silence"
+    )
+    gate.add_argument("--hold", type=int, help="Silence in ms before bypassing")
+    gate.add_argument(
+        "--attack", type=int, help="Longest time in ms to resume on speech"
+    )
+    gate.set_defaults(func=cmd_gate, action="stats")
+
+    denoise = commands.add_parser(
+        "denoise", help="Denoise WAV/FLAC files offline through the plugin"
+    )
+    denoise.add_argument("files", nargs="+")
+    denoise.add_argument("-o", "--output-dir", help="Default next to input file")
+    denoise.add_argument("-j", "--workers", type=int, help="Default CPU count")
+    denoise.add_argument("--block-size", type=int, default=1024)
+    denoise.add_argument("--attenuation", type=float, help="Attenuation limit in dB")
+    denoise.set_defaults(func=cmd_denoise)
+
+    profile = commands.add_parser(
+        "profile", help="Measure plugin cost per block size, rate and attenuation"
+    )
+    profile.add_argument(
+        "--block-sizes", type=int, nargs="+", default=[128, 256, 480, 1024]
+    )
+    profile.add_argument("--rates", type=int, nargs="+", default=[48000])
+    profile.add_argument(
+        "--attenuation", type=float, nargs="+", default=[20.0, 60.0, 100.0]
+    )
+    profile.add_argument(
+        "--signals",
+        nargs="+",
+        default=["speech_like", "white_noise", "silence"],
+        help="Synthetic signal names or WAV/FLAC recordings",
+    )
+    profile.add_argument("--seconds", type=float, default=10.0)
+    profile.add_argument(
+        "--no-isolate", action="store_true", help="Run in this process, faster"
+    )
+    profile.add_argument("--output", help="JSON file, default stdout")
+    profile.set_defaults(func=cmd_profile)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command in REMOTE_COMMANDS:
+        from system.daemon_client import running_daemon
+
+        socket_path = running_daemon()
+        if socket_path and args.command == "status":
+            return _status_from_daemon(socket_path)
+        if socket_path:
+            from core.remote_connector import RemoteConnector
+
+            return args.func(RemoteConnector(socket_path), args)
+
+    from core.connector import DeepFilterConnector
+
+    return args.func(DeepFilterConnector(), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
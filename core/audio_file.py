@@ -0,0 +1,226 @@
+import mmap
+import os
+import struct
+from typing import BinaryIO, Optional
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format, bits) -> (numpy dtype, scale to [-1, 1])
+WAV_SAMPLE_TYPES = {
+    (WAVE_FORMAT_PCM, 16): ("<i2", 1 / 32768),
+    (WAVE_FORMAT_PCM, 32): ("<i4", 1 / 2147483648),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): ("<f4", 1.0),
+}
+
+
+class AudioFileError(Exception):
+    """Unsupported or malformed audio file"""
+
+
+class WavReader:
+    """Memory-mapped WAV file read block by block as float32"""
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise AudioFileError(f"{path} is empty")
+
+        fmt, data_offset, data_size = self._parse_chunks(path)
+        audio_format, self.channels, self.rate, _, _, bits = struct.unpack(
+            "<HHIIHH", fmt[:16]
+        )
+        if audio_format == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+            audio_format = struct.unpack("<H", fmt[24:26])[0]
+
+        sample_type = WAV_SAMPLE_TYPES.get((audio_format, bits))
+        if not sample_type:
+            self.close()
+            raise AudioFileError(
+                f"{path}: unsupported WAV format {audio_format} with {bits} bits"
+            )
+        self.format = (audio_format, bits)
+        dtype, self.scale = sample_type
+        self.frames = data_size // (bits // 8 * self.channels)
+        # View into the mapping, samples are paged in as blocks are read
+        self._samples = np.frombuffer(
+            self._map,
+            dtype=dtype,
+            count=self.frames * self.channels,
+            offset=data_offset,
+        ).reshape(self.frames, self.channels)
+        self.position = 0
+
+    def _parse_chunks(self, path: str):
+        data = self._map
+        if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+            self.close()
+            raise AudioFileError(f"{path} is not a WAV file")
+
+        fmt = None
+        offset = 12
+        while offset + 8 <= len(data):
+            chunk_id = data[offset : offset + 4]
+            size = struct.unpack("<I", data[offset + 4 : offset + 8])[0]
+            body = offset + 8
+            if chunk_id == b"fmt ":
+                fmt = data[body : body + size]
+            elif chunk_id == b"data" and fmt is not None:
+                return fmt, body, min(size, len(data) - body)
+            offset = body + size + (size & 1)
+
+        self.close()
+        raise AudioFileError(f"{path} has no fmt or data chunk")
+
+    def read_into(self, out: np.ndarray) -> int:
+        """Fill out (frames, channels) from current position, return frames read"""
+        count = min(len(out), self.frames - self.position)
+        block = self._samples[self.position : self.position + count]
+        if self.scale == 1.0:
+            out[:count] = block
+        else:
+            np.multiply(block, self.scale, out=out[:count], casting="unsafe")
+        self.position += count
+        return count
+
+    def close(self):
+        # The view must go before the mapping can be closed
+        self._samples = None
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+class WavWriter:
+    """WAV file written block by block from float32"""
+
+    def __init__(self, path: str, rate: int, channels: int, format=None):
+        audio_format, bits = format or (WAVE_FORMAT_PCM, 16)
+        dtype, scale = WAV_SAMPLE_TYPES[(audio_format, bits)]
+        self.rate = rate
+        self.channels = channels
+        self._audio_format = audio_format
+        self._bits = bits
+        self._dtype = np.dtype(dtype)
+        self._scale = 1 / scale
+        self._buffer: Optional[np.ndarray] = None
+        self._scratch: Optional[np.ndarray] = None
+        self.frames = 0
+        self._file: BinaryIO = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        block_align = self.channels * self._bits // 8
+        data_size = self.frames * block_align
+        self._file.write(
+            b"RIFF"
+            + struct.pack("<I", 36 + data_size)
+            + b"WAVEfmt "
+            + struct.pack(
+                "<IHHIIHH",
+                16,
+                self._audio_format,
+                self.channels,
+                self.rate,
+                self.rate * block_align,
+                block_align,
+                self._bits,
+            )
+            + b"data"
+            + struct.pack("<I", data_size)
+        )
+
+    def write(self, block: np.ndarray):
+        """Write float32 (frames, channels) block"""
+        if self._audio_format == WAVE_FORMAT_IEEE_FLOAT:
+            self._file.write(np.ascontiguousarray(block, dtype=self._dtype))
+        else:
+            if self._buffer is None or len(self._buffer) < len(block):
+                self._scratch = np.empty(block.shape, dtype=np.float32)
+                self._buffer = np.empty(block.shape, dtype=self._dtype)
+            scratch = self._scratch[: len(block)]
+            np.multiply(block, self._scale, out=scratch)
+            limits = np.iinfo(self._dtype)
+            np.clip(scratch, limits.min, limits.max, out=scratch)
+            buffer = self._buffer[: len(block)]
+            np.rint(scratch, out=scratch)
+            buffer[:] = scratch
+            self._file.write(buffer)
+        self.frames += len(block)
+
+    def close(self):
+        self._file.seek(0)
+        self._write_header()
+        self._file.close()
+
+
+class SoundFileReader:
+    """FLAC and other formats through the optional soundfile package"""
+
+    def __init__(self, path: str):
+        try:
+            import soundfile
+        except ImportError:
+            raise AudioFileError(f"Install soundfile to read {os.path.basename(path)}")
+
+        self._file = soundfile.SoundFile(path)
+        self.rate = self._file.samplerate
+        self.channels = self._file.channels
+        self.frames = self._file.frames
+        self.subtype = self._file.subtype
+        self.position = 0
+
+    def read_into(self, out: np.ndarray) -> int:
+        count = len(self._file.read(len(out), dtype="float32", out=out))
+        self.position += count
+        return count
+
+    def close(self):
+        self._file.close()
+
+
+class SoundFileWriter:
+    """FLAC and other formats through the optional soundfile package"""
+
+    def __init__(
+        self, path: str, rate: int, channels: int, subtype: Optional[str] = None
+    ):
+        try:
+            import soundfile
+        except ImportError:
+            raise AudioFileError(f"Install soundfile to write {os.path.basename(path)}")
+
+        # Container format follows the file extension
+        self._file = soundfile.SoundFile(path, "w", rate, channels, subtype=subtype)
+        self.frames = 0
+
+    def write(self, block: np.ndarray):
+        self._file.write(block)
+        self.frames += len(block)
+
+    def close(self):
+        self._file.close()
+
+
+def open_reader(path: str):
+    """Open WAV with mmap, other formats with soundfile"""
+    if path.lower().endswith(".wav"):
+        return WavReader(path)
+    return SoundFileReader(path)
+
+
+def open_writer(path: str, reader):
+    """Open writer with sample format of reader where possible"""
+    if path.lower().endswith(".wav"):
+        format = reader.format if isinstance(reader, WavReader) else None
+        return WavWriter(path, reader.rate, reader.channels, format)
+    return SoundFileWriter(
+        path, reader.rate, reader.channels, getattr(reader, "subtype", None)
+    )
@@ -0,0 +1,163 @@
+import os
+import queue
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from models.batch_job import BatchJob, BatchProgress, BatchResult
+from system.ladspa_host import DataPointer, LadspaError, LadspaPlugin
+
+from core.audio_file import AudioFileError, open_reader, open_writer
+
+PROGRESS_INTERVAL = 0.2
+
+# Set in pool workers by _init_worker
+_progress_queue = None
+
+
+def output_path_for(input_path: str, output_dir: Optional[str] = None) -> str:
+    """Default output path, e.g. talk.wav -> talk.denoised.wav"""
+    stem, ext = os.path.splitext(os.path.basename(input_path))
+    directory = output_dir or os.path.dirname(input_path)
+    return os.path.join(directory, f"{stem}.denoised{ext}")
+
+
+def process_file(
+    job: BatchJob,
+    progress: Optional[Callable[[int, int, int, float], None]] = None,
+) -> BatchResult:
+    """Stream file through plugin in fixed-size blocks"""
+    result = BatchResult(job.input_path, job.output_path)
+    start = time.perf_counter()
+    reader = writer = None
+    instances = []
+    try:
+        plugin = LadspaPlugin(job.plugin, job.label)
+        reader = open_reader(job.input_path)
+        result.rate = reader.rate
+
+        n_inputs = len(plugin.audio_inputs)
+        if n_inputs == reader.channels:
+            groups = [list(range(reader.channels))]
+        elif n_inputs == 1 and len(plugin.audio_outputs) == 1:
+            # Mono plugin, one instance per channel
+            groups = [[channel] for channel in range(reader.channels)]
+        else:
+            raise LadspaError(
+                f"{job.label} has {n_inputs} inputs, file has {reader.channels} channels"
+            )
+
+        block_size = job.block_size
+        frames_in = np.zeros((block_size, reader.channels), dtype=np.float32)
+        frames_out = np.zeros((block_size, reader.channels), dtype=np.float32)
+        # Plugin ports need one contiguous buffer per channel
+        planar_in = np.zeros((reader.channels, block_size), dtype=np.float32)
+        planar_out = np.zeros((reader.channels, block_size), dtype=np.float32)
+
+        for channels in groups:
+            instance = plugin.instantiate(reader.rate, job.controls)
+            instances.append(instance)
+            for port, channel in zip(plugin.audio_inputs, channels):
+                instance.connect(port, planar_in[channel].ctypes.data_as(DataPointer))
+            for port, channel in zip(plugin.audio_outputs, channels):
+                instance.connect(port, planar_out[channel].ctypes.data_as(DataPointer))
+
+        writer = open_writer(job.output_path, reader)
+        last_report = 0.0
+        while True:
+            count = reader.read_into(frames_in)
+            if not count:
+                break
+            np.copyto(planar_in[:, :count], frames_in[:count].T)
+            for instance in instances:
+                instance.run(count)
+            np.copyto(frames_out[:count], planar_out[:, :count].T)
+            writer.write(frames_out[:count])
+            result.frames += count
+
+            now = time.perf_counter()
+            if progress and now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                progress(result.frames, reader.frames, reader.rate, now - start)
+    except (OSError, LadspaError, AudioFileError) as e:
+        result.error = str(e)
+    finally:
+        for instance in instances:
+            instance.close()
+        if writer:
+            writer.close()
+        if reader:
+            reader.close()
+
+    result.seconds = time.perf_counter() - start
+    if progress and result.success:
+        progress(result.frames, result.frames, result.rate, result.seconds)
+    return result
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _run_job(index: int, job: BatchJob) -> BatchResult:
+    """Process job in pool worker, reporting progress through queue"""
+
+    def report(done: int, total: int, rate: int, elapsed: float):
+        _progress_queue.put(BatchProgress(index, done, total, rate, elapsed))
+
+    return process_file(job, report if _progress_queue is not None else None)
+
+
+class BatchProcessor:
+    """Denoise files in parallel worker processes"""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(
+        self,
+        jobs: List[BatchJob],
+        on_progress: Optional[Callable[[BatchProgress], None]] = None,
+    ) -> List[BatchResult]:
+        """Process jobs, results in job order"""
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        if not jobs:
+            return []
+
+        # Workers must not inherit UI threads and open pipes
+        context = multiprocessing.get_context("spawn")
+        progress_queue = context.Queue()
+        workers = min(self.workers, len(jobs))
+        with ProcessPoolExecutor(
+            workers, context, initializer=_init_worker, initargs=(progress_queue,)
+        ) as pool:
+            futures = [pool.submit(_run_job, i, job) for i, job in enumerate(jobs)]
+            while not all(future.done() for future in futures):
+                self._drain(progress_queue, on_progress, timeout=PROGRESS_INTERVAL)
+            self._drain(progress_queue, on_progress, timeout=0)
+
+            results = []
+            for job, future in zip(jobs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(
+                        BatchResult(job.input_path, job.output_path, error=str(e))
+                    )
+        return results
+
+    @staticmethod
+    def _drain(progress_queue, on_progress, timeout: float):
+        """Forward queued progress updates"""
+        try:
+            item = progress_queue.get(timeout=timeout) if timeout else None
+            while True:
+                if item is not None and on_progress:
+                    on_progress(item)
+                item = progress_queue.get_nowait()
+        except queue.Empty:
+            pass
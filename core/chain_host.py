@@ -0,0 +1,246 @@
+import os
+import re
+import signal
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Set
+
+from models.filter_chain_config import PROFILE_OUTPUT_NODE, FilterChainConfig
+from system.metrics import timed
+
+# Key of the profile source node in the host state
+PROFILE_SOURCE = "profile-source"
+UNLOAD_TIMEOUT = 2.0
+
+
+@dataclass
+class HostedChain:
+    """Filter chain kept loaded by a pw-cli process"""
+
+    pid: int
+    # Config the chain was loaded with, None for the profile source
+    config: Optional[FilterChainConfig] = None
+
+
+@dataclass
+class ChainPlan:
+    """Runtime module operations that turn loaded chains into desired ones"""
+
+    load: List[FilterChainConfig] = field(default_factory=list)
+    # Ids of hosted chains to stop, including those reloaded
+    unload: List[str] = field(default_factory=list)
+    # Hosted chains whose controls changed, applied live
+    live: List[FilterChainConfig] = field(default_factory=list)
+    # Ids of chains in the graph that were not loaded by us, e.g. from the
+    # config file at login
+    static: List[str] = field(default_factory=list)
+    # Static chains whose module is destroyed and loaded again by us
+    replace: List[str] = field(default_factory=list)
+    load_source: bool = False
+
+    @property
+    def empty(self) -> bool:
+        return not (
+            self.load or self.unload or self.live or self.replace or self.load_source
+        )
+
+
+class ChainHost:
+    """Load filter chains at runtime instead of restarting PipeWire
+
+    Every chain lives in its own pw-cli process, so one chain can be
+    reloaded without touching the others. Pids are stored, so the CLI and
+    later app runs can unload chains started by an earlier process.
+    """
+
+    def __init__(self, controller, config_manager):
+        self.controller = controller
+        self.config_manager = config_manager
+        self.settings = config_manager.settings
+        # Hosts started by this process, kept to reap them
+        self._processes: Dict[int, subprocess.Popen] = {}
+        self.chains: Dict[str, HostedChain] = {}
+        self._load_state()
+
+    def _load_state(self):
+        """Read hosted chains whose process is still running"""
+        import json
+
+        try:
+            with open(self.settings.chains_path) as f:
+                data = json.load(f)
+            for chain_id, entry in data.items():
+                config = entry.get("config")
+                chain = HostedChain(
+                    int(entry["pid"]),
+                    FilterChainConfig(**config) if config else None,
+                )
+                if self._alive(chain.pid):
+                    self.chains[chain_id] = chain
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            print(f"Runtime chains read error: {e}")
+
+    def _save_state(self):
+        import json
+
+        data = {
+            chain_id: {
+                "pid": chain.pid,
+                "config": asdict(chain.config) if chain.config else None,
+            }
+            for chain_id, chain in sorted(self.chains.items())
+        }
+        try:
+            self.config_manager._write_atomic(
+                json.dumps(data, indent=2) + "\n", self.settings.chains_path
+            )
+        except OSError as e:
+            print(f"Runtime chains write error: {e}")
+
+    def _alive(self, pid: int) -> bool:
+        """Whether pid is a running pw-cli host"""
+        process = self._processes.get(pid)
+        if process is not None:
+            return process.poll() is None
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                return b"pw-cli" in f.read()
+        except OSError:
+            return False
+
+    def prune(self) -> bool:
+        """Forget chains whose host exited, e.g. with PipeWire, True if any"""
+        dead = [cid for cid, chain in self.chains.items() if not self._alive(chain.pid)]
+        for chain_id in dead:
+            self._processes.pop(self.chains.pop(chain_id).pid, None)
+        if dead:
+            self._save_state()
+        return bool(dead)
+
+    def configs(self) -> List[FilterChainConfig]:
+        """Configs of hosted chains"""
+        return [chain.config for chain in self.chains.values() if chain.config]
+
+    def plan(
+        self,
+        desired: List[FilterChainConfig],
+        existing_nodes: Set[str],
+        replace: Optional[Set[str]] = None,
+    ) -> ChainPlan:
+        """Compare desired chains with hosted chains and nodes in the graph
+
+        Static chains with ids in replace are taken over and reloaded.
+        """
+        self.prune()
+        result = ChainPlan()
+        desired_ids = {config.chain_id for config in desired}
+
+        for config in desired:
+            chain = self.chains.get(config.chain_id)
+            if chain is None:
+                if config.input_node not in existing_nodes:
+                    result.load.append(config)
+                elif replace and config.chain_id in replace:
+                    result.replace.append(config.chain_id)
+                    result.load.append(config)
+                else:
+                    result.static.append(config.chain_id)
+                continue
+
+            diff = config.diff(chain.config)
+            if diff.empty:
+                continue
+            if diff.controls_only:
+                result.live.append(config)
+            else:
+                result.unload.append(config.chain_id)
+                result.load.append(config)
+
+        for chain_id in self.chains:
+            if chain_id != PROFILE_SOURCE and chain_id not in desired_ids:
+                result.unload.append(chain_id)
+
+        wants_source = any(config.profile for config in desired)
+        if wants_source:
+            result.load_source = (
+                PROFILE_SOURCE not in self.chains
+                and PROFILE_OUTPUT_NODE not in existing_nodes
+            )
+        elif PROFILE_SOURCE in self.chains:
+            result.unload.append(PROFILE_SOURCE)
+        return result
+
+    @timed("chain_host.apply")
+    def apply(self, todo: ChainPlan) -> List[str]:
+        """Stop and start hosts, return nodes that have to appear"""
+        for chain_id in todo.unload:
+            self._stop(chain_id)
+        if todo.replace:
+            self._destroy_static([c for c in todo.load if c.chain_id in todo.replace])
+
+        nodes = []
+        if todo.load_source:
+            process = self.controller.create_adapter_node(
+                self.config_manager.render_profile_source_args()
+            )
+            self._processes[process.pid] = process
+            self.chains[PROFILE_SOURCE] = HostedChain(process.pid)
+            nodes.append(PROFILE_OUTPUT_NODE)
+
+        for config in todo.load:
+            process = self.controller.load_filter_chain(
+                self.config_manager.render_args(config)
+            )
+            self._processes[process.pid] = process
+            self.chains[config.chain_id] = HostedChain(process.pid, config)
+            nodes += [config.input_node, config.output_node]
+
+        for config in todo.live:
+            self.chains[config.chain_id].config = config
+
+        if not todo.empty:
+            self._save_state()
+        return nodes
+
+    def _stop(self, chain_id: str):
+        """Stop host of chain and wait until it is gone"""
+        chain = self.chains.pop(chain_id, None)
+        if chain is None:
+            return
+        try:
+            os.kill(chain.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+
+        # Reloaded chain reuses node names, the old nodes must be gone first
+        deadline = time.monotonic() + UNLOAD_TIMEOUT
+        while self._alive(chain.pid) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        process = self._processes.pop(chain.pid, None)
+        if process is not None:
+            process.poll()
+
+    def _destroy_static(self, configs: List[FilterChainConfig]):
+        """Unload filter-chain modules loaded from the config file"""
+        names = {config.input_node for config in configs}
+        for module_id, args in self.controller.list_filter_chains().items():
+            if set(re.findall(r'node\.name\s*=\s*"([^"]+)"', args)) & names:
+                result = self.controller.destroy_object(module_id)
+                if not result.success:
+                    print(f"Destroy module {module_id} error: {result.stderr}")
+
+        deadline = time.monotonic() + UNLOAD_TIMEOUT
+        while self.controller.get_node_ids(sorted(names)):
+            if time.monotonic() > deadline:
+                print(f"Static chains still present: {sorted(names)}")
+                return
+            time.sleep(0.02)
+
+    def stop_all(self):
+        """Unload all chains loaded at runtime"""
+        for chain_id in list(self.chains):
+            self._stop(chain_id)
+        self._save_state()
@@ -1,6 +1,24 @@
 import os
+import re
+from dataclasses import asdict
+from typing import List, Optional
 
+from models.filter_chain_config import (
+    PROFILE_DESCRIPTION,
+    PROFILE_OUTPUT_NODE,
+    ConfigDiff,
+    FilterChainConfig,
+    diff_chains,
+    matched_format,
+)
+from models.latency_measurement import LatencyMeasurement
+from models.latency_profile import LatencyProfile
+from models.noise_profile import NoiseProfile
 from models.settings import Settings
+from models.state_snapshot import StateSnapshot
+
+ATTENUATION_CONTROL = "Attenuation Limit (dB)"
+MODULE_NAME = "libpipewire-module-filter-chain"
 
 
 class ConfigManager:
@@ -8,55 +26,408 @@ class ConfigManager:
 
     def __init__(self, settings: Settings):
         self.settings = settings
+        # Content of state file as last read or written
+        self._saved_state: Optional[str] = None
+
+    def desired_config(self) -> FilterChainConfig:
+        """Get shared filter-chain config for current settings"""
+        return FilterChainConfig(
+            plugin=self.settings.ladspa_path,
+            controls={ATTENUATION_CONTROL: float(self.settings.noise_attenuation)},
+            quantum=self.settings.quantum,
+        )
+
+    def desired_configs(self) -> List[FilterChainConfig]:
+        """Get shared chain, one chain per dedicated session and per profile"""
+        configs = [self.desired_config()]
+        for device, attenuation in sorted(self.settings.sessions.items()):
+            label, channels = matched_format(
+                self.settings.device_channels.get(device, 1)
+            )
+            configs.append(
+                FilterChainConfig(
+                    plugin=self.settings.ladspa_path,
+                    label=label,
+                    controls={ATTENUATION_CONTROL: float(attenuation)},
+                    channels=channels,
+                    quantum=self.settings.latency_for(device).quantum,
+                    device=device,
+                )
+            )
+        for name in sorted(self.settings.profiles):
+            configs.append(self.profile_config(name))
+        return configs
 
-    def update_config(self) -> bool:
-        """Update PipeWire configuration file"""
+    def profile_config(self, name: str) -> Optional[FilterChainConfig]:
+        """Get chain of noise profile, None if profile is unknown"""
+        profile = self.settings.profiles.get(name)
+        if profile is None:
+            return None
+        return FilterChainConfig(
+            plugin=self.settings.ladspa_path,
+            controls={ATTENUATION_CONTROL: float(profile.attenuation)},
+            quantum=self.settings.quantum,
+            profile=name,
+        )
+
+    def read_configs(self) -> Optional[List[FilterChainConfig]]:
+        """Parse filter-chain configs from file on disk"""
         try:
-            config_content = f"""context.modules = [
-  {{   name = libpipewire-module-filter-chain
-      args = {{
-          node.description = "DeepFilter Noise Cancelling"
-          media.name       = "DeepFilter Noise Cancelling"
-          filter.graph = {{
+            with open(self.settings.config_path) as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        configs = []
+        for block in content.split(MODULE_NAME)[1:]:
+            config = self._parse_block(block)
+            if config is None:
+                return None
+            configs.append(config)
+        return configs or None
+
+    @staticmethod
+    def _parse_block(block: str) -> Optional[FilterChainConfig]:
+        """Parse args of one filter-chain module"""
+        plugin = re.search(r'plugin\s*=\s*"([^"]*)"', block)
+        label = re.search(r"label\s*=\s*(\S+)", block)
+        rate = re.search(r"audio\.rate\s*=\s*(\d+)", block)
+        channels = re.search(r"audio\.channels\s*=\s*(\d+)", block)
+        quantum = re.search(r'node\.latency\s*=\s*"(\d+)/', block)
+        device = re.search(r'deepfilter\.device\s*=\s*"([^"]*)"', block)
+        profile = re.search(r'deepfilter\.profile\s*=\s*"([^"]*)"', block)
+        control_block = re.search(r"control\s*=\s*\{([^}]*)\}", block)
+        if not (plugin and label and rate and channels):
+            return None
+
+        controls = {}
+        if control_block:
+            for name, value in re.findall(
+                r'"([^"]+)"\s*=\s*([-\d.]+)', control_block.group(1)
+            ):
+                controls[name] = float(value)
+
+        return FilterChainConfig(
+            plugin=plugin.group(1),
+            label=label.group(1),
+            controls=controls,
+            rate=int(rate.group(1)),
+            channels=int(channels.group(1)),
+            quantum=int(quantum.group(1)) if quantum else 0,
+            device=device.group(1) if device else "",
+            profile=profile.group(1) if profile else "",
+        )
+
+    def read_config(self) -> Optional[FilterChainConfig]:
+        """Parse shared filter-chain config from file on disk"""
+        for config in self.read_configs() or []:
+            if not config.owner:
+                return config
+        return None
+
+    def diff(self) -> ConfigDiff:
+        """Compare config on disk with desired config"""
+        current = self.read_configs()
+        if current is None:
+            return ConfigDiff({"file": (None, self.settings.config_path)})
+        return diff_chains(self.desired_configs(), current)
+
+    def render(self, configs: List[FilterChainConfig]) -> str:
+        """Render filter-chain config file"""
+        # Objects come first, so module blocks parse without them
+        objects = ""
+        if any(config.profile for config in configs):
+            objects = "context.objects = [\n" + self._render_profile_source() + "]\n"
+        return (
+            objects
+            + "context.modules = [\n"
+            + "".join(self._render_module(config) for config in configs)
+            + "]\n"
+        )
+
+    @classmethod
+    def _render_profile_source(cls) -> str:
+        """Render virtual source the profile chains play into"""
+        return f"""  {{   factory = adapter
+      args = {cls.render_profile_source_args()}
+  }}
+"""
+
+    @staticmethod
+    def render_profile_source_args() -> str:
+        """Render properties of the profile source node"""
+        return f"""{{
+          factory.name     = support.null-audio-sink
+          node.name        = "{PROFILE_OUTPUT_NODE}"
+          node.description = "{PROFILE_DESCRIPTION}"
+          media.class      = Audio/Source/Virtual
+          audio.position   = [ MONO ]
+      }}"""
+
+    @classmethod
+    def _render_module(cls, config: FilterChainConfig) -> str:
+        """Render one filter-chain module"""
+        return f"""  {{   name = {MODULE_NAME}
+      args = {cls.render_args(config)}
+  }}
+"""
+
+    @staticmethod
+    def render_args(config: FilterChainConfig) -> str:
+        """Render args of one filter-chain module, same for file and runtime"""
+        controls = "\n".join(
+            f'                          "{name}" = {value}'
+            for name, value in config.controls.items()
+        )
+        device = (
+            f'          deepfilter.device = "{config.device}"\n'
+            if config.device
+            else ""
+        )
+        if config.profile:
+            device += f'          deepfilter.profile = "{config.profile}"\n'
+        # Profile chains are streams into the shared profile source
+        playback = (
+            f'target.object  = "{PROFILE_OUTPUT_NODE}"'
+            if config.profile
+            else "media.class    = Audio/Source"
+        )
+        position = "MONO" if config.channels == 1 else "FL FR"
+        latency = (
+            f'\n              node.latency   = "{config.quantum}/{config.rate}"'
+            if config.quantum
+            else ""
+        )
+        return f"""{{
+          node.description = "{config.description}"
+          media.name       = "{config.description}"
+{device}          filter.graph = {{
               nodes = [
                   {{
                       type   = ladspa
                       name   = deep_filter
-                      plugin = "{self.settings.ladspa_path}"
-                      label  = deep_filter_mono
+                      plugin = "{config.plugin}"
+                      label  = {config.label}
                       control = {{
-                          "Attenuation Limit (dB)" = {self.settings.noise_attenuation}
+{controls}
                       }}
                   }}
               ]
           }}
-          audio.rate = 48000
-          audio.channels = 1
-          audio.position = [ MONO ]
+          audio.rate = {config.rate}
+          audio.channels = {config.channels}
+          audio.position = [ {position} ]
           capture.props = {{
-              node.name      = "effect_input.deep_filter"
+              node.name      = "{config.input_node}"
               media.class    = Audio/Sink
-              audio.rate     = 48000
-              audio.channels = 1
+              audio.rate     = {config.rate}
+              audio.channels = {config.channels}
               stream.capture.sink = true
-              node.passive   = true
+              node.passive   = true{latency}
           }}
           playback.props = {{
-              node.name      = "effect_output.deep_filter"
-              media.class    = Audio/Source
-              audio.rate     = 48000
-              audio.channels = 1
+              node.name      = "{config.output_node}"
+              {playback}
+              audio.rate     = {config.rate}
+              audio.channels = {config.channels}{latency}
           }}
-      }}
-  }}
-]
-"""
-            os.makedirs(os.path.dirname(self.settings.config_path), exist_ok=True)
+      }}"""
+
+    def load_device_latency(self):
+        """Read latency profiles of devices"""
+        import json
+
+        try:
+            with open(self.settings.latency_path) as f:
+                data = json.load(f)
+            self.settings.device_latency = {
+                device: LatencyProfile(**profile) for device, profile in data.items()
+            }
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Latency profiles read error: {e}")
+
+    def save_device_latency(self) -> bool:
+        """Write latency profiles of devices"""
+        import json
 
-            with open(self.settings.config_path, "w") as f:
-                f.write(config_content)
+        data = {
+            device: asdict(profile)
+            for device, profile in sorted(self.settings.device_latency.items())
+        }
+        try:
+            self._write_atomic(
+                json.dumps(data, indent=2) + "\n", self.settings.latency_path
+            )
+            return True
+        except OSError as e:
+            print(f"Latency profiles write error: {e}")
+            return False
+
+    def load_profiles(self):
+        """Read noise profiles and the profile each device is switched to"""
+        import json
 
+        try:
+            with open(self.settings.profiles_path) as f:
+                data = json.load(f)
+            self.settings.profiles = {
+                name: NoiseProfile(name, float(attenuation))
+                for name, attenuation in data.get("profiles", {}).items()
+            }
+            self.settings.active_profiles = {
+                device: name
+                for device, name in data.get("active", {}).items()
+                if name in self.settings.profiles
+            }
+            self.settings.suspend_unused_profiles = bool(
+                data.get("suspend_unused", False)
+            )
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Noise profiles read error: {e}")
+
+    def save_profiles(self) -> bool:
+        """Write noise profiles and the profile each device is switched to"""
+        import json
+
+        data = {
+            "profiles": {
+                name: profile.attenuation
+                for name, profile in sorted(self.settings.profiles.items())
+            },
+            "active": dict(sorted(self.settings.active_profiles.items())),
+            "suspend_unused": self.settings.suspend_unused_profiles,
+        }
+        try:
+            self._write_atomic(
+                json.dumps(data, indent=2) + "\n", self.settings.profiles_path
+            )
             return True
+        except OSError as e:
+            print(f"Noise profiles write error: {e}")
+            return False
+
+    def load_state(self) -> Optional[StateSnapshot]:
+        """Read last known state, None if there is none"""
+        import json
+
+        try:
+            with open(self.settings.state_path) as f:
+                content = f.read()
+            snapshot = StateSnapshot.from_dict(json.loads(content))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"State cache read error: {e}")
+            return None
+        self._saved_state = content
+        return snapshot
+
+    def save_state(self, snapshot: StateSnapshot) -> bool:
+        """Write state if it changed since last read or write"""
+        import json
+
+        content = json.dumps(asdict(snapshot), indent=2) + "\n"
+        if content == self._saved_state:
+            return True
+        try:
+            self._write_atomic(content, self.settings.state_path)
+        except OSError as e:
+            print(f"State cache write error: {e}")
+            return False
+        self._saved_state = content
+        return True
+
+    def load_latency_measurements(self) -> List[LatencyMeasurement]:
+        """Read stored probe measurements, oldest first"""
+        import json
+
+        measurements = []
+        try:
+            with open(self.settings.measurements_path) as f:
+                for line in f:
+                    if line.strip():
+                        measurements.append(LatencyMeasurement(**json.loads(line)))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Latency measurements read error: {e}")
+        return measurements
+
+    def save_latency_measurement(self, measurement: LatencyMeasurement) -> bool:
+        """Append probe measurement to history"""
+        import json
+
+        path = self.settings.measurements_path
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a") as f:
+                f.write(json.dumps(asdict(measurement)) + "\n")
+            return True
+        except OSError as e:
+            print(f"Latency measurements write error: {e}")
+            return False
+
+    def _write_atomic(self, content: str, path: Optional[str] = None):
+        """Write file via temp file, fsync and rename"""
+        import tempfile
+
+        path = path or self.settings.config_path
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".deepfilter-")
+        try:
+            # mkstemp creates the file 0600, keep the mode the file had
+            os.fchmod(fd, self._file_mode(path))
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    @staticmethod
+    def _file_mode(path: str) -> int:
+        """Permissions of existing file, else the umask default"""
+        import stat
+
+        try:
+            return stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+    def remove_config(self) -> bool:
+        """Delete config file, chains then exist only while loaded at runtime"""
+        try:
+            os.unlink(self.settings.config_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Config remove error: {e}")
+            return False
+        return True
+
+    def update_config(self) -> Optional[ConfigDiff]:
+        """Update PipeWire configuration file if it differs, None on error"""
+        try:
+            diff = self.diff()
+            if not diff.empty:
+                self._write_atomic(self.render(self.desired_configs()))
+            return diff
         except Exception as e:
             print(f"Config update error: {e}")
-            return False
+            return None
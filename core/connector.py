@@ -1,12 +1,37 @@
-import re
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
 from models.audio_device import AudioDevice
+from models.audio_graph import AudioGraph
+from models.gate_stats import GateStats
+from models.filter_chain_config import (
+    OUTPUT_NODE,
+    PROFILE_OUTPUT_NODE,
+    FilterChainConfig,
+    is_profile_node,
+    matched_format,
+)
+from models.latency_measurement import LatencyMeasurement
+from models.module_info import ModuleInfo
+from models.noise_profile import NoiseProfile
+from models.routing_state import MONITOR_SOURCES, is_managed
+from models.session import Session
 from models.settings import Settings
+from models.state_snapshot import StateSnapshot
+from system.metrics import timed
 from system.pipewire_controller import PipeWireController
 
-from core.config_manager import ConfigManager
+from core.config_manager import ATTENUATION_CONTROL, ConfigManager
 from core.device_manager import DeviceManager
+from core.device_monitor import DeviceMonitor
+from core.reconciler import Reconciler
+
+if TYPE_CHECKING:
+    from core.chain_host import ChainHost
+
+# Values of Settings.chain_loading
+CHAINS_CONFIG = "config"
+CHAINS_RUNTIME = "runtime"
+CHAINS_RUNTIME_ONLY = "runtime-only"
 
 
 class DeepFilterConnector:
@@ -17,110 +42,760 @@ class DeepFilterConnector:
         self.device_manager = DeviceManager()
         self.config_manager = ConfigManager(self.settings)
         self.controller = PipeWireController()
-        self.current_loopback_id: Optional[str] = None
+        self._async_controller = None
+        self.device_monitor = DeviceMonitor(self.controller)
+        self._modules: Optional[List[ModuleInfo]] = None
+        # Connection table keyed by device name
+        self.sessions: Dict[str, Session] = {}
+        self.reconciler = Reconciler(self)
+        # Loopbacks of earlier runs were taken into the desired routing
+        self._recovered = False
+        # Loads chains at runtime, None when they come from the config file
+        self.chain_host: Optional["ChainHost"] = None
+        # Silence gates, created on first start since they need numpy
+        self.gates = None
+        if self.settings.chain_loading != CHAINS_CONFIG:
+            from core.chain_host import ChainHost
+
+            self.chain_host = ChainHost(self.controller, self.config_manager)
+        self.config_manager.load_device_latency()
+        self.config_manager.load_profiles()
+        self._load_sessions_from_config()
+        self._restore_state()
+
+    @property
+    def async_controller(self):
+        """Asyncio controller, imported on first use to keep startup fast"""
+        if self._async_controller is None:
+            from system.async_pipewire_controller import AsyncPipeWireController
+
+            self._async_controller = AsyncPipeWireController()
+        return self._async_controller
+
+    def start_device_monitor(self) -> bool:
+        """Seed device/module index and start listening for changes"""
+        if self.device_monitor.running:
+            return True
+        if not self.device_manager.refresh_devices():
+            return False
+        return self.device_monitor.start(
+            self.device_manager.get_devices(), self._list_modules()
+        )
 
     def get_devices(self) -> list:
         """Get list of audio devices"""
+        if self.device_monitor.running:
+            self.device_manager.devices = self.device_monitor.get_devices()
+            return self.device_manager.get_devices()
+
         success = self.device_manager.refresh_devices()
         if success:
+            self.save_state()
             return self.device_manager.get_devices()
         return []
 
-    def check_existing_connection(self) -> Optional[str]:
-        """Check for existing loopback connection"""
+    def _snapshot(self) -> Optional[AudioGraph]:
+        """Get graph snapshot of current UI action, taking one if needed"""
+        if self.device_manager.graph:
+            return self.device_manager.graph
+        return self.device_manager.refresh_graph()
+
+    def _invalidate_snapshot(self):
+        """Drop graph snapshot after changing the graph"""
+        self.device_manager.graph = None
+        self._modules = None
+
+    def _list_modules(self) -> List[ModuleInfo]:
+        """Get loaded modules, from index when monitor is running"""
+        if self.device_monitor.running:
+            return self.device_monitor.get_modules()
+
+        graph = self._snapshot()
+        if graph:
+            return list(graph.modules.values())
+
+        if self._modules is not None:
+            return self._modules
+
         result = self.controller.list_modules()
         if not result.success:
-            return None
+            return []
+        return ModuleInfo.from_short_list(result.stdout)
+
+    def _get_module(self, module_id: str) -> Optional[ModuleInfo]:
+        """Get loaded module by id"""
+        if not self.device_monitor.running:
+            graph = self._snapshot()
+            if graph:
+                return graph.get_module(module_id)
 
-        for line in result.stdout.split("\n"):
-            if "module-loopback" in line and "sink=effect_input.deep_filter" in line:
-                parts = line.split("\t")
-                if len(parts) > 2:
-                    module_id = parts[0]
-                    args = parts[2].split()
-
-                    for arg in args:
-                        if arg.startswith("source="):
-                            source_name = arg.split("=")[1]
-                            self.current_loopback_id = module_id
-                            return source_name
+        for module in self._list_modules():
+            if module.id == module_id:
+                return module
         return None
 
-    def connect_microphone(self, device: AudioDevice) -> Tuple[bool, str]:
-        """Connect microphone to noise suppression"""
-        result = self.controller.load_loopback(
-            device.name, "effect_input.deep_filter", 20
+    @property
+    def current_loopback_id(self) -> Optional[str]:
+        """Loopback of microphone on the shared chain"""
+        for session in self.sessions.values():
+            if not session.dedicated:
+                return session.loopback_id
+        return None
+
+    @property
+    def monitor_loopback_id(self) -> Optional[str]:
+        """Loopback of the real-time test, None when it is off"""
+        if not self.reconciler.state.monitor_sink:
+            return None
+        return self.reconciler.monitor_id
+
+    def _chain_for(self, device_name: str) -> FilterChainConfig:
+        """Get chain the device is routed into"""
+        profile = self.settings.active_profiles.get(device_name)
+        if profile in self.settings.profiles:
+            return self.config_manager.profile_config(profile)
+        for config in self.config_manager.desired_configs():
+            if config.device == device_name:
+                return config
+        return self.config_manager.desired_config()
+
+    def _chain_nodes(self) -> List[str]:
+        """Get sink and source node names of all chains"""
+        nodes = []
+        for config in self.config_manager.desired_configs():
+            nodes += [config.input_node, config.output_node]
+        if self.settings.profiles:
+            nodes.append(PROFILE_OUTPUT_NODE)
+        return nodes
+
+    def dsp_targets(self) -> Dict[int, str]:
+        """Node id -> label of chain nodes and DeepFilter loopbacks
+
+        Reads a fresh graph, it is called from the DSP monitor thread.
+        """
+        result = self.controller.dump_graph()
+        if not result.success:
+            return {}
+        try:
+            graph = AudioGraph.from_pw_dump(result.stdout)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Graph parse error: {e}")
+            return {}
+
+        targets = {}
+        for name in self._chain_nodes():
+            node = graph.get_node(name)
+            if node:
+                targets[node.id] = name
+        for module in graph.modules.values():
+            source, sink = module.args.get("source", ""), module.args.get("sink", "")
+            if not is_managed(source, sink):
+                continue
+            owner = "monitor" if source in MONITOR_SOURCES else source
+            for node in graph.nodes.values():
+                if node.module_id != module.id:
+                    continue
+                side = (
+                    "capture"
+                    if node.media_class.startswith("Stream/Input")
+                    else "playback"
+                )
+                targets[node.id] = f"loopback {owner} ({side})"
+        return targets
+
+    def _load_sessions_from_config(self):
+        """Recover dedicated chains and shared quantum from config file"""
+        configs = self.config_manager.read_configs()
+        if configs is None and self.chain_host:
+            configs = self.chain_host.configs()
+        for config in configs or []:
+            if not config.device:
+                self.settings.quantum = config.quantum
+            if config.device and config.device not in self.settings.sessions:
+                self.settings.sessions[config.device] = config.controls.get(
+                    ATTENUATION_CONTROL, self.settings.noise_attenuation
+                )
+                self.settings.device_channels[config.device] = config.channels
+
+    def _restore_state(self):
+        """Restore attenuation from the state cache, keep it for warm start"""
+        self.cached_state = self.config_manager.load_state()
+        if self.cached_state is None:
+            return
+        self.settings.noise_attenuation = self.cached_state.noise_attenuation
+        for device, value in self.cached_state.device_attenuation.items():
+            if device in self.settings.sessions:
+                self.settings.sessions[device] = value
+
+    def warm_start(self) -> Optional[StateSnapshot]:
+        """Last known state, with its devices listed until the first refresh"""
+        if self.cached_state and not self.device_manager.devices:
+            self.device_manager.devices = list(self.cached_state.devices)
+        return self.cached_state
+
+    def save_state(self):
+        """Cache devices, connections and attenuation for the next launch"""
+        self.config_manager.save_state(
+            StateSnapshot(
+                list(self.device_manager.get_devices()),
+                list(self.sessions.values()),
+                self.settings.noise_attenuation,
+                dict(self.settings.sessions),
+            )
         )
 
-        if result.success and result.stdout.strip():
-            self.current_loopback_id = result.stdout.strip()
+    def refresh(self) -> Tuple[list, Optional[str]]:
+        """Devices and source on the shared chain, off the UI thread
+
+        Without the device monitor, sources and modules are queried
+        concurrently, then the monitor is seeded with them.
+        """
+        if self.device_monitor.running:
+            devices = self.get_devices()
+        else:
+            import asyncio
+
+            self._invalidate_snapshot()
+            devices = asyncio.run(self.get_devices_async())
+            if devices:
+                self.device_monitor.start(devices, self._list_modules())
+        return devices, self.check_existing_connection()
+
+    def check_existing_connection(self) -> Optional[str]:
+        """Rebuild connection table, return source on the shared chain
+
+        Loopbacks left by an earlier run are adopted into the desired routing
+        once, at startup. Adopting them on every device event could bring
+        back a route that is being removed.
+        """
+        with self.reconciler.paused():
+            modules = self.reconciler.effective(self._list_modules())
+            if not self._recovered and modules:
+                self.reconciler.adopt(modules)
+                self._recovered = True
+            # Switched profile wins over the chain a loopback was found on
+            routes = self.reconciler.state.routes
+            for device_name in self.settings.active_profiles:
+                if device_name in routes:
+                    routes[device_name] = self._chain_for(device_name).input_node
+
+            sinks = {
+                config.input_node for config in self.config_manager.desired_configs()
+            }
+            self.sessions = {}
+            self.reconciler.monitor_id = None
+            for module in modules:
+                source, sink = module.args.get("source"), module.args.get("sink")
+                if module.is_loopback and source in MONITOR_SOURCES:
+                    self.reconciler.monitor_id = self.reconciler.monitor_id or module.id
+                if module.is_loopback and source and sink in sinks:
+                    if source not in self.sessions:
+                        self.sessions[source] = Session(source, sink, module.id)
+            self.save_state()
+
+            for session in self.sessions.values():
+                if not session.dedicated:
+                    return session.device_name
+            return None
+
+    def _add_dedicated_chain(self, device: AudioDevice) -> Tuple[bool, str]:
+        """Configure own filter chain for device, matching its channels"""
+        channels = self.settings.device_channels
+        previous = channels.get(device.name)
+        if device.channels:
+            channels[device.name] = matched_format(device.channels)[1]
+        if device.name in self.settings.sessions:
+            if channels.get(device.name) == previous:
+                return True, "Chain exists"
+            added = False
+        else:
+            self.settings.sessions[device.name] = self.settings.noise_attenuation
+            added = True
+
+        success, message = self.apply_settings()
+        if not success:
+            if added:
+                del self.settings.sessions[device.name]
+            if previous is None:
+                channels.pop(device.name, None)
+            else:
+                channels[device.name] = previous
+            self._revert_config()
+        return success, message
+
+    def _revert_config(self):
+        """Write config of rolled back settings
+
+        The failed apply already wrote the new one, its chains would come
+        back at the next start.
+        """
+        if self.settings.chain_loading != CHAINS_RUNTIME_ONLY:
+            self.config_manager.update_config()
+
+    def _session_to_disconnect(
+        self, device: Optional[AudioDevice]
+    ) -> Optional[Session]:
+        """Get session of device, or of the shared chain"""
+        if device:
+            return self.sessions.get(device.name)
+        for session in self.sessions.values():
+            if not session.dedicated:
+                return session
+        return None
+
+    @timed("connector.connect_microphone")
+    def connect_microphone(
+        self, device: AudioDevice, dedicated: bool = False
+    ) -> Tuple[bool, str]:
+        """Route microphone into its chain"""
+        if device.name in self.sessions:
+            return True, "Already connected"
+
+        if dedicated:
+            success, message = self._add_dedicated_chain(device)
+            if not success:
+                return False, message
+
+        result = self.reconciler.add(
+            device.name, self._chain_for(device.name).input_node
+        )
+        if device.name in self.sessions:
+            self._suspend_unused_profiles()
             return True, "Successfully connected"
-        return False, result.stderr
+        return False, result.errors.get(device.name, "Microphone or chain not found")
 
-    def disconnect_microphone(self) -> Tuple[bool, str]:
-        """Disconnect microphone"""
-        if not self.current_loopback_id:
+    @timed("connector.disconnect_microphone")
+    def disconnect_microphone(
+        self, device: Optional[AudioDevice] = None
+    ) -> Tuple[bool, str]:
+        """Disconnect microphone, by default the one on the shared chain"""
+        session = self._session_to_disconnect(device)
+        routes = self.reconciler.state.routes
+        if session:
+            device_name = session.device_name
+        elif device and device.name in routes:
+            # Vanished microphone, stop waiting for it
+            device_name = device.name
+        else:
             return True, "No active connections"
 
-        result = self.controller.unload_module(self.current_loopback_id)
-        if result.success:
-            self.current_loopback_id = None
-            return True, "Successfully disconnected"
-        return False, result.stderr
+        result = self.reconciler.remove(device_name)
+        if session and session.loopback_id in result.errors:
+            return False, result.errors[session.loopback_id]
+        return True, "Successfully disconnected"
+
+    def set_attenuation(self, value: float, device_name: Optional[str] = None):
+        """Set attenuation of device's dedicated chain or of the shared chain"""
+        if device_name in self.settings.sessions:
+            self.settings.sessions[device_name] = value
+        else:
+            self.settings.noise_attenuation = value
+        self.save_state()
+
+    def update_attenuation_live(self, chain_ids: Optional[Set[str]] = None) -> bool:
+        """Set attenuation on running filter-chain nodes without restart"""
+        configs = [
+            config
+            for config in self.config_manager.desired_configs()
+            if chain_ids is None or config.chain_id in chain_ids
+        ]
+        node_ids = self.controller.get_node_ids(
+            [config.input_node for config in configs]
+        )
+        if len(node_ids) != len(configs):
+            return False
+
+        for config in configs:
+            result = self.controller.set_node_control(
+                node_ids[config.input_node],
+                f"deep_filter:{ATTENUATION_CONTROL}",
+                config.controls[ATTENUATION_CONTROL],
+            )
+            if not result.success:
+                return False
+        return True
 
+    @timed("connector.switch_profile")
+    def switch_profile(
+        self, device_name: str, profile: Optional[str]
+    ) -> Tuple[bool, str]:
+        """Move microphone to chain of noise profile, None returns it to its own
+
+        Profile chains keep running, so a connected microphone only has its
+        loopback stream moved, without reload or PipeWire restart.
+        """
+        if profile is not None and profile not in self.settings.profiles:
+            return False, f"Unknown profile: {profile}"
+
+        previous = self.settings.active_profiles.get(device_name)
+        if profile is None:
+            self.settings.active_profiles.pop(device_name, None)
+        else:
+            self.settings.active_profiles[device_name] = profile
+        label = f"profile {profile}" if profile else "default chain"
+        sink = self._chain_for(device_name).input_node
+
+        if device_name in self.sessions:
+            graph = self._snapshot()
+            if graph and not graph.get_node(sink):
+                self._restore_profile(device_name, previous)
+                return False, f"Chain of {label} is not running, apply settings first"
+            if self.settings.suspend_unused_profiles and is_profile_node(sink):
+                self.controller.suspend_sink(sink, False)
+            moved = self.reconciler.move(device_name, sink)
+            if not moved or self.reconciler.state.monitor_sink:
+                self.reconciler.reconcile()
+            session = self.sessions.get(device_name)
+            if not session or session.sink != sink:
+                self._restore_profile(device_name, previous)
+                return False, f"Failed to switch to {label}"
+            self._suspend_unused_profiles()
+        elif device_name in self.reconciler.state.routes:
+            # Waiting for the microphone, it is routed on arrival
+            self.reconciler.state.routes[device_name] = sink
+
+        self.config_manager.save_profiles()
+        return True, f"Switched {device_name} to {label}"
+
+    def _restore_profile(self, device_name: str, profile: Optional[str]):
+        """Undo profile selection of failed switch"""
+        if profile is None:
+            self.settings.active_profiles.pop(device_name, None)
+        else:
+            self.settings.active_profiles[device_name] = profile
+        if device_name in self.reconciler.state.routes:
+            self.reconciler.state.routes[device_name] = self._chain_for(
+                device_name
+            ).input_node
+
+    def _suspend_unused_profiles(self):
+        """Suspend profile chains no microphone is routed into, if enabled"""
+        if not self.settings.suspend_unused_profiles:
+            return
+        used = {session.sink for session in self.sessions.values()}
+        for name in self.settings.profiles:
+            sink = self.config_manager.profile_config(name).input_node
+            result = self.controller.suspend_sink(sink, sink not in used)
+            if not result.success:
+                print(f"Suspend {sink} error: {result.stderr}")
+
+    def save_profile(self, name: str, attenuation: float) -> Tuple[bool, str]:
+        """Add noise profile or change its attenuation, then apply settings
+
+        A new profile starts its chain with one restart, attenuation changes
+        are applied live.
+        """
+        name = name.strip()
+        if not name or '"' in name:
+            return False, "Profile name must be non-empty and without quotes"
+
+        previous = self.settings.profiles.get(name)
+        self.settings.profiles[name] = NoiseProfile(name, attenuation)
+        success, message = self.apply_settings()
+        if not success:
+            if previous is None:
+                del self.settings.profiles[name]
+            else:
+                self.settings.profiles[name] = previous
+            self._revert_config()
+            return False, message
+        self.config_manager.save_profiles()
+        return True, message
+
+    def remove_profile(self, name: str) -> Tuple[bool, str]:
+        """Return microphones of profile to their own chain, drop its chain"""
+        if name not in self.settings.profiles:
+            return False, f"Unknown profile: {name}"
+
+        for device_name, profile in list(self.settings.active_profiles.items()):
+            if profile == name:
+                success, message = self.switch_profile(device_name, None)
+                if not success:
+                    return False, message
+        del self.settings.profiles[name]
+        self.config_manager.save_profiles()
+        return self.apply_settings()
+
+    @timed("connector.apply_settings")
     def apply_settings(self) -> Tuple[bool, str]:
-        """Apply settings with PipeWire restart"""
-        was_connected = self.current_loopback_id is not None
-        connected_source = None
-
-        if was_connected:
-            result = self.controller.list_modules()
-            for line in result.stdout.split("\n"):
-                if self.current_loopback_id in line and "module-loopback" in line:
-                    args = line.split()
-                    for arg in args:
-                        if arg.startswith("source="):
-                            connected_source = arg.split("=")[1]
-                            break
-
-            self.disconnect_microphone()
-
-        if not self.config_manager.update_config():
+        """Apply settings with the cheapest action: none, live update or restart"""
+        if self.chain_host:
+            return self.apply_settings_runtime()
+
+        diff = self.config_manager.update_config()
+        if diff is None:
             return False, "Failed to update configuration"
 
-        result = self.controller.restart_pipewire()
-        if not result.success:
-            return False, f"PipeWire restart error: {result.stderr}"
+        if diff.empty:
+            nodes = self._chain_nodes()
+            if len(self.controller.get_node_ids(nodes)) == len(nodes):
+                return True, "Settings unchanged"
+
+        if diff.controls_only and self.update_attenuation_live(diff.changed_chains):
+            return (
+                True,
+                f"Settings applied: Attenuation Limit = {self.settings.noise_attenuation} dB",
+            )
+
+        return self.apply_settings_with_restart()
+
+    @timed("connector.apply_settings_runtime")
+    def apply_settings_runtime(self) -> Tuple[bool, str]:
+        """Apply settings by loading, reloading or updating single chains
+
+        Chains PipeWire loaded from the config file are taken over when they
+        need a reload, so PipeWire is not restarted.
+        """
+        configs = self.config_manager.desired_configs()
+        if self.settings.chain_loading == CHAINS_RUNTIME_ONLY:
+            diff = None
+            self.config_manager.remove_config()
+            # Without the file, config of static chains is unknown
+            replace = {config.chain_id for config in configs}
+        else:
+            # Written for the next login only
+            diff = self.config_manager.update_config()
+            if diff is None:
+                return False, "Failed to update configuration"
+            replace = diff.structural_chains
+
+        message = f"Settings applied: Attenuation Limit = {self.settings.noise_attenuation} dB"
+        existing = self.controller.get_node_ids(self._chain_nodes())
+        todo = self.chain_host.plan(configs, set(existing), replace)
+        static_live = set(todo.static) & (diff.changed_chains if diff else set())
+        if todo.empty and not static_live:
+            return True, "Settings unchanged"
+
+        with self.reconciler.paused():
+            # Loopbacks would fall back to the default sink while their chain
+            # is reloaded
+            reloaded = {config.input_node for config in todo.load}
+            for session in list(self.sessions.values()):
+                if session.sink in reloaded:
+                    self.controller.unload_module(session.loopback_id)
 
-        if was_connected and connected_source:
-            for device in self.device_manager.get_devices():
-                if device.name == connected_source:
-                    self.connect_microphone(device)
-                    break
+            nodes = self.chain_host.apply(todo)
+            live = {config.chain_id for config in todo.live} | static_live
+            if live and not self.update_attenuation_live(live):
+                return False, "Failed to update running chains"
+            if nodes:
+                ready, waited = self.controller.wait_until_ready(nodes)
+                if not ready:
+                    return False, f"Filter chains not loaded after {waited:.1f} s"
+                message += f" (chains loaded in {waited:.2f} s)"
+
+            self._invalidate_snapshot()
+            self.reconciler.reconcile()
+            self._suspend_unused_profiles()
+        return True, message
+
+    def restore_chains(self) -> bool:
+        """Load runtime chains lost with a PipeWire restart, True if any"""
+        if not self.chain_host or not self.chain_host.prune():
+            return False
+        success, message = self.apply_settings_runtime()
+        if not success:
+            print(f"Chain restore error: {message}")
+        return success
+
+    def apply_settings_with_restart(self) -> Tuple[bool, str]:
+        """Apply settings with PipeWire restart, then restore routing"""
+        with self.reconciler.paused():
+            result = self.controller.restart_pipewire()
+            if not result.success:
+                return False, f"PipeWire restart error: {result.stderr}"
+
+            ready, waited = self.controller.wait_until_ready(self._chain_nodes())
+            if not ready:
+                return False, f"PipeWire not ready after {waited:.1f} s"
+
+            # Subscription ends together with pipewire-pulse
+            self.device_monitor.stop()
+            self.start_device_monitor()
+            self.reconciler.reconcile()
+            self._suspend_unused_profiles()
 
         return (
             True,
-            f"Settings applied: Attenuation Limit = {self.settings.noise_attenuation} dB",
+            f"Settings applied: Attenuation Limit = {self.settings.noise_attenuation} dB "
+            f"(PipeWire ready in {waited:.1f} s)",
+        )
+
+    def _find_device(self, device_name: str) -> AudioDevice:
+        """Find known device by name, or stand-in for vanished device"""
+        for device in self.device_manager.get_devices():
+            if device.name == device_name:
+                return device
+        return AudioDevice(device_name, device_name)
+
+    async def get_devices_async(self, timeout: Optional[float] = None) -> list:
+        """Get list of audio devices without blocking the event loop"""
+        if self.device_monitor.running:
+            return self.get_devices()
+
+        result = await self.async_controller.dump_graph(timeout)
+        if result.success and self.device_manager.load_graph(result.stdout):
+            return self.device_manager.get_devices()
+
+        # pw-dump is unavailable, query sources and modules concurrently
+        sources, modules = await self.async_controller.executor.gather(
+            self.async_controller.list_sources(timeout),
+            self.async_controller.list_modules(timeout),
         )
+        if not sources.success:
+            return []
+        self.device_manager.load_sources(sources.stdout)
+        if modules.success:
+            self._modules = ModuleInfo.from_short_list(modules.stdout)
+        return self.device_manager.get_devices()
+
+    @timed("connector.connect_microphone_async")
+    async def connect_microphone_async(
+        self, device: AudioDevice, timeout: Optional[float] = None
+    ) -> Tuple[bool, str]:
+        """Connect microphone to its chain without blocking
+
+        Runs through the reconciler like the blocking call, so background
+        passes see the new route and its loopback together.
+        """
+        return await self._in_executor(self.connect_microphone, timeout, device)
 
+    @timed("connector.disconnect_microphone_async")
+    async def disconnect_microphone_async(
+        self, device: Optional[AudioDevice] = None, timeout: Optional[float] = None
+    ) -> Tuple[bool, str]:
+        """Disconnect microphone without blocking"""
+        return await self._in_executor(self.disconnect_microphone, timeout, device)
+
+    @staticmethod
+    async def _in_executor(func, timeout: Optional[float], *args) -> Tuple[bool, str]:
+        """Run blocking connector call in a thread, give up waiting after timeout"""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(None, func, *args), timeout
+            )
+        except asyncio.TimeoutError:
+            return False, f"Timed out after {timeout} s"
+
+    @timed("connector.apply_settings_async")
+    async def apply_settings_async(
+        self, timeout: Optional[float] = None
+    ) -> Tuple[bool, str]:
+        """Apply settings without blocking
+
+        Runs the blocking call, so a restart keeps its routes under
+        reconciler.paused() and reconnects them like the blocking call.
+        """
+        return await self._in_executor(self.apply_settings, timeout)
+
+    @timed("connector.start_monitoring")
     def start_monitoring(self) -> Tuple[bool, str]:
         """Start real-time monitoring"""
         result = self.controller.get_default_sink()
         if not result.success or not result.stdout.strip():
             return False, "Failed to get default sink"
 
-        default_sink = result.stdout.strip()
-        result = self.controller.load_loopback(
-            "effect_output.deep_filter", default_sink, 1
-        )
+        self.reconciler.state.monitor_sink = result.stdout.strip()
+        result = self.reconciler.reconcile()
+        for route, module_id in result.active.items():
+            if route.is_monitor:
+                return True, module_id
 
-        if result.success and result.stdout.strip():
-            return True, result.stdout.strip()
-        return False, result.stderr
+        self.reconciler.state.monitor_sink = None
+        for source in (OUTPUT_NODE, PROFILE_OUTPUT_NODE):
+            if source in result.errors:
+                return False, result.errors[source]
+        return False, "Monitor could not be loaded"
 
-    def stop_monitoring(self, module_id: str) -> Tuple[bool, str]:
+    @timed("connector.measure_latency")
+    def measure_latency(
+        self,
+        device_name: Optional[str] = None,
+        probes: Optional[int] = None,
+        progress=None,
+    ) -> Tuple[Optional[LatencyMeasurement], str]:
+        """Measure delay of chain with probe signals and store the result"""
+        from core.latency_probe import PROBES, LatencyProbe
+
+        return LatencyProbe(self, probes or PROBES, progress).measure(device_name)
+
+    def tune_latency(
+        self, device: AudioDevice, settle_seconds: Optional[float] = None, progress=None
+    ) -> Tuple[bool, str]:
+        """Find and apply lowest stable latency of device"""
+        from core.latency_tuner import SETTLE_SECONDS, LatencyTuner
+
+        tuner = LatencyTuner(self, settle_seconds or SETTLE_SECONDS, progress)
+        return tuner.tune(device)
+
+    def set_latency(
+        self, device: AudioDevice, latency_ms: int, quantum: Optional[int] = None
+    ) -> Tuple[bool, str]:
+        """Save loopback latency and quantum of device and apply them"""
+        from models.latency_profile import LatencyProfile
+
+        if quantum is None:
+            quantum = self.settings.latency_for(device.name).quantum
+        self.settings.device_latency[device.name] = LatencyProfile(latency_ms, quantum)
+        if device.name not in self.settings.sessions:
+            self.settings.quantum = quantum
+        self.config_manager.save_device_latency()
+
+        if device.name in self.sessions:
+            # Loopback latency is fixed when the module is loaded
+            self.disconnect_microphone(device)
+            self.connect_microphone(device)
+        return self.apply_settings()
+
+    @timed("connector.stop_monitoring")
+    def stop_monitoring(self, module_id: Optional[str] = None) -> Tuple[bool, str]:
         """Stop monitoring"""
-        result = self.controller.unload_module(module_id)
-        if result.success:
-            return True, "Monitoring stopped"
-        return False, result.stderr
+        self.reconciler.state.monitor_sink = None
+        result = self.reconciler.reconcile()
+        if module_id in result.errors:
+            return False, result.errors[module_id]
+        return True, "Monitoring stopped"
+
+    def start_gate(
+        self,
+        on_change=None,
+        threshold_db: Optional[float] = None,
+        hold_ms: Optional[int] = None,
+        attack_ms: Optional[int] = None,
+    ) -> Tuple[bool, str]:
+        """Bypass chains of connected microphones while they are silent
+
+        Given thresholds replace the settings for gates started from now on.
+        """
+        if not self.sessions:
+            return False, "No microphone connected"
+        if threshold_db is not None:
+            self.settings.gate_threshold_db = threshold_db
+        if hold_ms is not None:
+            self.settings.gate_hold_ms = hold_ms
+        if attack_ms is not None:
+            self.settings.gate_attack_ms = attack_ms
+        if self.gates is None:
+            from core.silence_gate import SilenceGates
+
+            self.gates = SilenceGates(self, on_change)
+        return self.gates.start()
+
+    def stop_gate(self) -> Tuple[bool, str]:
+        """Resume bypassed chains and stop gating"""
+        if self.gates is None or not self.gates.running:
+            return True, "Silence gate is off"
+        return self.gates.stop()
+
+    def gate_stats(self) -> List[GateStats]:
+        """Bypass time and saved CPU per gated microphone"""
+        if self.gates is None:
+            return []
+        return self.gates.stats()
+
+    def start_auto_reconcile(self):
+        """Restore routing after restarts and hot-plug in the background"""
+        self.reconciler.start()
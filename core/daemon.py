@@ -0,0 +1,384 @@
+import inspect
+import os
+import socket
+import threading
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional
+
+from system.daemon_client import (
+    INVALID_PARAMS,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    SERVER_ERROR,
+    DaemonClient,
+    encode,
+)
+
+# Period of comparing status with the last one sent to subscribers
+WATCH_SECONDS = 0.5
+
+
+class ClientConnection:
+    """Accepted socket with a write lock, replies and notifications interleave"""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.subscribed = False
+        self._lock = threading.Lock()
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        with self._lock:
+            try:
+                self.sock.sendall(encode(message))
+                return True
+            except OSError:
+                return False
+
+    def notify(self, method: str, params: Dict[str, Any]) -> bool:
+        return self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+
+class ControlDaemon:
+    """Own the connector and serve it over JSON-RPC on a Unix socket
+
+    Status is answered from memory, calls that change routing or settings
+    run one at a time.
+    """
+
+    def __init__(self, connector, socket_path: Optional[str] = None):
+        self.connector = connector
+        self.socket_path = socket_path or connector.settings.control_socket
+        self._lock = threading.RLock()
+        self._server: Optional[socket.socket] = None
+        self._clients: List[ClientConnection] = []
+        self._clients_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._last_status: Optional[Dict[str, Any]] = None
+        # Method -> (handler, changes state)
+        self.methods: Dict[str, tuple] = {
+            "status": (self.status, False),
+            "devices": (self.devices, False),
+            "chain": (self.chain, False),
+            "dsp_targets": (self.dsp_targets, False),
+            "gate_stats": (self.gate_stats, False),
+            "connect": (self.connect, True),
+            "disconnect": (self.disconnect, True),
+            "set_attenuation": (self.set_attenuation, True),
+            "apply_settings": (self.apply_settings, True),
+            "start_monitoring": (self.start_monitoring, True),
+            "stop_monitoring": (self.stop_monitoring, True),
+            "switch_profile": (self.switch_profile, True),
+            "save_profile": (self.save_profile, True),
+            "remove_profile": (self.remove_profile, True),
+            "measure_latency": (self.measure_latency, True),
+            "tune_latency": (self.tune_latency, True),
+            "set_latency": (self.set_latency, True),
+            "start_gate": (self.start_gate, True),
+            "stop_gate": (self.stop_gate, True),
+        }
+
+    def bind(self) -> bool:
+        """Create the socket, False if another daemon serves it"""
+        if DaemonClient.probe(self.socket_path):
+            print(f"Daemon already running at {self.socket_path}")
+            return False
+        os.makedirs(os.path.dirname(self.socket_path), mode=0o700, exist_ok=True)
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        server.listen(16)
+        self._server = server
+        return True
+
+    def serve(self):
+        """Take over the graph state, then accept clients until stopped"""
+        connector = self.connector
+        connector.start_device_monitor()
+        connector.get_devices()
+        connector.check_existing_connection()
+        connector.start_auto_reconcile()
+        self._last_status = self.status()
+        threading.Thread(target=self._watch, daemon=True).start()
+
+        while not self._stopping.is_set():
+            try:
+                sock, _ = self._server.accept()
+            except OSError:
+                break
+            client = ClientConnection(sock)
+            with self._clients_lock:
+                self._clients.append(client)
+            threading.Thread(target=self._handle, args=(client,), daemon=True).start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._server:
+            self._server.close()
+            self._server = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        self.connector.stop_gate()
+        self.connector.reconciler.stop()
+        self.connector.device_monitor.stop()
+
+    def _handle(self, client: ClientConnection):
+        """Answer requests of one client, one per line"""
+        import json
+
+        reader = client.sock.makefile("rb")
+        try:
+            for line in reader:
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    client.send(self._error(None, PARSE_ERROR, f"Parse error: {e}"))
+                    continue
+                if not isinstance(request, dict):
+                    client.send(self._error(None, PARSE_ERROR, "Expected object"))
+                    continue
+                reply = self._dispatch(client, request)
+                if "id" in request:
+                    client.send(reply)
+        except OSError:
+            pass
+        finally:
+            with self._clients_lock:
+                self._clients.remove(client)
+            reader.close()
+            client.sock.close()
+
+    def _dispatch(self, client: ClientConnection, request: Dict[str, Any]) -> Dict:
+        request_id = request.get("id")
+        method = request.get("method")
+        params = request.get("params") or {}
+        if method == "subscribe":
+            client.subscribed = True
+            return self._result(request_id, self.status())
+
+        entry = self.methods.get(method)
+        if entry is None:
+            return self._error(request_id, METHOD_NOT_FOUND, f"Unknown method {method}")
+        if not isinstance(params, dict):
+            return self._error(request_id, INVALID_PARAMS, "Params must be an object")
+
+        handler, changes = entry
+        if changes:
+            params = dict(
+                params,
+                progress=lambda message: client.notify(
+                    "progress", {"message": message}
+                ),
+            )
+        try:
+            inspect.signature(handler).bind(**params)
+        except TypeError as e:
+            return self._error(request_id, INVALID_PARAMS, str(e))
+
+        try:
+            if not changes:
+                return self._result(request_id, handler(**params))
+            with self._lock:
+                result = handler(**params)
+        except Exception as e:
+            print(f"Daemon {method} error: {e}")
+            return self._error(request_id, SERVER_ERROR, str(e))
+        self._publish()
+        return self._result(request_id, result)
+
+    @staticmethod
+    def _result(request_id, result) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    @staticmethod
+    def _error(request_id, code: int, message: str) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {"code": code, "message": message},
+        }
+
+    def _publish(self):
+        """Send status to subscribers if it changed"""
+        status = self.status()
+        if status == self._last_status:
+            return
+        self._last_status = status
+        with self._clients_lock:
+            subscribers = [client for client in self._clients if client.subscribed]
+        for client in subscribers:
+            client.notify("status", status)
+
+    def _watch(self):
+        """Publish changes made by background reconcile passes and hot-plug"""
+        while not self._stopping.wait(WATCH_SECONDS):
+            try:
+                self._publish()
+            except Exception as e:
+                print(f"Daemon status error: {e}")
+
+    def _device(self, name: Optional[str]):
+        return self.connector._find_device(name) if name else None
+
+    @staticmethod
+    def _outcome(success: bool, message: str) -> Dict[str, Any]:
+        return {"success": success, "message": message}
+
+    def status(self) -> Dict[str, Any]:
+        """Connections, settings and devices, from memory
+
+        Settings are copied under the lock. While a change holds it, e.g. a
+        latency tune, the last published status is returned instead.
+        """
+        if not self._lock.acquire(blocking=self._last_status is None):
+            return self._last_status
+        try:
+            return self._status()
+        finally:
+            self._lock.release()
+
+    def _status(self) -> Dict[str, Any]:
+        connector = self.connector
+        settings = connector.settings
+        if connector.device_monitor.running:
+            devices = connector.device_monitor.get_devices()
+        else:
+            devices = connector.device_manager.get_devices()
+        return {
+            "sessions": [asdict(session) for session in connector.sessions.values()],
+            "monitor_loopback_id": connector.monitor_loopback_id,
+            "attenuation": settings.noise_attenuation,
+            "device_attenuation": dict(settings.sessions),
+            "profiles": {
+                name: profile.attenuation for name, profile in settings.profiles.items()
+            },
+            "active_profiles": dict(settings.active_profiles),
+            "devices": [asdict(device) for device in devices],
+            "bypassed": {
+                stats.device_name: stats.bypassed for stats in connector.gate_stats()
+            },
+            "chains": [
+                {
+                    "device": config.device,
+                    "profile": config.profile,
+                    "controls": config.controls,
+                }
+                for config in connector.config_manager.desired_configs()
+            ],
+        }
+
+    def devices(self) -> List[Dict[str, Any]]:
+        """Refresh and list microphones"""
+        with self._lock:
+            return [asdict(device) for device in self.connector.get_devices()]
+
+    def chain(self, device: str) -> Dict[str, Any]:
+        """Config of chain device is routed into"""
+        return asdict(self.connector._chain_for(device))
+
+    def dsp_targets(self) -> Dict[str, str]:
+        return {
+            str(node_id): label
+            for node_id, label in self.connector.dsp_targets().items()
+        }
+
+    def gate_stats(self) -> List[Dict[str, Any]]:
+        return [asdict(stats) for stats in self.connector.gate_stats()]
+
+    def start_gate(
+        self,
+        threshold_db: Optional[float] = None,
+        hold_ms: Optional[int] = None,
+        attack_ms: Optional[int] = None,
+        progress=None,
+    ):
+        return self._outcome(
+            *self.connector.start_gate(self._publish, threshold_db, hold_ms, attack_ms)
+        )
+
+    def stop_gate(self, progress=None):
+        return self._outcome(*self.connector.stop_gate())
+
+    def connect(self, device: str, dedicated: bool = False, progress=None):
+        return self._outcome(
+            *self.connector.connect_microphone(self._device(device), dedicated)
+        )
+
+    def disconnect(self, device: Optional[str] = None, progress=None):
+        return self._outcome(
+            *self.connector.disconnect_microphone(self._device(device))
+        )
+
+    def set_attenuation(
+        self, value: float, device: Optional[str] = None, progress=None
+    ):
+        self.connector.set_attenuation(float(value), device)
+
+    def apply_settings(self, progress=None):
+        return self._outcome(*self.connector.apply_settings())
+
+    def start_monitoring(self, progress=None):
+        return self._outcome(*self.connector.start_monitoring())
+
+    def stop_monitoring(self, progress=None):
+        return self._outcome(
+            *self.connector.stop_monitoring(self.connector.monitor_loopback_id)
+        )
+
+    def switch_profile(self, device: str, profile: Optional[str] = None, progress=None):
+        return self._outcome(*self.connector.switch_profile(device, profile))
+
+    def save_profile(self, name: str, attenuation: float, progress=None):
+        return self._outcome(*self.connector.save_profile(name, float(attenuation)))
+
+    def remove_profile(self, name: str, progress=None):
+        return self._outcome(*self.connector.remove_profile(name))
+
+    def measure_latency(
+        self, device: Optional[str] = None, probes: Optional[int] = None, progress=None
+    ):
+        measurement, message = self.connector.measure_latency(device, probes, progress)
+        return {
+            "measurement": asdict(measurement) if measurement else None,
+            "message": message,
+        }
+
+    def set_latency(
+        self,
+        device: str,
+        latency_ms: int,
+        quantum: Optional[int] = None,
+        progress=None,
+    ):
+        return self._outcome(
+            *self.connector.set_latency(self._device(device), int(latency_ms), quantum)
+        )
+
+    def tune_latency(self, device: str, settle: Optional[float] = None, progress=None):
+        return self._outcome(
+            *self.connector.tune_latency(self._device(device), settle, progress)
+        )
+
+
+def run_daemon(connector, socket_path: Optional[str] = None) -> int:
+    """Serve in the foreground until SIGTERM or Ctrl+C"""
+    import signal
+
+    daemon = ControlDaemon(connector, socket_path)
+    if not daemon.bind():
+        return 1
+
+    def shut_down(signum, frame):
+        daemon.stop()
+
+    signal.signal(signal.SIGTERM, shut_down)
+    signal.signal(signal.SIGINT, shut_down)
+    print(f"Serving on {daemon.socket_path}", flush=True)
+    daemon.serve()
+    return 0
@@ -2,6 +2,7 @@ import re
 from typing import List, Optional
 
 from models.audio_device import AudioDevice
+from models.audio_graph import AudioGraph
 from system.pipewire_controller import PipeWireController
 
 
@@ -11,35 +12,77 @@ class DeviceManager:
     def __init__(self):
         self.controller = PipeWireController()
         self.devices: List[AudioDevice] = []
+        self.graph: Optional[AudioGraph] = None
+
+    @staticmethod
+    def _is_input_device(name: str) -> bool:
+        """Filter out monitors and effect devices"""
+        return not name.endswith(".monitor") and "effect_" not in name
+
+    def refresh_graph(self) -> Optional[AudioGraph]:
+        """Take new snapshot of the PipeWire graph"""
+        result = self.controller.dump_graph()
+        return self.load_graph(result.stdout if result.success else "")
+
+    def load_graph(self, dump: str) -> Optional[AudioGraph]:
+        """Load graph and devices from `pw-dump` output"""
+        self.graph = None
+        if not dump:
+            return None
+
+        try:
+            self.graph = AudioGraph.from_pw_dump(dump)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Graph parse error: {e}")
+            return None
+
+        self.devices = [
+            node.to_device()
+            for node in self.graph.get_nodes("Audio/Source")
+            if self._is_input_device(node.name)
+        ]
+        return self.graph
 
     def refresh_devices(self) -> bool:
         """Refresh list of audio devices"""
+        if self.refresh_graph():
+            return True
+
+        # pw-dump is unavailable, fall back to pactl
         result = self.controller.list_sources()
         if not result.success:
             return False
+        self.load_sources(result.stdout)
+        return True
 
-        self.devices = []
-        sources = re.split(r"^Source #\d+", result.stdout, flags=re.MULTILINE)
+    def load_sources(self, output: str):
+        """Load devices from `pactl list sources` output"""
+        self.devices = self.parse_sources(output)
 
-        for source in sources:
-            if not source.strip():
-                continue
+    @classmethod
+    def parse_sources(cls, output: str) -> List[AudioDevice]:
+        """Input devices in `pactl list sources` output"""
+        devices = []
+        sources = re.split(r"^Source #(\d+)", output, flags=re.MULTILINE)
 
+        for index, source in zip(sources[1::2], sources[2::2]):
             name_match = re.search(r"Name:\s*(.+)", source)
             desc_match = re.search(r"Description:\s*(.+)", source)
+            spec_match = re.search(
+                r"Sample Specification:\s*(?:\S+\s+)?(\d+)ch\s+(\d+)Hz", source
+            )
 
             if name_match and desc_match:
                 device_name = name_match.group(1).strip()
                 description = desc_match.group(1).strip()
 
-                # Filter out monitors and effect devices
-                if (
-                    not device_name.startswith("Monitor of")
-                    and "effect_" not in device_name
-                ):
-                    self.devices.append(AudioDevice(device_name, description))
-
-        return True
+                if cls._is_input_device(device_name):
+                    device = AudioDevice(device_name, description, index)
+                    if spec_match:
+                        device.channels = int(spec_match.group(1))
+                        device.rate = int(spec_match.group(2))
+                    devices.append(device)
+        return devices
 
     def find_device_by_display(self, display: str) -> Optional[AudioDevice]:
         """Find device by display name"""
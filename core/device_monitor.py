@@ -0,0 +1,123 @@
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+from models.audio_device import AudioDevice
+from models.module_info import ModuleInfo
+from system.pipewire_controller import PipeWireController
+
+from core.device_manager import DeviceManager
+
+EVENT_PATTERN = re.compile(r"Event '(new|change|remove)' on (source|module) #(\d+)")
+
+
+class DeviceMonitor:
+    """Keep in-memory index of sources and modules from `pactl subscribe`"""
+
+    def __init__(self, controller: Optional[PipeWireController] = None):
+        self.controller = controller or PipeWireController()
+        self.sources: Dict[str, AudioDevice] = {}
+        self.modules: Dict[str, ModuleInfo] = {}
+        self._listeners: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._process = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Register callback for index changes"""
+        self._listeners.append(callback)
+
+    def start(self, sources: List[AudioDevice], modules: List[ModuleInfo]) -> bool:
+        """Seed index and start event subscription"""
+        with self._lock:
+            self.sources = {device.index: device for device in sources if device.index}
+            self.modules = {module.id: module for module in modules}
+
+        try:
+            self._process = self.controller.subscribe()
+        except Exception as e:
+            print(f"Subscribe error: {e}")
+            return False
+
+        self._thread = threading.Thread(target=self._read_events, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop event subscription"""
+        if self._process:
+            self._process.terminate()
+            self._process.wait()
+            self._process = None
+
+    def get_devices(self) -> List[AudioDevice]:
+        """Get indexed devices"""
+        with self._lock:
+            return list(self.sources.values())
+
+    def get_modules(self) -> List[ModuleInfo]:
+        """Get indexed modules"""
+        with self._lock:
+            return list(self.modules.values())
+
+    def _read_events(self):
+        """Read events and update index"""
+        process = self._process
+        for line in process.stdout:
+            match = EVENT_PATTERN.search(line)
+            if not match:
+                continue
+
+            event, facility, index = match.groups()
+            if facility == "source":
+                changed = self._handle_source_event(event, index)
+            else:
+                changed = self._handle_module_event(event, index)
+
+            if changed:
+                for callback in self._listeners:
+                    callback()
+
+    def _handle_source_event(self, event: str, index: str) -> bool:
+        """Re-query single source"""
+        if event == "remove":
+            with self._lock:
+                return self.sources.pop(index, None) is not None
+
+        # Event indexes are pulse indexes, the object.serial of the node
+        result = self.controller.get_source(index)
+        if not result.success:
+            return False
+        for device in DeviceManager.parse_sources(result.stdout):
+            if device.index == index:
+                break
+        else:
+            return False
+
+        with self._lock:
+            known = self.sources.get(index)
+            if known == device and known.sample_spec == device.sample_spec:
+                return False
+            self.sources[index] = device
+        return True
+
+    def _handle_module_event(self, event: str, index: str) -> bool:
+        """Re-query single module"""
+        if event == "remove":
+            with self._lock:
+                return self.modules.pop(index, None) is not None
+
+        result = self.controller.get_module(index)
+        if not result.success:
+            return False
+
+        for line in result.stdout.split("\n"):
+            if line.startswith(f"{index}\t"):
+                with self._lock:
+                    self.modules[index] = ModuleInfo.from_short_line(line)
+                return True
+        return False
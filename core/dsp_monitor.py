@@ -0,0 +1,166 @@
+import threading
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional
+
+from models.node_stats import NodeStats
+
+SAMPLE_INTERVAL = 2.0
+HISTORY_SIZE = 60
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+class RingBuffer:
+    """Fixed number of latest values in a preallocated array"""
+
+    def __init__(self, capacity: int = HISTORY_SIZE):
+        self._data = array("d", [0.0]) * capacity
+        self._start = 0
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float):
+        """Add value, overwriting the oldest when full"""
+        end = (self._start + self._count) % self.capacity
+        self._data[end] = value
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def __iter__(self) -> Iterator[float]:
+        """Values from oldest to newest"""
+        for i in range(self._count):
+            yield self._data[(self._start + i) % self.capacity]
+
+    def last(self) -> float:
+        if not self._count:
+            return 0.0
+        return self._data[(self._start + self._count - 1) % self.capacity]
+
+
+def sparkline(values: List[float], ceiling: float = 100.0) -> str:
+    """Block characters for values between 0 and ceiling"""
+    top = len(SPARK_CHARS) - 1
+    return "".join(
+        SPARK_CHARS[min(top, max(0, round(value / ceiling * top)))] for value in values
+    )
+
+
+class DspSeries:
+    """Load history and xruns of one node"""
+
+    def __init__(self, label: str, capacity: int = HISTORY_SIZE):
+        self.label = label
+        self.load = RingBuffer(capacity)
+        self.latest: Optional[NodeStats] = None
+        # Errors counted since monitoring started
+        self.xruns = 0
+        self.alerting = False
+
+    def add(self, stats: NodeStats):
+        if self.latest is not None and stats.errors > self.latest.errors:
+            self.xruns += stats.errors - self.latest.errors
+        self.latest = stats
+        self.load.append(stats.load_percent)
+
+    @property
+    def peak(self) -> float:
+        return max(self.load, default=0.0)
+
+    def summary(self) -> str:
+        """One line with load, cycle and xruns"""
+        stats = self.latest
+        if stats is None:
+            return f"{self.label}: no data"
+        cycle = f"{stats.quantum}/{stats.rate}" if stats.quantum else "?"
+        return (
+            f"{self.label}: {stats.load_percent:.1f}% "
+            f"(peak {self.peak:.1f}%), quantum {cycle}, xruns {self.xruns}"
+        )
+
+
+class DspMonitor:
+    """Sample DSP load and xruns of the DeepFilter nodes from pw-top
+
+    targets returns node id -> label of the nodes to follow, so chains and
+    loopbacks that come and go are picked up on the next sample.
+    """
+
+    def __init__(
+        self,
+        controller,
+        targets: Callable[[], Dict[int, str]],
+        alert_percent: float,
+        on_sample: Optional[Callable[[Dict[str, DspSeries]], None]] = None,
+        on_alert: Optional[Callable[[DspSeries], None]] = None,
+        interval: float = SAMPLE_INTERVAL,
+        capacity: int = HISTORY_SIZE,
+    ):
+        self.controller = controller
+        self.targets = targets
+        self.alert_percent = alert_percent
+        self.on_sample = on_sample
+        self.on_alert = on_alert
+        self.interval = interval
+        self.capacity = capacity
+        self.series: Dict[str, DspSeries] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def sample(self) -> bool:
+        """Take one sample of all targets, False if pw-top failed"""
+        result = self.controller.top()
+        if not result.success:
+            print(f"DSP monitor error: {result.stderr.strip() or 'pw-top failed'}")
+            return False
+        stats = NodeStats.from_pw_top(result.stdout)
+
+        for node_id, label in self.targets().items():
+            node = stats.get(node_id)
+            if node is None:
+                continue
+            series = self.series.get(label)
+            if series is None:
+                series = self.series[label] = DspSeries(label, self.capacity)
+            series.add(node)
+            self._check_alert(series)
+
+        if self.on_sample:
+            self.on_sample(self.series)
+        return True
+
+    def _check_alert(self, series: DspSeries):
+        """Alert once when load passes the threshold, again after it drops"""
+        over = series.load.last() >= self.alert_percent
+        if over and not series.alerting and self.on_alert:
+            self.on_alert(series)
+        series.alerting = over
+
+    def start(self):
+        """Sample in background until stopped"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"DSP monitor error: {e}")
+            self._stop.wait(self.interval)
@@ -0,0 +1,261 @@
+import subprocess
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from models.latency_measurement import LatencyMeasurement
+
+from core.config_manager import ATTENUATION_CONTROL
+
+RATE = 48000
+PROBES = 20
+CHIRP_SECONDS = 0.05
+CHIRP_LOW_HZ = 200.0
+CHIRP_HIGH_HZ = 8000.0
+CHIRP_AMPLITUDE = 0.3
+PROBE_INTERVAL = 0.3
+LEAD_SECONDS = 0.5
+# Longest delay searched for, must stay below the probe interval
+MAX_DELAY_SECONDS = 0.25
+# Allowed negative delay from capture clock error
+EARLY_SECONDS = 0.01
+# Correlation peak over RMS of its search window
+DETECTION_RATIO = 8.0
+READ_SIZE = 65536
+
+
+def chirp(rate: int = RATE) -> np.ndarray:
+    """Logarithmic sine sweep with faded edges"""
+    n = int(rate * CHIRP_SECONDS)
+    t = np.arange(n) / rate
+    # Instantaneous frequency rises exponentially from low to high
+    rate_of_rise = np.log(CHIRP_HIGH_HZ / CHIRP_LOW_HZ) / CHIRP_SECONDS
+    phase = 2 * np.pi * CHIRP_LOW_HZ / rate_of_rise * np.expm1(rate_of_rise * t)
+    fade = int(0.005 * rate)
+    envelope = np.ones(n)
+    envelope[:fade] = np.hanning(2 * fade)[:fade]
+    envelope[-fade:] = np.hanning(2 * fade)[fade:]
+    return (CHIRP_AMPLITUDE * envelope * np.sin(phase)).astype(np.float32)
+
+
+def probe_train(probe: np.ndarray, count: int, interval: int, lead: int) -> np.ndarray:
+    """Probe repeated every interval frames after lead frames of silence"""
+    train = np.zeros(lead + count * interval, dtype=np.float32)
+    for k in range(count):
+        start = lead + k * interval
+        train[start : start + len(probe)] = probe
+    return train
+
+
+def matched_filter(signal: np.ndarray, probe: np.ndarray) -> np.ndarray:
+    """Cross-correlation of signal with probe starting at each frame, via FFT"""
+    size = 1 << int(len(signal) + len(probe) - 1).bit_length()
+    spectrum = np.fft.rfft(signal, size) * np.conj(np.fft.rfft(probe, size))
+    return np.fft.irfft(spectrum, size)[: len(signal)]
+
+
+def refine_peak(correlation: np.ndarray, index: int) -> float:
+    """Sub-frame peak position by parabolic interpolation"""
+    if index <= 0 or index >= len(correlation) - 1:
+        return float(index)
+    left, center, right = correlation[index - 1 : index + 2]
+    denominator = left - 2 * center + right
+    if denominator == 0:
+        return float(index)
+    return index + 0.5 * (left - right) / denominator
+
+
+def _find_peak(
+    correlation: np.ndarray, start: int, end: int
+) -> Optional[Tuple[float, float]]:
+    """Strongest peak in window with its detection ratio"""
+    start, end = max(start, 0), min(end, len(correlation))
+    if end - start < 3:
+        return None
+    window = np.abs(correlation[start:end])
+    index = int(np.argmax(window))
+    rms = float(np.sqrt(np.mean(window * window)))
+    ratio = float(window[index]) / rms if rms > 0 else 0.0
+    return refine_peak(correlation, start + index), ratio
+
+
+def estimate_delays(
+    reference: np.ndarray,
+    output: np.ndarray,
+    probe: np.ndarray,
+    offset: float,
+    count: int,
+    interval: int,
+    rate: int = RATE,
+) -> List[float]:
+    """Delay in ms of every probe found in both captures
+
+    offset is the output frame captured at the same time as reference frame 0.
+    """
+    ref_corr = matched_filter(reference, probe)
+    out_corr = matched_filter(output, probe)
+
+    # Earliest strong peak anchors the expected positions of all probes
+    magnitude = np.abs(ref_corr)
+    if not magnitude.any():
+        return []
+    first = int(np.argmax(magnitude > 0.5 * magnitude.max()))
+    anchor = first + int(np.argmax(magnitude[first : first + len(probe)]))
+
+    delays = []
+    for k in range(count):
+        expected = int(anchor) + k * interval
+        ref_peak = _find_peak(
+            ref_corr, expected - interval // 4, expected + interval // 4
+        )
+        if not ref_peak or ref_peak[1] < DETECTION_RATIO:
+            continue
+        sent = ref_peak[0] + offset
+        out_peak = _find_peak(
+            out_corr,
+            int(sent - EARLY_SECONDS * rate),
+            int(sent + MAX_DELAY_SECONDS * rate),
+        )
+        if not out_peak or out_peak[1] < DETECTION_RATIO:
+            continue
+        delays.append((out_peak[0] - sent) / rate * 1000)
+    return delays
+
+
+class _Capture:
+    """Collect raw f32 capture and estimate the time of its first frame"""
+
+    def __init__(self, process, rate: int):
+        self.process = process
+        self.rate = rate
+        self.data = bytearray()
+        # Earliest arrival time minus duration of audio received so far
+        self.origin: Optional[float] = None
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def _read(self):
+        stdout = self.process.stdout
+        while True:
+            chunk = stdout.read(READ_SIZE)
+            if not chunk:
+                return
+            now = time.monotonic()
+            self.data += chunk
+            origin = now - len(self.data) // 4 / self.rate
+            if self.origin is None or origin < self.origin:
+                self.origin = origin
+
+    @property
+    def started(self) -> bool:
+        return self.origin is not None
+
+    def stop(self) -> np.ndarray:
+        self.process.terminate()
+        self._thread.join(timeout=1.0)
+        usable = len(self.data) // 4 * 4
+        return np.frombuffer(bytes(self.data[:usable]), dtype=np.float32)
+
+
+class LatencyProbe:
+    """Measure delay of filter chain by playing chirps through it"""
+
+    def __init__(
+        self,
+        connector,
+        probes: int = PROBES,
+        progress: Optional[Callable[[str], None]] = None,
+    ):
+        self.connector = connector
+        self.controller = connector.controller
+        self.settings = connector.settings
+        self.probes = probes
+        self.progress = progress or (lambda message: None)
+
+    def _device_on_chain(self, chain) -> str:
+        """Microphone routed into chain"""
+        if chain.device:
+            return chain.device
+        for name, session in self.connector.sessions.items():
+            if session.sink == chain.input_node:
+                return name
+        return ""
+
+    def measure(
+        self, device_name: Optional[str] = None
+    ) -> Tuple[Optional[LatencyMeasurement], str]:
+        """Play probe train into chain input, capture input and output together"""
+        if device_name:
+            chain = self.connector._chain_for(device_name)
+        else:
+            chain = self.connector.config_manager.desired_config()
+        if not self.controller.get_node_id(chain.input_node):
+            return None, f"{chain.input_node} is not running, apply settings first"
+
+        probe = chirp(RATE)
+        interval = int(PROBE_INTERVAL * RATE)
+        train = probe_train(probe, self.probes, interval, int(LEAD_SECONDS * RATE))
+
+        self.progress("Starting capture...")
+        captures = []
+        try:
+            # Probes as they enter the chain are the reference for the output
+            captures.append(
+                _Capture(
+                    self.controller.record(chain.input_node, RATE, monitor=True), RATE
+                )
+            )
+            captures.append(
+                _Capture(self.controller.record(chain.source_node, RATE), RATE)
+            )
+            deadline = time.monotonic() + 2.0
+            while not all(c.started for c in captures):
+                if time.monotonic() > deadline:
+                    raise OSError("Capture did not start")
+                time.sleep(0.01)
+
+            self.progress(f"Playing {self.probes} probes...")
+            player = self.controller.play(chain.input_node, RATE)
+            try:
+                player.stdin.write(train.tobytes())
+                player.stdin.close()
+                player.wait(timeout=len(train) / RATE + 5.0)
+            finally:
+                if player.poll() is None:
+                    player.kill()
+            time.sleep(MAX_DELAY_SECONDS + 0.2)
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            for capture in captures:
+                capture.stop()
+            return None, f"Probe playback failed: {e}"
+
+        reference, output = (capture.stop() for capture in captures)
+        self.progress("Analyzing...")
+        offset = (captures[0].origin - captures[1].origin) * RATE
+        delays = estimate_delays(
+            reference, output, probe, offset, self.probes, interval, RATE
+        )
+
+        device = self._device_on_chain(chain)
+        measurement = LatencyMeasurement(
+            timestamp=time.time(),
+            chain=chain.input_node,
+            device=device,
+            loopback_latency_ms=(
+                self.settings.latency_for(device).latency_ms
+                if device in self.connector.sessions
+                else None
+            ),
+            quantum=chain.quantum,
+            attenuation=chain.controls.get(
+                ATTENUATION_CONTROL, self.settings.noise_attenuation
+            ),
+            probes=self.probes,
+            delays_ms=[round(float(delay), 3) for delay in delays],
+        )
+        if not delays:
+            return None, "No probe came through the chain"
+        self.connector.config_manager.save_latency_measurement(measurement)
+        return measurement, measurement.summary()
@@ -0,0 +1,152 @@
+import time
+from typing import Callable, List, Optional, Tuple
+
+from models.audio_device import AudioDevice
+from models.latency_profile import LatencyProfile
+
+# Candidates from safe to aggressive
+LATENCY_STEPS_MS = [40, 30, 20, 15, 10, 8, 6, 4, 2]
+QUANTUM_STEPS = [1024, 512, 256, 128, 64, 32]
+SETTLE_SECONDS = 3.0
+
+
+class LatencyTuner:
+    """Find lowest loopback latency and quantum that run without xruns"""
+
+    def __init__(
+        self,
+        connector,
+        settle_seconds: float = SETTLE_SECONDS,
+        progress: Optional[Callable[[str], None]] = None,
+    ):
+        self.connector = connector
+        self.controller = connector.controller
+        self.settings = connector.settings
+        self.settle_seconds = settle_seconds
+        self.progress = progress or (lambda message: None)
+
+    def _watched_nodes(self, device: AudioDevice) -> List[str]:
+        """Nodes whose error counters tell whether the device path is stable"""
+        names = [device.name]
+        chain = self.connector._chain_for(device.name)
+        names += [chain.input_node, chain.output_node]
+
+        session = self.connector.sessions.get(device.name)
+        graph = self.connector._snapshot()
+        if session and graph:
+            names += [
+                node.name
+                for node in graph.nodes.values()
+                if node.module_id == session.loopback_id
+            ]
+        return names
+
+    def _is_stable(self, device: AudioDevice) -> bool:
+        """Watch error counters of device path for settle period"""
+        names = self._watched_nodes(device)
+        before = self.controller.get_node_errors()
+        time.sleep(self.settle_seconds)
+        after = self.controller.get_node_errors()
+        if before is None or after is None:
+            return False
+        return all(after.get(name, 0) <= before.get(name, 0) for name in names)
+
+    def _reconnect(self, device: AudioDevice, latency_ms: int) -> bool:
+        """Reload device loopback with new latency"""
+        profile = self.settings.latency_for(device.name)
+        self.settings.device_latency[device.name] = LatencyProfile(
+            latency_ms, profile.quantum
+        )
+        self.connector.disconnect_microphone(device)
+        success, _ = self.connector.connect_microphone(device)
+        return success
+
+    def _lower_quantum(self, device: AudioDevice) -> int:
+        """Step forced quantum down until xruns appear, 0 if none is stable"""
+        stable_quantum = 0
+        for quantum in QUANTUM_STEPS:
+            self.progress(f"Testing quantum {quantum}...")
+            if not self.controller.set_force_quantum(quantum).success:
+                break
+            if not self._is_stable(device):
+                break
+            stable_quantum = quantum
+        return stable_quantum
+
+    def _lower_latency(self, device: AudioDevice) -> Optional[int]:
+        """Step loopback latency down until xruns appear"""
+        stable_latency = None
+        for latency_ms in LATENCY_STEPS_MS:
+            self.progress(f"Testing loopback latency {latency_ms} ms...")
+            if not self._reconnect(device, latency_ms):
+                break
+            if not self._is_stable(device):
+                break
+            stable_latency = latency_ms
+        return stable_latency
+
+    def tune(self, device: AudioDevice) -> Tuple[bool, str]:
+        """Tune device and save its latency profile
+
+        A microphone connected only for tuning is disconnected again, and
+        the forced quantum is always released.
+        """
+        if self.controller.get_node_errors() is None:
+            return False, "pw-top is not available"
+
+        connected_here = device.name not in self.connector.sessions
+        if connected_here:
+            success, message = self.connector.connect_microphone(device)
+            if not success:
+                return False, message
+
+        original = self.settings.device_latency.get(device.name)
+        tuned = False
+        try:
+            quantum = self._lower_quantum(device)
+            self._release_quantum()
+            latency_ms = self._lower_latency(device)
+            if latency_ms is None:
+                return (
+                    False,
+                    f"Unstable even at {LATENCY_STEPS_MS[0]} ms loopback latency",
+                )
+
+            self.settings.device_latency[device.name] = LatencyProfile(
+                latency_ms, quantum
+            )
+            if device.name not in self.settings.sessions:
+                # Shared chain serves one microphone, take its quantum
+                self.settings.quantum = quantum
+            self.connector.config_manager.save_device_latency()
+            tuned = True
+
+            self.progress("Applying tuned latency...")
+            if not connected_here:
+                self._reconnect(device, latency_ms)
+            success, message = self.connector.apply_settings()
+            if not success:
+                return False, message
+            return (
+                True,
+                f"Tuned: loopback {latency_ms} ms, quantum {quantum or 'default'}",
+            )
+        finally:
+            self._release_quantum()
+            if not tuned:
+                if original:
+                    self.settings.device_latency[device.name] = original
+                else:
+                    self.settings.device_latency.pop(device.name, None)
+            if connected_here:
+                self.connector.disconnect_microphone(device)
+            elif not tuned:
+                # Reload loopback with the restored latency
+                self.connector.disconnect_microphone(device)
+                self.connector.connect_microphone(device)
+
+    def _release_quantum(self):
+        """Let the graph pick its quantum again"""
+        result = self.controller.set_force_quantum(0)
+        if not result.success:
+            print(f"Latency tune error: clock.force-quantum not reset: {result.stderr}")
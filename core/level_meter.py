@@ -0,0 +1,158 @@
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from system.pipewire_controller import PipeWireController
+
+RATE = 48000
+BLOCK_SIZE = 1024
+RING_SIZE = 8192
+FFT_SIZE = 2048
+SPECTRUM_BANDS = 32
+FRAME_RATE = 20
+FLOOR_DB = -90.0
+
+
+@dataclass
+class LevelReading:
+    """Levels of one UI frame"""
+
+    rms_db: float
+    peak_db: float
+    # Band magnitudes in dB, None unless spectrum is enabled
+    spectrum: Optional[List[float]] = None
+
+
+def to_db(value: float) -> float:
+    return 20 * math.log10(value) if value > 0 else FLOOR_DB
+
+
+class LevelMeter:
+    """RMS/peak meter over raw f32 capture of one node"""
+
+    def __init__(
+        self,
+        target: str,
+        callback: Callable[[LevelReading], None],
+        controller: Optional[PipeWireController] = None,
+        spectrum: bool = False,
+        frame_rate: float = FRAME_RATE,
+    ):
+        self.target = target
+        self.callback = callback
+        self.controller = controller or PipeWireController()
+        self.spectrum = spectrum
+        self.frame_interval = 1.0 / frame_rate
+        self._process = None
+        self._thread: Optional[threading.Thread] = None
+
+        # Buffers are allocated once and reused for every block
+        self._raw = bytearray(BLOCK_SIZE * 4)
+        self._block = np.frombuffer(self._raw, dtype=np.float32)
+        self._ring = np.zeros(RING_SIZE, dtype=np.float32)
+        self._ring_pos = 0
+        self._window = np.hanning(FFT_SIZE).astype(np.float32)
+        self._fft_input = np.empty(FFT_SIZE, dtype=np.float32)
+        self._magnitude = np.empty(FFT_SIZE // 2 + 1, dtype=np.float32)
+        # Log-spaced band edges over FFT bins
+        self._band_edges = np.unique(
+            np.geomspace(1, FFT_SIZE // 2 + 1, SPECTRUM_BANDS + 1).astype(int)
+        )
+
+        self._sum_squares = 0.0
+        self._samples = 0
+        self._peak = 0.0
+        self._next_frame = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        """Start capture and reader thread"""
+        try:
+            self._process = self.controller.record(self.target, RATE)
+        except OSError as e:
+            print(f"Level meter error: {e}")
+            return False
+
+        self._thread = threading.Thread(target=self._read_blocks, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop capture"""
+        if self._process:
+            self._process.terminate()
+            self._process = None
+
+    def _read_blocks(self):
+        """Read fixed-size blocks into reused buffer"""
+        process = self._process
+        view = memoryview(self._raw)
+        while True:
+            filled = 0
+            while filled < len(view):
+                count = process.stdout.readinto(view[filled:])
+                if not count:
+                    return
+                filled += count
+            self.process_block(self._block)
+
+    def process_block(self, block: np.ndarray):
+        """Accumulate levels of block and emit reading once per frame"""
+        end = self._ring_pos + len(block)
+        if end <= RING_SIZE:
+            self._ring[self._ring_pos : end] = block
+        else:
+            split = RING_SIZE - self._ring_pos
+            self._ring[self._ring_pos :] = block[:split]
+            self._ring[: end - RING_SIZE] = block[split:]
+        self._ring_pos = end % RING_SIZE
+
+        # dot and max/min reduce without temporary arrays
+        self._sum_squares += float(np.dot(block, block))
+        self._samples += len(block)
+        self._peak = max(self._peak, float(block.max()), -float(block.min()))
+
+        now = time.monotonic()
+        if now < self._next_frame:
+            return
+        self._next_frame = now + self.frame_interval
+
+        reading = LevelReading(
+            to_db(math.sqrt(self._sum_squares / self._samples)),
+            to_db(self._peak),
+            self._compute_spectrum() if self.spectrum else None,
+        )
+        self._sum_squares = 0.0
+        self._samples = 0
+        self._peak = 0.0
+        self.callback(reading)
+
+    def _compute_spectrum(self) -> List[float]:
+        """Band magnitudes of latest FFT_SIZE samples in ring"""
+        start = (self._ring_pos - FFT_SIZE) % RING_SIZE
+        if start + FFT_SIZE <= RING_SIZE:
+            np.multiply(
+                self._ring[start : start + FFT_SIZE], self._window, out=self._fft_input
+            )
+        else:
+            split = RING_SIZE - start
+            np.multiply(
+                self._ring[start:], self._window[:split], out=self._fft_input[:split]
+            )
+            np.multiply(
+                self._ring[: FFT_SIZE - split],
+                self._window[split:],
+                out=self._fft_input[split:],
+            )
+
+        np.abs(np.fft.rfft(self._fft_input), out=self._magnitude)
+        bands = np.maximum.reduceat(self._magnitude, self._band_edges[:-1])
+        scale = 2.0 / self._window.sum()
+        return [to_db(float(value) * scale) for value in bands]
@@ -0,0 +1,191 @@
+import os
+import resource
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from system.ladspa_host import DataPointer, LadspaPlugin
+
+from core.audio_file import open_reader
+from core.config_manager import ATTENUATION_CONTROL, ConfigManager
+
+SYNTHETIC_SIGNALS = ("speech_like", "white_noise", "silence")
+WARMUP_BLOCKS = 10
+
+
+def synthetic_signal(name: str, rate: int, seconds: float, seed: int = 0) -> np.ndarray:
+    """Generate mono float32 test signal"""
+    rng = np.random.default_rng(seed)
+    n = int(rate * seconds)
+    if name == "silence":
+        return np.zeros(n, dtype=np.float32)
+    if name == "white_noise":
+        return (0.1 * rng.standard_normal(n)).astype(np.float32)
+    if name == "speech_like":
+        # Harmonic tone with syllable-rate envelope over background noise
+        t = np.arange(n) / rate
+        pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+        phase = 2 * np.pi * np.cumsum(pitch) / rate
+        voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+        noise = 0.03 * rng.standard_normal(n)
+        return (0.2 * voice * envelope + noise).astype(np.float32)
+    raise ValueError(
+        f"Unknown signal {name}, expected a file or {', '.join(SYNTHETIC_SIGNALS)}"
+    )
+
+
+def load_signal(path: str) -> Tuple[np.ndarray, int]:
+    """Read recorded file as mono float32 with its sample rate"""
+    reader = open_reader(path)
+    try:
+        frames = np.zeros((reader.frames, reader.channels), dtype=np.float32)
+        reader.read_into(frames)
+        return frames.mean(axis=1, dtype=np.float32), reader.rate
+    finally:
+        reader.close()
+
+
+def profile_run(
+    plugin_path: str,
+    label: str,
+    controls: Dict[str, float],
+    rate: int,
+    block_size: int,
+    signal: str,
+    seconds: float,
+) -> Dict[str, Any]:
+    """Time plugin run() per block for one configuration"""
+    if os.path.isfile(signal):
+        samples, rate = load_signal(signal)
+    else:
+        samples = synthetic_signal(signal, rate, seconds)
+
+    plugin = LadspaPlugin(plugin_path, label)
+    n_blocks = len(samples) // block_size
+    inputs = np.zeros((len(plugin.audio_inputs), block_size), dtype=np.float32)
+    outputs = np.zeros((len(plugin.audio_outputs), block_size), dtype=np.float32)
+    block_ns = np.zeros(n_blocks, dtype=np.int64)
+
+    with plugin.instantiate(rate, controls) as instance:
+        for port, buffer in zip(plugin.audio_inputs, inputs):
+            instance.connect(port, buffer.ctypes.data_as(DataPointer))
+        for port, buffer in zip(plugin.audio_outputs, outputs):
+            instance.connect(port, buffer.ctypes.data_as(DataPointer))
+
+        for i in range(min(WARMUP_BLOCKS, n_blocks)):
+            inputs[:] = samples[i * block_size : (i + 1) * block_size]
+            instance.run(block_size)
+
+        clock = time.perf_counter_ns
+        for i in range(n_blocks):
+            # Same signal on every input channel
+            inputs[:] = samples[i * block_size : (i + 1) * block_size]
+            start = clock()
+            instance.run(block_size)
+            block_ns[i] = clock() - start
+
+    audio_seconds = n_blocks * block_size / rate
+    block_us = block_ns / 1000
+    return {
+        "plugin": plugin_path,
+        "label": label,
+        "controls": controls,
+        "rate": rate,
+        "block_size": block_size,
+        "signal": signal,
+        "audio_seconds": round(audio_seconds, 3),
+        "realtime_factor": (
+            round(block_ns.sum() / 1e9 / audio_seconds, 5) if audio_seconds else None
+        ),
+        "block_budget_us": round(block_size / rate * 1e6, 1),
+        "block_us": (
+            {
+                "p50": round(float(np.percentile(block_us, 50)), 1),
+                "p95": round(float(np.percentile(block_us, 95)), 1),
+                "p99": round(float(np.percentile(block_us, 99)), 1),
+                "max": round(float(block_us.max()), 1),
+            }
+            if n_blocks
+            else None
+        ),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+class PluginProfiler:
+    """Sweep block sizes, rates and attenuation over the configured plugin"""
+
+    def __init__(self, config_manager: ConfigManager, isolate: bool = True):
+        self.config_manager = config_manager
+        # Fresh process per run, so peak RSS belongs to that run
+        self.isolate = isolate
+
+    def sweep(
+        self,
+        block_sizes: List[int],
+        rates: List[int],
+        attenuations: List[float],
+        signals: List[str],
+        seconds: float = 10.0,
+        on_result=None,
+    ) -> List[Dict[str, Any]]:
+        config = self.config_manager.desired_config()
+        runs = []
+        for signal in signals:
+            # Recorded signals keep their own rate
+            signal_rates = [None] if os.path.isfile(signal) else rates
+            for rate in signal_rates:
+                for block_size in block_sizes:
+                    for attenuation in attenuations:
+                        controls = dict(config.controls)
+                        controls[ATTENUATION_CONTROL] = float(attenuation)
+                        runs.append(
+                            (
+                                config.plugin,
+                                config.label,
+                                controls,
+                                rate or config.rate,
+                                block_size,
+                                signal,
+                                seconds,
+                            )
+                        )
+
+        results = []
+        pool = self._pool()
+        try:
+            for args in runs:
+                try:
+                    result = (
+                        pool.apply(profile_run, args) if pool else profile_run(*args)
+                    )
+                except Exception as e:
+                    result = {"args": list(args), "error": str(e)}
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+        return results
+
+    def _pool(self):
+        if not self.isolate:
+            return None
+        import multiprocessing
+
+        return multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1)
+
+
+def config_key(result: Dict[str, Any]) -> Optional[str]:
+    """Short label of run, e.g. `48000Hz/1024/att=100.0/speech_like`"""
+    if "error" in result:
+        return None
+    attenuation = result["controls"].get(ATTENUATION_CONTROL)
+    return (
+        f"{result['rate']}Hz/{result['block_size']}/att={attenuation}/"
+        f"{os.path.basename(result['signal'])}"
+    )
@@ -0,0 +1,375 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set
+
+from models.filter_chain_config import (
+    OUTPUT_NODE,
+    PROFILE_OUTPUT_NODE,
+    is_profile_node,
+)
+from models.module_info import ModuleInfo
+from models.routing_state import MONITOR_SOURCES, Route, RoutingState, is_managed
+from models.session import Session
+from system.metrics import metrics, timed
+
+# Delay after a graph event, so bursts of events cost one pass
+DEBOUNCE_SECONDS = 0.2
+# Upper bound of convergence when events are missed, e.g. during restarts
+RESYNC_SECONDS = 5.0
+
+
+@dataclass
+class ReconcilePlan:
+    """Operations that turn observed loopbacks into desired ones"""
+
+    # Desired route -> id of loopback that already implements it
+    keep: Dict[Route, str] = field(default_factory=dict)
+    # Module id -> why it is unloaded
+    unload: Dict[str, str] = field(default_factory=dict)
+    load: List[Route] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not self.unload and not self.load
+
+
+@dataclass
+class ReconcileResult:
+    """Outcome of one reconcile pass"""
+
+    # Route -> loopback id, after the pass
+    active: Dict[Route, str] = field(default_factory=dict)
+    loaded: List[Route] = field(default_factory=list)
+    unloaded: List[str] = field(default_factory=list)
+    # Routes waiting for their source or sink to appear
+    pending: List[Route] = field(default_factory=list)
+    # Source of failed load, or module id of failed unload -> error
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.loaded or self.unloaded)
+
+
+def plan(desired: List[Route], modules: List[ModuleInfo]) -> ReconcilePlan:
+    """Minimal loads and unloads to reach desired routes"""
+    wanted = {route.source: route for route in desired}
+    result = ReconcilePlan()
+    for module in sorted(modules, key=lambda m: int(m.id) if m.id.isdigit() else 0):
+        if not module.is_loopback:
+            continue
+        source, sink = module.args.get("source", ""), module.args.get("sink", "")
+        if not is_managed(source, sink):
+            continue
+
+        route = wanted.get(source)
+        latency = module.args.get("latency_msec")
+        if route is None or route.sink != sink:
+            result.unload[module.id] = "not desired"
+        elif latency is not None and latency != str(route.latency_ms):
+            result.unload[module.id] = "latency changed"
+        elif route in result.keep:
+            result.unload[module.id] = "duplicate"
+        else:
+            result.keep[route] = module.id
+
+    result.load = [route for route in desired if route not in result.keep]
+    return result
+
+
+class Reconciler:
+    """Converge loaded loopbacks to the desired routing"""
+
+    def __init__(
+        self,
+        connector,
+        debounce: float = DEBOUNCE_SECONDS,
+        resync: float = RESYNC_SECONDS,
+    ):
+        self.connector = connector
+        self.controller = connector.controller
+        self.settings = connector.settings
+        self.state = RoutingState()
+        self.debounce = debounce
+        self.resync = resync
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._triggered_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        # Loopback id -> sink its stream was moved to, used without pw-dump
+        self.moved: Dict[str, str] = {}
+        # Loopback id -> chain of a stream diverted away from it for a while
+        self.diverted: Dict[str, str] = {}
+        # Loopback of the monitor route, None when monitoring is off
+        self.monitor_id: Optional[str] = None
+
+    def desired_routes(self) -> List[Route]:
+        """Routes of desired state with current latency settings"""
+        routes = [
+            Route(source, sink, self.settings.latency_for(source).latency_ms)
+            for source, sink in sorted(self.state.routes.items())
+        ]
+        if self.state.monitor_sink:
+            # Monitor follows the microphone into the profile source
+            profiled = any(is_profile_node(s) for s in self.state.routes.values())
+            routes.append(
+                Route(
+                    PROFILE_OUTPUT_NODE if profiled else OUTPUT_NODE,
+                    self.state.monitor_sink,
+                    self.settings.monitor_latency_ms,
+                )
+            )
+        return routes
+
+    def adopt(self, modules: List[ModuleInfo]):
+        """Take loopbacks found in the graph into desired state"""
+        with self._lock:
+            for module in modules:
+                source = module.args.get("source", "")
+                sink = module.args.get("sink", "")
+                if not module.is_loopback or not is_managed(source, sink):
+                    continue
+                if source in MONITOR_SOURCES:
+                    self.state.monitor_sink = self.state.monitor_sink or sink
+                else:
+                    self.state.routes.setdefault(source, sink)
+
+    def add(self, source: str, sink: str) -> ReconcileResult:
+        """Route source into sink, the route is dropped again if not loaded"""
+        with self._lock:
+            self.state.routes[source] = sink
+            result = self.reconcile()
+            if source not in self.connector.sessions:
+                del self.state.routes[source]
+            return result
+
+    def remove(self, source: str) -> ReconcileResult:
+        """Drop route of source and unload its loopback
+
+        Both happen under the lock, so neither adopt nor a background pass
+        can bring the route back in between.
+        """
+        with self._lock:
+            self.state.routes.pop(source, None)
+            return self.reconcile()
+
+    def effective(self, modules: List[ModuleInfo]) -> List[ModuleInfo]:
+        """Modules with the sinks their loopback streams play into
+
+        Module args keep the sink a loopback was loaded with. Moved streams
+        are found from their links in the graph, which holds across
+        processes. Without pw-dump only moves of this process are known.
+        """
+        present = {module.id for module in modules}
+        for moves in (self.moved, self.diverted):
+            for module_id in list(moves):
+                if module_id not in present:
+                    del moves[module_id]
+
+        graph = self.connector._snapshot()
+        result = []
+        for module in modules:
+            sink = self.diverted.get(module.id)
+            if sink is None and module.is_loopback:
+                observed = graph.get_module(module.id) if graph else None
+                if observed is not None:
+                    sink = observed.args.get("sink")
+                else:
+                    sink = self.moved.get(module.id)
+            if sink is not None and sink != module.args.get("sink"):
+                module = ModuleInfo(
+                    module.id, module.name, {**module.args, "sink": sink}
+                )
+            result.append(module)
+        return result
+
+    def move(self, source: str, sink: str) -> bool:
+        """Move loopback of source to sink without reloading it
+
+        False when the stream could not be moved, a reconcile pass then
+        reloads the loopback instead.
+        """
+        with self._lock:
+            self.state.routes[source] = sink
+            session = self.connector.sessions.get(source)
+            if session is None:
+                return False
+            if session.sink == sink:
+                return True
+
+            stream_id = self._loopback_stream(session.loopback_id)
+            if stream_id is None:
+                return False
+            if not self.controller.move_sink_input(stream_id, sink).success:
+                return False
+
+            self.moved[session.loopback_id] = sink
+            self.connector._invalidate_snapshot()
+            self.connector.sessions[source] = Session(source, sink, session.loopback_id)
+            return True
+
+    def divert(self, source: str, sink: Optional[str]) -> bool:
+        """Move loopback stream of source to sink, back to its chain if None
+
+        The route is left as it is, so passes neither undo nor follow it.
+        """
+        with self._lock:
+            session = self.connector.sessions.get(source)
+            if session is None:
+                return False
+            stream_id = self._loopback_stream(session.loopback_id)
+            if stream_id is None:
+                # Snapshot may predate the loopback
+                self.connector._invalidate_snapshot()
+                stream_id = self._loopback_stream(session.loopback_id)
+            if stream_id is None:
+                return False
+            if not self.controller.move_sink_input(
+                stream_id, sink or session.sink
+            ).success:
+                return False
+            if sink is None:
+                self.diverted.pop(session.loopback_id, None)
+            else:
+                self.diverted[session.loopback_id] = session.sink
+            self.connector._invalidate_snapshot()
+            return True
+
+    def _loopback_stream(self, module_id: str) -> Optional[str]:
+        """Pulse index of playback stream of loopback module"""
+        graph = self.connector._snapshot()
+        if not graph:
+            return None
+        for node in graph.get_nodes("Stream/Output/Audio"):
+            if node.module_id == module_id:
+                return node.serial
+        return None
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Keep background passes out while the graph is rebuilt"""
+        with self._lock:
+            yield
+
+    @timed("reconciler.reconcile")
+    def reconcile(self, fresh: bool = False) -> ReconcileResult:
+        """Compare desired and observed loopbacks, apply the difference
+
+        Node presence comes from the graph snapshot of the current action,
+        fresh drops it first.
+        """
+        with self._lock:
+            if fresh:
+                self.connector._invalidate_snapshot()
+            desired = self.desired_routes()
+            todo = plan(desired, self.effective(self._observe_modules()))
+            result = ReconcileResult(active=dict(todo.keep))
+
+            for module_id, reason in todo.unload.items():
+                unloaded = self.controller.unload_module(module_id)
+                if unloaded.success:
+                    result.unloaded.append(module_id)
+                else:
+                    result.errors[module_id] = unloaded.stderr or reason
+
+            available = self._existing_nodes(todo.load)
+            for route in todo.load:
+                if route.source not in available or route.sink not in available:
+                    result.pending.append(route)
+                    continue
+                loaded = self.controller.load_loopback(
+                    route.source, route.sink, route.latency_ms
+                )
+                if loaded.success and loaded.stdout.strip():
+                    result.active[route] = loaded.stdout.strip()
+                    result.loaded.append(route)
+                else:
+                    result.errors[route.source] = loaded.stderr or "Load failed"
+
+            if not todo.empty:
+                self.connector._invalidate_snapshot()
+            self._update_sessions(result.active)
+            return result
+
+    def _observe_modules(self) -> List[ModuleInfo]:
+        """Loaded modules straight from the server
+
+        The event index can lag behind our own loads, which would double them.
+        """
+        result = self.controller.list_modules()
+        if result.success:
+            return ModuleInfo.from_short_list(result.stdout)
+        return self.connector._list_modules()
+
+    def _existing_nodes(self, routes: List[Route]) -> Set[str]:
+        """Names of route endpoints present in the graph"""
+        names = {name for route in routes for name in (route.source, route.sink)}
+        if not names:
+            return set()
+        graph = self.connector._snapshot()
+        if graph:
+            return {name for name in names if graph.get_node(name)}
+        return set(self.controller.get_node_ids(sorted(names)))
+
+    def _update_sessions(self, loopbacks: Dict[Route, str]):
+        """Rebuild connection table from active loopbacks"""
+        sessions = {}
+        monitor_id = None
+        for route, module_id in loopbacks.items():
+            if route.is_monitor:
+                monitor_id = module_id
+            else:
+                sessions[route.source] = Session(route.source, route.sink, module_id)
+        self.connector.sessions = sessions
+        self.monitor_id = monitor_id
+        self.connector.save_state()
+
+    def trigger(self):
+        """Request reconcile pass from background thread"""
+        if self._triggered_at is None:
+            self._triggered_at = time.monotonic()
+        self._wake.set()
+
+    def start(self):
+        """Re-converge on graph events and periodically"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self.connector.device_monitor.add_listener(self.trigger)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopping:
+            if self._wake.wait(self.resync):
+                time.sleep(self.debounce)
+            self._wake.clear()
+            if self._stopping:
+                return
+
+            triggered_at, self._triggered_at = self._triggered_at, None
+            try:
+                # Subscription ends when pipewire-pulse restarts
+                if not self.connector.device_monitor.running:
+                    self.connector.start_device_monitor()
+                # Chains loaded at runtime end together with PipeWire
+                self.connector.restore_chains()
+                result = self.reconcile(fresh=True)
+            except Exception as e:
+                print(f"Reconcile error: {e}")
+                continue
+
+            if triggered_at is not None and metrics.enabled:
+                metrics.record(
+                    "reconciler.converge",
+                    (time.monotonic() - triggered_at) * 1000,
+                    1 if result.errors else 0,
+                    0,
+                )
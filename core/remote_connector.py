@@ -0,0 +1,337 @@
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.audio_device import AudioDevice
+from models.filter_chain_config import FilterChainConfig
+from models.gate_stats import GateStats
+from models.latency_measurement import LatencyMeasurement
+from models.noise_profile import NoiseProfile
+from models.session import Session
+from models.settings import Settings
+from models.state_snapshot import StateSnapshot
+from system.daemon_client import (
+    DEFAULT_TIMEOUT,
+    DaemonClient,
+    DaemonError,
+    default_socket_path,
+    running_daemon,
+)
+from system.pipewire_controller import PipeWireController
+
+from core.config_manager import ConfigManager
+from core.device_manager import DeviceManager
+
+DAEMON_START_TIMEOUT = 5.0
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cli.py")
+
+
+class StatusSubscription:
+    """Status stream of the daemon, in place of the local device monitor"""
+
+    def __init__(self, socket_path: str, on_status: Callable[[Dict], None]):
+        self.socket_path = socket_path
+        self.on_status = on_status
+        self._listeners: List[Callable[[], None]] = []
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Register callback for status changes"""
+        self._listeners.append(callback)
+
+    def start(self) -> bool:
+        if self.running:
+            return True
+        try:
+            self._thread = DaemonClient(self.socket_path, timeout=None).subscribe(
+                self._changed
+            )
+        except DaemonError as e:
+            print(f"Daemon subscribe error: {e}")
+            return False
+        return True
+
+    def _changed(self, status: Dict):
+        self.on_status(status)
+        for callback in self._listeners:
+            callback()
+
+
+class RemoteConnector:
+    """Connector API served by the control daemon
+
+    Routing, chains and settings live in the daemon, so the GUI and scripts
+    see and change the same state. Level meters and pw-top sampling still
+    run locally, they only read the graph.
+    """
+
+    def __init__(self, socket_path: str):
+        self.client = DaemonClient(socket_path)
+        self.settings = Settings()
+        self.config_manager = ConfigManager(self.settings)
+        self.device_manager = DeviceManager()
+        self.controller = PipeWireController()
+        self.device_monitor = StatusSubscription(socket_path, self._apply_status)
+        self.sessions: Dict[str, Session] = {}
+        self.monitor_loopback_id: Optional[str] = None
+        self._gate_listener = None
+
+    def _apply_status(self, status: Dict):
+        """Mirror daemon state into local settings and connection table"""
+        self.sessions = {
+            entry["device_name"]: Session(**entry) for entry in status["sessions"]
+        }
+        self.monitor_loopback_id = status["monitor_loopback_id"]
+        self.settings.noise_attenuation = status["attenuation"]
+        self.settings.sessions = dict(status["device_attenuation"])
+        self.settings.profiles = {
+            name: NoiseProfile(name, attenuation)
+            for name, attenuation in status["profiles"].items()
+        }
+        self.settings.active_profiles = dict(status["active_profiles"])
+        self.device_manager.devices = [
+            AudioDevice(**device) for device in status["devices"]
+        ]
+
+    def _outcome(
+        self, method: str, timeout: Optional[float] = DEFAULT_TIMEOUT, **params
+    ) -> Tuple[bool, str]:
+        try:
+            result = self.client.call(method, timeout=timeout, **params)
+        except DaemonError as e:
+            return False, str(e)
+        return result["success"], result["message"]
+
+    @property
+    def current_loopback_id(self) -> Optional[str]:
+        """Loopback of microphone on the shared chain"""
+        for session in self.sessions.values():
+            if not session.dedicated:
+                return session.loopback_id
+        return None
+
+    def start_device_monitor(self) -> bool:
+        return self.device_monitor.start()
+
+    def start_auto_reconcile(self):
+        """The daemon reconciles in the background"""
+
+    def get_devices(self) -> list:
+        try:
+            devices = self.client.call("devices")
+        except DaemonError as e:
+            print(f"Daemon error: {e}")
+            return []
+        self.device_manager.devices = [AudioDevice(**device) for device in devices]
+        return self.device_manager.get_devices()
+
+    def warm_start(self) -> Optional[StateSnapshot]:
+        """Last known state as cached by the daemon"""
+        state = self.config_manager.load_state()
+        if state is None:
+            return None
+        self.settings.noise_attenuation = state.noise_attenuation
+        self.settings.sessions = dict(state.device_attenuation)
+        if not self.device_manager.devices:
+            self.device_manager.devices = list(state.devices)
+        return state
+
+    def refresh(self) -> Tuple[list, Optional[str]]:
+        """Devices and source on the shared chain, in one status call"""
+        connected = self.check_existing_connection()
+        return self.device_manager.get_devices(), connected
+
+    def check_existing_connection(self) -> Optional[str]:
+        """Fetch connection table, return source on the shared chain"""
+        try:
+            self._apply_status(self.client.call("status"))
+        except DaemonError as e:
+            print(f"Daemon error: {e}")
+            return None
+        for session in self.sessions.values():
+            if not session.dedicated:
+                return session.device_name
+        return None
+
+    def _chain_for(self, device_name: str) -> FilterChainConfig:
+        try:
+            return FilterChainConfig(**self.client.call("chain", device=device_name))
+        except DaemonError as e:
+            print(f"Daemon error: {e}")
+            return self.config_manager.desired_config()
+
+    def dsp_targets(self) -> Dict[int, str]:
+        try:
+            targets = self.client.call("dsp_targets")
+        except DaemonError as e:
+            print(f"Daemon error: {e}")
+            return {}
+        return {int(node_id): label for node_id, label in targets.items()}
+
+    def connect_microphone(
+        self, device: AudioDevice, dedicated: bool = False
+    ) -> Tuple[bool, str]:
+        return self._outcome(
+            "connect", timeout=None, device=device.name, dedicated=dedicated
+        )
+
+    def disconnect_microphone(
+        self, device: Optional[AudioDevice] = None
+    ) -> Tuple[bool, str]:
+        return self._outcome("disconnect", device=device.name if device else None)
+
+    def set_attenuation(self, value: float, device_name: Optional[str] = None):
+        if device_name in self.settings.sessions:
+            self.settings.sessions[device_name] = value
+        else:
+            self.settings.noise_attenuation = value
+        try:
+            self.client.call("set_attenuation", value=value, device=device_name)
+        except DaemonError as e:
+            print(f"Daemon error: {e}")
+
+    def apply_settings(self) -> Tuple[bool, str]:
+        return self._outcome("apply_settings", timeout=None)
+
+    def start_monitoring(self) -> Tuple[bool, str]:
+        return self._outcome("start_monitoring")
+
+    def stop_monitoring(self, module_id: Optional[str] = None) -> Tuple[bool, str]:
+        return self._outcome("stop_monitoring")
+
+    def switch_profile(
+        self, device_name: str, profile: Optional[str]
+    ) -> Tuple[bool, str]:
+        return self._outcome("switch_profile", device=device_name, profile=profile)
+
+    def save_profile(self, name: str, attenuation: float) -> Tuple[bool, str]:
+        return self._outcome(
+            "save_profile", timeout=None, name=name, attenuation=attenuation
+        )
+
+    def remove_profile(self, name: str) -> Tuple[bool, str]:
+        return self._outcome("remove_profile", timeout=None, name=name)
+
+    def set_latency(
+        self, device: AudioDevice, latency_ms: int, quantum: Optional[int] = None
+    ) -> Tuple[bool, str]:
+        return self._outcome(
+            "set_latency",
+            timeout=None,
+            device=device.name,
+            latency_ms=latency_ms,
+            quantum=quantum,
+        )
+
+    def start_gate(
+        self,
+        on_change=None,
+        threshold_db: Optional[float] = None,
+        hold_ms: Optional[int] = None,
+        attack_ms: Optional[int] = None,
+    ) -> Tuple[bool, str]:
+        # Bypass changes arrive as status notifications
+        if on_change and on_change is not self._gate_listener:
+            self.device_monitor.add_listener(on_change)
+            self._gate_listener = on_change
+        return self._outcome(
+            "start_gate",
+            threshold_db=threshold_db,
+            hold_ms=hold_ms,
+            attack_ms=attack_ms,
+        )
+
+    def stop_gate(self) -> Tuple[bool, str]:
+        return self._outcome("stop_gate")
+
+    def gate_stats(self) -> List[GateStats]:
+        try:
+            stats = self.client.call("gate_stats")
+        except DaemonError as e:
+            print(f"Daemon error: {e}")
+            return []
+        return [GateStats(**entry) for entry in stats]
+
+    def measure_latency(
+        self,
+        device_name: Optional[str] = None,
+        probes: Optional[int] = None,
+        progress=None,
+    ) -> Tuple[Optional[LatencyMeasurement], str]:
+        try:
+            result = self.client.call(
+                "measure_latency",
+                notify=self._progress(progress),
+                timeout=None,
+                device=device_name,
+                probes=probes,
+            )
+        except DaemonError as e:
+            return None, str(e)
+        measurement = result["measurement"]
+        return (
+            LatencyMeasurement(**measurement) if measurement else None,
+            result["message"],
+        )
+
+    def tune_latency(
+        self, device: AudioDevice, settle_seconds: Optional[float] = None, progress=None
+    ) -> Tuple[bool, str]:
+        try:
+            result = self.client.call(
+                "tune_latency",
+                notify=self._progress(progress),
+                timeout=None,
+                device=device.name,
+                settle=settle_seconds,
+            )
+        except DaemonError as e:
+            return False, str(e)
+        return result["success"], result["message"]
+
+    @staticmethod
+    def _progress(progress):
+        if progress is None:
+            return None
+        return lambda method, params: progress(params.get("message", ""))
+
+
+def open_connector(autostart: bool = False):
+    """Connector of the running daemon, else a local one
+
+    With autostart the daemon is started first, so state outlives the
+    caller. DEEPFILTER_DAEMON=0 always uses a local connector.
+    """
+    socket_path = running_daemon()
+    if socket_path:
+        return RemoteConnector(socket_path)
+    if autostart and os.environ.get("DEEPFILTER_DAEMON") != "0":
+        socket_path = default_socket_path()
+        if start_daemon(socket_path):
+            return RemoteConnector(socket_path)
+
+    from core.connector import DeepFilterConnector
+
+    return DeepFilterConnector()
+
+
+def start_daemon(socket_path: str) -> bool:
+    """Start daemon in its own session and wait for its socket"""
+    from system.command_executor import CommandExecutor
+
+    try:
+        CommandExecutor.spawn_detached([sys.executable, CLI_PATH, "daemon"])
+    except OSError as e:
+        print(f"Daemon start error: {e}")
+        return False
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if DaemonClient.probe(socket_path):
+            return True
+        time.sleep(0.05)
+    return False
@@ -0,0 +1,307 @@
+import threading
+import time
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.gate_stats import GateStats
+from system.metrics import metrics
+
+from core.dsp_monitor import DspMonitor
+
+DETECT_RATE = 16000
+BLOCK_MS = 10
+# Chain load is sampled while the chains run, pw-top takes about a second
+LOAD_INTERVAL = 10.0
+# Period of matching gates to connected microphones
+SYNC_SECONDS = 1.0
+BYPASS_SINK = "effect_bypass.deep_filter"
+BYPASS_DESCRIPTION = "DeepFilter Bypass"
+
+
+def block_power(samples: np.ndarray, block_size: int) -> np.ndarray:
+    """Mean square of each full block of samples"""
+    blocks = samples[: len(samples) // block_size * block_size].reshape(-1, block_size)
+    return np.einsum("ij,ij->i", blocks, blocks) / block_size
+
+
+class EnergyDetector:
+    """Speech from block energy, held for a while after the last loud block"""
+
+    def __init__(
+        self,
+        threshold_db: float,
+        hold_ms: int,
+        block_ms: int = BLOCK_MS,
+        rate: int = DETECT_RATE,
+    ):
+        self.block_size = rate * block_ms // 1000
+        self.threshold = 10 ** (threshold_db / 10)
+        self.hold_blocks = max(1, hold_ms // block_ms)
+        self._quiet_blocks = 0
+
+    def update(self, samples: np.ndarray) -> bool:
+        """Feed samples, True while speech was heard within the hold time"""
+        loud = np.flatnonzero(block_power(samples, self.block_size) >= self.threshold)
+        blocks = len(samples) // self.block_size
+        if len(loud):
+            self._quiet_blocks = blocks - 1 - int(loud[-1])
+        else:
+            self._quiet_blocks += blocks
+        return self._quiet_blocks < self.hold_blocks
+
+
+class SilenceGate:
+    """Bypass the chain of one microphone while it is silent
+
+    The loopback stream is moved to a null sink and the chain suspended,
+    speech moves it back. The route stays, so reconcile passes ignore it.
+    """
+
+    def __init__(self, gates: "SilenceGates", device_name: str):
+        self.gates = gates
+        self.connector = gates.connector
+        self.controller = gates.connector.controller
+        settings = self.connector.settings
+        self.detector = EnergyDetector(
+            settings.gate_threshold_db, settings.gate_hold_ms
+        )
+        # Read often enough that speech is noticed within the attack time
+        blocks = max(1, settings.gate_attack_ms // 2 // BLOCK_MS)
+        self._raw = bytearray(blocks * self.detector.block_size * 4)
+        self._samples = np.frombuffer(self._raw, dtype=np.float32)
+        self.stats = GateStats(device_name)
+        self._process = None
+        self._started = 0.0
+        self._bypassed_at = 0.0
+        # Loopback and sink of the session while bypassed
+        self._session: Optional[Tuple[str, str]] = None
+
+    @property
+    def device_name(self) -> str:
+        return self.stats.device_name
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        try:
+            self._process = self.controller.record(self.device_name, DETECT_RATE)
+        except OSError as e:
+            print(f"Silence gate error: {e}")
+            return False
+        self._started = time.monotonic()
+        threading.Thread(target=self._read_blocks, daemon=True).start()
+        return True
+
+    def stop(self):
+        """Stop capture, resume the chain if bypassed"""
+        if self._process:
+            self._process.terminate()
+            self._process = None
+        with self.gates.lock:
+            if self.stats.bypassed:
+                self.resume()
+
+    def snapshot(self) -> GateStats:
+        """Stats including the running bypass"""
+        now = time.monotonic()
+        stats = replace(self.stats, active_s=now - self._started)
+        if stats.bypassed:
+            elapsed = now - self._bypassed_at
+            stats.bypassed_s += elapsed
+            stats.saved_cpu_s += elapsed * self.gates.chain_load(self._session[1])
+        return stats
+
+    def _read_blocks(self):
+        process = self._process
+        view = memoryview(self._raw)
+        cpu_start = time.thread_time()
+        while True:
+            filled = 0
+            while filled < len(view):
+                count = process.stdout.readinto(view[filled:])
+                if not count:
+                    return
+                filled += count
+            speech = self.detector.update(self._samples)
+            self.stats.detector_cpu_s = time.thread_time() - cpu_start
+            try:
+                self._gate(speech)
+            except Exception as e:
+                print(f"Silence gate error: {e}")
+
+    def _gate(self, speech: bool):
+        with self.gates.lock:
+            session = self.connector.sessions.get(self.device_name)
+            if self.stats.bypassed:
+                # A reloaded loopback plays into its chain again
+                if speech or session is None or session.loopback_id != self._session[0]:
+                    self.resume()
+            elif not speech and session is not None:
+                self.bypass(session)
+
+    def bypass(self, session):
+        if not self.connector.reconciler.divert(self.device_name, BYPASS_SINK):
+            return
+        self.stats.bypassed = True
+        self.stats.bypasses += 1
+        self._bypassed_at = time.monotonic()
+        self._session = (session.loopback_id, session.sink)
+        self.gates.suspend_unused(session.sink)
+        self.gates.changed()
+
+    def resume(self):
+        start = time.perf_counter()
+        # The chain may have been suspended by the last gate bypassing it
+        self.gates.resume_sink(self._session[1])
+        session = self.connector.sessions.get(self.device_name)
+        if session is not None and session.loopback_id == self._session[0]:
+            self.connector.reconciler.divert(self.device_name, None)
+
+        elapsed = time.monotonic() - self._bypassed_at
+        saved = elapsed * self.gates.chain_load(self._session[1])
+        self.stats.bypassed = False
+        self.stats.bypassed_s += elapsed
+        self.stats.saved_cpu_s += saved
+        self._session = None
+        if metrics.enabled:
+            metrics.record("gate.resume", (time.perf_counter() - start) * 1000, 0, 0)
+            metrics.record("gate.bypass", elapsed * 1000, 0, 0)
+            metrics.record("gate.saved_cpu", saved * 1000, 0, 0)
+        self.gates.changed()
+
+
+class SilenceGates:
+    """Silence gates of all connected microphones, and load of their chains"""
+
+    def __init__(self, connector, on_change: Optional[Callable[[], None]] = None):
+        self.connector = connector
+        self.on_change = on_change
+        self.gates: Dict[str, SilenceGate] = {}
+        self.lock = threading.RLock()
+        self.load = DspMonitor(
+            connector.controller,
+            self._running_chains,
+            alert_percent=100.0,
+            interval=LOAD_INTERVAL,
+        )
+        self._bypass_module: Optional[str] = None
+        # Chains suspended because every microphone on them is bypassed
+        self.suspended: Set[str] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> Tuple[bool, str]:
+        """Create the bypass sink and gate every connected microphone"""
+        if self.running:
+            return True, "Silence gate already running"
+        graph = self.connector._snapshot()
+        if graph and graph.get_node(BYPASS_SINK):
+            # Left by a gate that ended without resuming its chains
+            for name, session in list(self.connector.sessions.items()):
+                self.connector.controller.suspend_sink(session.sink, False)
+                self.connector.reconciler.divert(name, None)
+        else:
+            result = self.connector.controller.load_null_sink(
+                BYPASS_SINK, BYPASS_DESCRIPTION
+            )
+            if not result.success:
+                return False, f"Bypass sink error: {result.stderr.strip()}"
+            self._bypass_module = result.stdout.strip()
+            self.connector._invalidate_snapshot()
+        self._stop.clear()
+        self.sync()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.load.start()
+        return True, f"Silence gate on for {len(self.gates)} microphones"
+
+    def stop(self) -> Tuple[bool, str]:
+        """Resume all chains and remove the bypass sink"""
+        self._stop.set()
+        self.load.stop()
+        with self.lock:
+            gates, self.gates = list(self.gates.values()), {}
+        for gate in gates:
+            gate.stop()
+        with self.lock:
+            for sink in list(self.suspended):
+                self.resume_sink(sink)
+        if self._bypass_module:
+            self.connector.controller.unload_module(self._bypass_module)
+            self._bypass_module = None
+            self.connector._invalidate_snapshot()
+        return True, "Silence gate off"
+
+    def _run(self):
+        while not self._stop.wait(SYNC_SECONDS):
+            try:
+                self.sync()
+            except Exception as e:
+                print(f"Silence gate error: {e}")
+
+    def sync(self):
+        """Gate microphones that connected, drop gates of disconnected ones"""
+        sessions = dict(self.connector.sessions)
+        with self.lock:
+            if self._stop.is_set():
+                return
+            for name in [name for name in self.gates if name not in sessions]:
+                self.gates.pop(name).stop()
+            for name in sessions:
+                if name not in self.gates:
+                    gate = SilenceGate(self, name)
+                    if gate.start():
+                        self.gates[name] = gate
+
+    def sink_in_use(self, sink: str) -> bool:
+        """Whether a microphone that is not bypassed plays into sink"""
+        for name, session in list(self.connector.sessions.items()):
+            gate = self.gates.get(name)
+            if session.sink == sink and not (gate and gate.stats.bypassed):
+                return True
+        return False
+
+    def suspend_unused(self, sink: str):
+        """Suspend chain once no microphone plays into it, under lock"""
+        if sink not in self.suspended and not self.sink_in_use(sink):
+            if self.connector.controller.suspend_sink(sink, True).success:
+                self.suspended.add(sink)
+
+    def resume_sink(self, sink: str):
+        """Resume chain if a gate suspended it, under lock"""
+        if sink in self.suspended:
+            self.suspended.discard(sink)
+            self.connector.controller.suspend_sink(sink, False)
+
+    def chain_load(self, sink: str) -> float:
+        """Last sampled CPU share of chain, 0 before the first sample"""
+        series = self.load.series.get(sink)
+        return series.load.last() / 100 if series else 0.0
+
+    def _running_chains(self) -> Dict[int, str]:
+        """Node id -> name of chains with a microphone that is not bypassed"""
+        graph = self.connector._snapshot()
+        if not graph:
+            return {}
+        targets = {}
+        for session in list(self.connector.sessions.values()):
+            node = graph.get_node(session.sink)
+            if node and self.sink_in_use(session.sink):
+                targets[node.id] = session.sink
+        return targets
+
+    def stats(self) -> List[GateStats]:
+        with self.lock:
+            return [gate.snapshot() for gate in self.gates.values()]
+
+    def changed(self):
+        if self.on_change:
+            self.on_change()
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 
 @dataclass
@@ -7,7 +8,18 @@ class AudioDevice:
 
     name: str
     description: str
+    index: Optional[str] = field(default=None, compare=False)
+    # Native sample spec, 0 when the listing does not report it
+    rate: int = field(default=0, compare=False)
+    channels: int = field(default=0, compare=False)
 
     @property
     def display(self) -> str:
         return self.description
+
+    @property
+    def sample_spec(self) -> str:
+        """Sample spec as shown by pactl, empty if unknown"""
+        if not self.rate or not self.channels:
+            return ""
+        return f"{self.channels}ch {self.rate}Hz"
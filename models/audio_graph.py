@@ -0,0 +1,203 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.audio_device import AudioDevice
+from models.module_info import ModuleInfo
+
+TYPE_NODE = "PipeWire:Interface:Node"
+TYPE_PORT = "PipeWire:Interface:Port"
+TYPE_LINK = "PipeWire:Interface:Link"
+
+
+@dataclass
+class Node:
+    """PipeWire node"""
+
+    id: int
+    name: str
+    description: str
+    media_class: str
+    props: Dict[str, Any] = field(default_factory=dict)
+    # Native sample spec, 0 when unknown
+    rate: int = 0
+    channels: int = 0
+
+    @property
+    def module_id(self) -> Optional[str]:
+        """Id of pulse module that created the node"""
+        value = self.props.get("pulse.module.id")
+        return str(value) if value is not None else None
+
+    @property
+    def serial(self) -> str:
+        """Pulse index of node, pipewire-pulse uses its object.serial"""
+        return str(self.props.get("object.serial", self.id))
+
+    @property
+    def target(self) -> Optional[str]:
+        value = self.props.get("target.object", self.props.get("node.target"))
+        return str(value) if value is not None else None
+
+    def to_device(self) -> AudioDevice:
+        return AudioDevice(
+            self.name, self.description, self.serial, self.rate, self.channels
+        )
+
+
+@dataclass
+class Port:
+    """PipeWire port"""
+
+    id: int
+    node_id: int
+    name: str
+    direction: str
+
+
+@dataclass
+class Link:
+    """PipeWire link between two ports"""
+
+    id: int
+    output_node_id: int
+    output_port_id: int
+    input_node_id: int
+    input_port_id: int
+
+
+class AudioGraph:
+    """Indexed snapshot of the PipeWire graph"""
+
+    def __init__(self):
+        self.nodes: Dict[int, Node] = {}
+        self.ports: Dict[int, Port] = {}
+        self.links: Dict[int, Link] = {}
+        self.links_from: Dict[int, List[Link]] = {}
+        self.modules: Dict[str, ModuleInfo] = {}
+        self.nodes_by_name: Dict[str, Node] = {}
+        self.nodes_by_class: Dict[str, List[Node]] = {}
+        self.loopbacks_by_source: Dict[str, List[ModuleInfo]] = {}
+        self.loopbacks_by_sink: Dict[str, List[ModuleInfo]] = {}
+
+    @classmethod
+    def from_pw_dump(cls, text: str) -> "AudioGraph":
+        """Build graph from `pw-dump` JSON output"""
+        graph = cls()
+        module_nodes: Dict[str, List[Node]] = {}
+
+        for obj in json.loads(text):
+            info = obj.get("info") or {}
+            props = info.get("props") or {}
+            obj_type = obj.get("type")
+
+            if obj_type == TYPE_NODE:
+                node = Node(
+                    obj["id"],
+                    props.get("node.name", ""),
+                    props.get("node.description", props.get("node.name", "")),
+                    props.get("media.class", ""),
+                    props,
+                    *_sample_spec(info),
+                )
+                graph.nodes[node.id] = node
+                graph.nodes_by_name[node.name] = node
+                graph.nodes_by_class.setdefault(node.media_class, []).append(node)
+                if node.module_id is not None:
+                    module_nodes.setdefault(node.module_id, []).append(node)
+            elif obj_type == TYPE_PORT:
+                graph.ports[obj["id"]] = Port(
+                    obj["id"],
+                    int(props.get("node.id", -1)),
+                    props.get("port.name", ""),
+                    info.get("direction", ""),
+                )
+            elif obj_type == TYPE_LINK:
+                link = Link(
+                    obj["id"],
+                    info.get("output-node-id", -1),
+                    info.get("output-port-id", -1),
+                    info.get("input-node-id", -1),
+                    info.get("input-port-id", -1),
+                )
+                graph.links[link.id] = link
+                graph.links_from.setdefault(link.output_node_id, []).append(link)
+
+        for module_id, nodes in module_nodes.items():
+            graph._add_module(module_id, nodes)
+
+        return graph
+
+    def _add_module(self, module_id: str, nodes: List[Node]):
+        """Recover pulse module from the nodes it created"""
+        capture = playback = None
+        for node in nodes:
+            if node.media_class == "Stream/Input/Audio":
+                capture = node
+            elif node.media_class == "Stream/Output/Audio":
+                playback = node
+
+        if not (capture and playback and "loopback" in capture.name):
+            self.modules[module_id] = ModuleInfo(module_id, "")
+            return
+
+        args = {}
+        if capture.target:
+            args["source"] = capture.target
+        # A moved stream keeps its target prop, its links show where it plays
+        sink = self.linked_input(playback.id) or playback.target
+        if sink:
+            args["sink"] = sink
+        module = ModuleInfo(module_id, "module-loopback", args)
+        self.modules[module_id] = module
+
+        if "source" in args:
+            self.loopbacks_by_source.setdefault(args["source"], []).append(module)
+        if "sink" in args:
+            self.loopbacks_by_sink.setdefault(args["sink"], []).append(module)
+
+    def linked_input(self, node_id: int) -> Optional[str]:
+        """Name of node that the output ports of node are linked to"""
+        for link in self.links_from.get(node_id, []):
+            node = self.nodes.get(link.input_node_id)
+            if node:
+                return node.name
+        return None
+
+    def get_node(self, name: str) -> Optional[Node]:
+        return self.nodes_by_name.get(name)
+
+    def get_module(self, module_id: str) -> Optional[ModuleInfo]:
+        return self.modules.get(module_id)
+
+    def get_nodes(self, media_class: str) -> List[Node]:
+        return self.nodes_by_class.get(media_class, [])
+
+    def get_loopbacks_to(self, sink: str) -> List[ModuleInfo]:
+        return self.loopbacks_by_sink.get(sink, [])
+
+    def get_loopbacks_from(self, source: str) -> List[ModuleInfo]:
+        return self.loopbacks_by_source.get(source, [])
+
+
+def _sample_spec(info: Dict[str, Any]) -> Tuple[int, int]:
+    """Rate and channels of node from its props, else its format params"""
+    props = info.get("props") or {}
+    rate = _spec_value(props.get("audio.rate"))
+    channels = _spec_value(props.get("audio.channels"))
+    params = info.get("params") or {}
+    for fmt in (params.get("Format") or []) + (params.get("EnumFormat") or []):
+        if isinstance(fmt, dict):
+            rate = rate or _spec_value(fmt.get("rate"))
+            channels = channels or _spec_value(fmt.get("channels"))
+    return rate, channels
+
+
+def _spec_value(value: Any) -> int:
+    """Plain int, or default of a range or enum choice"""
+    if isinstance(value, dict):
+        value = value.get("default")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
@@ -0,0 +1,60 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class BatchJob:
+    """Audio file to denoise offline through the LADSPA plugin"""
+
+    input_path: str
+    output_path: str
+    plugin: str
+    label: str = "deep_filter_mono"
+    controls: Dict[str, float] = field(default_factory=dict)
+    block_size: int = 1024
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch job"""
+
+    input_path: str
+    output_path: str
+    frames: int = 0
+    rate: int = 0
+    seconds: float = 0.0
+    error: str = ""
+
+    @property
+    def success(self) -> bool:
+        return not self.error
+
+    @property
+    def duration(self) -> float:
+        """Audio length in seconds"""
+        return self.frames / self.rate if self.rate else 0.0
+
+    @property
+    def realtime_factor(self) -> float:
+        """Processing time per second of audio, below 1 is faster than real time"""
+        return self.seconds / self.duration if self.duration else 0.0
+
+
+@dataclass
+class BatchProgress:
+    """Progress of one file in a running batch"""
+
+    index: int
+    frames_done: int
+    frames_total: int
+    rate: int
+    elapsed: float
+
+    @property
+    def fraction(self) -> float:
+        return self.frames_done / self.frames_total if self.frames_total else 1.0
+
+    @property
+    def realtime_factor(self) -> float:
+        audio_seconds = self.frames_done / self.rate if self.rate else 0.0
+        return self.elapsed / audio_seconds if audio_seconds else 0.0
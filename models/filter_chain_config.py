@@ -0,0 +1,166 @@
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Set, Tuple
+
+INPUT_NODE = "effect_input.deep_filter"
+OUTPUT_NODE = "effect_output.deep_filter"
+DESCRIPTION = "DeepFilter Noise Cancelling"
+# Virtual source all profile chains play into, apps record from it
+PROFILE_OUTPUT_NODE = f"{OUTPUT_NODE}.profiles"
+PROFILE_DESCRIPTION = f"{DESCRIPTION} (Profiles)"
+PROFILE_PREFIX = "profile-"
+# DeepFilterNet runs at 48 kHz only, sources at other rates are resampled
+PLUGIN_RATE = 48000
+MONO_LABEL = "deep_filter_mono"
+STEREO_LABEL = "deep_filter_stereo"
+
+
+def chain_id_for(device_name: str) -> str:
+    """Stable short id of filter chain dedicated to device"""
+    import hashlib
+
+    return hashlib.sha1(device_name.encode()).hexdigest()[:8]
+
+
+def matched_format(channels: int) -> Tuple[str, int]:
+    """Plugin label and chain channels for a source with channels
+
+    Stereo sources keep both channels, other layouts are downmixed to mono.
+    """
+    return (STEREO_LABEL, 2) if channels == 2 else (MONO_LABEL, 1)
+
+
+def is_profile_node(node_name: str) -> bool:
+    """Whether node belongs to a profile chain"""
+    return node_name.startswith(f"{INPUT_NODE}.{PROFILE_PREFIX}")
+
+
+@dataclass
+class FilterChainConfig:
+    """DeepFilter filter-chain graph parameters"""
+
+    plugin: str
+    label: str = MONO_LABEL
+    controls: Dict[str, float] = field(default_factory=dict)
+    rate: int = PLUGIN_RATE
+    channels: int = 1
+    # Samples per graph cycle, 0 keeps PipeWire default
+    quantum: int = 0
+    # Empty for the shared chain, otherwise chain is dedicated to device
+    device: str = ""
+    # Name of noise profile the chain serves, outputs into the profile source
+    profile: str = ""
+
+    @property
+    def chain_id(self) -> str:
+        if self.device:
+            return chain_id_for(self.device)
+        if self.profile:
+            return PROFILE_PREFIX + chain_id_for(self.profile)
+        return ""
+
+    @property
+    def input_node(self) -> str:
+        return f"{INPUT_NODE}.{self.chain_id}" if self.chain_id else INPUT_NODE
+
+    @property
+    def output_node(self) -> str:
+        return f"{OUTPUT_NODE}.{self.chain_id}" if self.chain_id else OUTPUT_NODE
+
+    @property
+    def source_node(self) -> str:
+        """Node apps record the chain output from"""
+        return PROFILE_OUTPUT_NODE if self.profile else self.output_node
+
+    @property
+    def owner(self) -> str:
+        """Device or profile the chain belongs to, empty for the shared chain"""
+        return self.device or self.profile
+
+    @property
+    def description(self) -> str:
+        return f"{DESCRIPTION} ({self.owner})" if self.owner else DESCRIPTION
+
+    def diff(self, other: "FilterChainConfig") -> "ConfigDiff":
+        """Get changes needed to turn other config into this one"""
+        prefix = f"{self.chain_id}/" if self.chain_id else ""
+        changes = {}
+        current = asdict(other)
+        for key, value in asdict(self).items():
+            if key == "controls":
+                continue
+            if current[key] != value:
+                changes[f"{prefix}{key}"] = (current[key], value)
+
+        for name in set(self.controls) | set(other.controls):
+            old = other.controls.get(name)
+            new = self.controls.get(name)
+            if old != new:
+                changes[f"{prefix}control:{name}"] = (old, new)
+        return ConfigDiff(changes)
+
+
+def diff_chains(
+    desired: List[FilterChainConfig], current: List[FilterChainConfig]
+) -> "ConfigDiff":
+    """Get changes needed to turn current chain set into desired one"""
+    current_by_id = {config.chain_id: config for config in current}
+    desired_by_id = {config.chain_id: config for config in desired}
+    changes = {}
+
+    for chain_id in set(current_by_id) | set(desired_by_id):
+        old = current_by_id.get(chain_id)
+        new = desired_by_id.get(chain_id)
+        if old is None or new is None:
+            changes[f"chain/{chain_id}"] = (
+                old.owner if old else None,
+                new.owner if new else None,
+            )
+        else:
+            changes.update(new.diff(old).changes)
+    return ConfigDiff(changes)
+
+
+@dataclass
+class ConfigDiff:
+    """Difference between config on disk and desired config"""
+
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+    @property
+    def empty(self) -> bool:
+        return not self.changes
+
+    @property
+    def controls_only(self) -> bool:
+        """Changes can be applied live on the running nodes"""
+        return not self.empty and all(
+            key.rpartition("/")[2].startswith("control:") for key in self.changes
+        )
+
+    @property
+    def structural_chains(self) -> Set[str]:
+        """Ids of chains with changes that need the module reloaded"""
+        return {
+            chain_id
+            for chain_id in self.changed_chains
+            if not ConfigDiff(
+                {
+                    key: value
+                    for key, value in self.changes.items()
+                    if _chain_of(key) == chain_id
+                }
+            ).controls_only
+        }
+
+    @property
+    def changed_chains(self) -> Set[str]:
+        """Ids of chains with changes, empty id is the shared chain"""
+        return {_chain_of(key) for key in self.changes}
+
+
+def _chain_of(key: str) -> str:
+    """Chain id of change key, empty id is the shared chain"""
+    head, sep, tail = key.partition("/")
+    if not sep:
+        return ""
+    return tail if head == "chain" else head
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class GateStats:
+    """Time one microphone's chain was bypassed and the CPU that saved"""
+
+    device_name: str
+    bypassed: bool = False
+    # Seconds the gate has been running
+    active_s: float = 0.0
+    bypassed_s: float = 0.0
+    bypasses: int = 0
+    # Chain CPU seconds not spent while bypassed, from its pw-top load
+    saved_cpu_s: float = 0.0
+    # CPU seconds of the detector thread, the capture process is not counted
+    detector_cpu_s: float = 0.0
+
+    @property
+    def bypassed_percent(self) -> float:
+        if not self.active_s:
+            return 0.0
+        return 100.0 * self.bypassed_s / self.active_s
+
+    @property
+    def net_saved_cpu_s(self) -> float:
+        return self.saved_cpu_s - self.detector_cpu_s
+
+    def summary(self) -> str:
+        """One line with bypass share and CPU saved"""
+        state = "bypassed" if self.bypassed else "active"
+        return (
+            f"{self.device_name}: {state}, bypassed {self.bypassed_s:.1f} s "
+            f"({self.bypassed_percent:.0f}%) in {self.bypasses} pauses, "
+            f"saved {self.net_saved_cpu_s:.2f} CPU s"
+        )
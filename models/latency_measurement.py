@@ -0,0 +1,69 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class LatencyMeasurement:
+    """Delay of a filter chain measured with probe signals"""
+
+    timestamp: float
+    # Sink node the probes were played into
+    chain: str
+    # Microphone routed into the chain, empty if none
+    device: str = ""
+    # Configured latency of the microphone loopback, None without microphone
+    loopback_latency_ms: Optional[int] = None
+    quantum: int = 0
+    attenuation: float = 100.0
+    probes: int = 0
+    # Delay of every detected probe
+    delays_ms: List[float] = field(default_factory=list)
+
+    @property
+    def detected(self) -> int:
+        return len(self.delays_ms)
+
+    @property
+    def delay_ms(self) -> float:
+        """Median delay of chain"""
+        import statistics
+
+        return statistics.median(self.delays_ms) if self.delays_ms else 0.0
+
+    @property
+    def jitter_ms(self) -> float:
+        """Standard deviation of delay"""
+        import statistics
+
+        return statistics.pstdev(self.delays_ms) if self.delays_ms else 0.0
+
+    @property
+    def total_ms(self) -> float:
+        """Chain delay plus configured loopback latency"""
+        return self.delay_ms + (self.loopback_latency_ms or 0)
+
+    @property
+    def settings_key(self) -> str:
+        """Latency settings the measurement ran with"""
+        loopback = (
+            f"{self.loopback_latency_ms} ms"
+            if self.loopback_latency_ms is not None
+            else "none"
+        )
+        return f"loopback {loopback}, quantum {self.quantum or 'default'}"
+
+    def summary(self) -> str:
+        return (
+            f"{self.delay_ms:.1f} ms chain delay, jitter {self.jitter_ms:.2f} ms "
+            f"({self.detected}/{self.probes} probes, {self.settings_key})"
+        )
+
+
+def group_by_settings(
+    measurements: List[LatencyMeasurement],
+) -> Dict[str, List[LatencyMeasurement]]:
+    """Group measurements of same latency settings, oldest first"""
+    groups: Dict[str, List[LatencyMeasurement]] = {}
+    for measurement in sorted(measurements, key=lambda m: m.timestamp):
+        groups.setdefault(measurement.settings_key, []).append(measurement)
+    return groups
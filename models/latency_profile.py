@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class LatencyProfile:
+    """Loopback latency and graph quantum that run stable on a device"""
+
+    latency_ms: int = 20
+    # Samples per graph cycle requested by the chain, 0 keeps PipeWire default
+    quantum: int = 0
@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class ModuleInfo:
+    """Loaded PulseAudio module model"""
+
+    id: str
+    name: str
+    args: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_short_line(cls, line: str) -> "ModuleInfo":
+        """Parse line of `pactl list modules short`"""
+        parts = line.split("\t")
+        args = {}
+        if len(parts) > 2:
+            for arg in parts[2].split():
+                key, sep, value = arg.partition("=")
+                if sep:
+                    args[key] = value
+        return cls(parts[0], parts[1] if len(parts) > 1 else "", args)
+
+    @classmethod
+    def from_short_list(cls, output: str) -> List["ModuleInfo"]:
+        """Parse output of `pactl list modules short`"""
+        return [
+            cls.from_short_line(line) for line in output.split("\n") if line.strip()
+        ]
+
+    @property
+    def is_loopback(self) -> bool:
+        return self.name == "module-loopback"
@@ -0,0 +1,79 @@
+import re
+from dataclasses import dataclass
+from typing import Dict
+
+DURATION_UNITS_US = {"ns": 0.001, "us": 1.0, "ms": 1000.0, "s": 1e6}
+
+
+@dataclass
+class NodeStats:
+    """Timing of one node in a graph cycle, as reported by pw-top"""
+
+    id: int
+    name: str
+    quantum: int
+    rate: int
+    # Time spent processing the last cycle, 0 when not reported
+    busy_us: float
+    # Busy time relative to the driver's quantum, as in the B/Q column
+    busy_ratio: float
+    # Cumulative xrun/error counter
+    errors: int
+
+    @property
+    def load_percent(self) -> float:
+        """DSP load: busy time as share of the cycle period"""
+        if self.quantum and self.rate and self.busy_us:
+            return 100.0 * self.busy_us / (self.quantum * 1e6 / self.rate)
+        return 100.0 * self.busy_ratio
+
+    @classmethod
+    def from_pw_top(cls, output: str) -> Dict[int, "NodeStats"]:
+        """Parse last iteration of `pw-top -b` output, by node id"""
+        stats: Dict[int, NodeStats] = {}
+        columns: Dict[str, int] = {}
+        driver = None
+        for line in output.split("\n"):
+            fields = line.split()
+            if "ERR" in fields and fields[0] == "S":
+                # New iteration, the first one has no timings yet
+                columns = {name: i for i, name in enumerate(fields)}
+                stats = {}
+                continue
+            if not columns or len(fields) <= columns["ERR"] + 1:
+                continue
+            try:
+                node = cls(
+                    int(fields[columns["ID"]]),
+                    fields[-1],
+                    int(fields[columns["QUANT"]]),
+                    int(fields[columns["RATE"]]),
+                    _duration_us(fields[columns["BUSY"]]),
+                    _number(fields[columns["B/Q"]]),
+                    int(fields[columns["ERR"]]),
+                )
+            except (KeyError, ValueError):
+                continue
+            if fields[-2] != "+":
+                driver = node
+            elif driver and not node.quantum:
+                # Followers run in the cycle of the driver listed above them
+                node.quantum, node.rate = driver.quantum, driver.rate
+            stats[node.id] = node
+        return stats
+
+
+def _duration_us(text: str) -> float:
+    """Microseconds of pw-top duration like 19.8us, 0 for ---"""
+    match = re.fullmatch(r"([\d.]+)(ns|us|ms|s)", text)
+    if not match:
+        return 0.0
+    return float(match.group(1)) * DURATION_UNITS_US[match.group(2)]
+
+
+def _number(text: str) -> float:
+    """Float of pw-top column, 0 for ---"""
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
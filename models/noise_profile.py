@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class NoiseProfile:
+    """Named attenuation preset served by its own filter chain"""
+
+    name: str
+    attenuation: float = 100.0
@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from models.filter_chain_config import INPUT_NODE, OUTPUT_NODE, PROFILE_OUTPUT_NODE
+
+# Sources the monitor loopback plays from
+MONITOR_SOURCES = (OUTPUT_NODE, PROFILE_OUTPUT_NODE)
+
+
+@dataclass(frozen=True)
+class Route:
+    """Loopback from source into sink"""
+
+    source: str
+    sink: str
+    latency_ms: int
+
+    @property
+    def is_monitor(self) -> bool:
+        return self.source in MONITOR_SOURCES
+
+
+@dataclass
+class RoutingState:
+    """Desired routing: sources feeding filter chains and the monitor"""
+
+    # Source device name -> input node of its chain
+    routes: Dict[str, str] = field(default_factory=dict)
+    # Sink the shared chain output is played on, None when monitor is off
+    monitor_sink: Optional[str] = None
+
+
+def is_managed(source: str, sink: str) -> bool:
+    """Whether loopback belongs to DeepFilter routing"""
+    return (
+        sink == INPUT_NODE
+        or sink.startswith(f"{INPUT_NODE}.")
+        or source in MONITOR_SOURCES
+    )
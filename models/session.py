@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+from models.filter_chain_config import INPUT_NODE, is_profile_node
+
+
+@dataclass
+class Session:
+    """Microphone routed into a DeepFilter chain"""
+
+    device_name: str
+    sink: str
+    loopback_id: str
+
+    @property
+    def dedicated(self) -> bool:
+        """Whether microphone has its own filter chain"""
+        return self.sink != INPUT_NODE and not is_profile_node(self.sink)
+
+    @property
+    def profiled(self) -> bool:
+        """Whether microphone is switched to a noise profile chain"""
+        return is_profile_node(self.sink)
@@ -1,5 +1,10 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict
+
+from models.latency_profile import LatencyProfile
+from models.noise_profile import NoiseProfile
+from system.daemon_client import default_socket_path
 
 
 @dataclass
@@ -11,3 +16,53 @@ class Settings:
         "~/.config/pipewire/pipewire.conf.d/99-deepfilter.conf"
     )
     ladspa_path: str = os.path.expanduser("~/.ladspa/libdeep_filter_ladspa.so")
+    # Devices with a dedicated filter chain, mapped to their attenuation
+    sessions: Dict[str, float] = field(default_factory=dict)
+    # Channels of dedicated chains, matched to their device
+    device_channels: Dict[str, int] = field(default_factory=dict)
+    loopback_latency_ms: int = 20
+    monitor_latency_ms: int = 1
+    # Quantum of the shared chain, 0 keeps PipeWire default
+    quantum: int = 0
+    # Tuned or manually set latency per device
+    device_latency: Dict[str, LatencyProfile] = field(default_factory=dict)
+    latency_path: str = os.path.expanduser("~/.config/deepfilter_ui/latency.json")
+    # Probe measurements, one JSON object per line
+    measurements_path: str = os.path.expanduser(
+        "~/.config/deepfilter_ui/latency_measurements.jsonl"
+    )
+    # Named presets, each kept running in its own chain
+    profiles: Dict[str, NoiseProfile] = field(default_factory=dict)
+    # Device name -> profile the device is switched to
+    active_profiles: Dict[str, str] = field(default_factory=dict)
+    # Suspend chains of profiles no microphone is switched to
+    suspend_unused_profiles: bool = False
+    profiles_path: str = os.path.expanduser("~/.config/deepfilter_ui/profiles.json")
+    # Last known devices, connections and attenuation, shown on launch
+    state_path: str = os.path.expanduser("~/.cache/deepfilter_ui/state.json")
+    # "config": chains come from the config file, changes restart PipeWire
+    # "runtime": chains are loaded at runtime, config file kept for next login
+    # "runtime-only": chains are loaded at runtime, no config file
+    chain_loading: str = field(
+        default_factory=lambda: os.environ.get("DEEPFILTER_CHAINS", "config")
+    )
+    # Chains loaded at runtime, with pid of their host process
+    chains_path: str = os.path.expanduser("~/.config/deepfilter_ui/chains.json")
+    # Unix socket of the control daemon
+    control_socket: str = field(default_factory=default_socket_path)
+    # DSP load in percent of the cycle that raises an alert
+    dsp_alert_percent: float = field(
+        default_factory=lambda: float(os.environ.get("DEEPFILTER_DSP_ALERT", "80"))
+    )
+    # Silence gate: microphone level below which frames count as silent
+    gate_threshold_db: float = -45.0
+    # Silence before the chain is bypassed
+    gate_hold_ms: int = 1500
+    # Longest time from speech onset until the chain is used again
+    gate_attack_ms: int = 30
+
+    def latency_for(self, device_name: str) -> LatencyProfile:
+        """Get latency profile of device, defaults if not tuned"""
+        return self.device_latency.get(
+            device_name, LatencyProfile(self.loopback_latency_ms, self.quantum)
+        )
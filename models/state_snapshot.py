@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from models.audio_device import AudioDevice
+from models.session import Session
+
+
+@dataclass
+class StateSnapshot:
+    """Last known devices, connections and attenuation, for warm start"""
+
+    devices: List[AudioDevice] = field(default_factory=list)
+    sessions: List[Session] = field(default_factory=list)
+    noise_attenuation: float = 100.0
+    # Attenuation of dedicated chains by device
+    device_attenuation: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StateSnapshot":
+        return cls(
+            [AudioDevice(**device) for device in data.get("devices", [])],
+            [Session(**session) for session in data.get("sessions", [])],
+            float(data.get("noise_attenuation", 100.0)),
+            {
+                device: float(value)
+                for device, value in data.get("device_attenuation", {}).items()
+            },
+        )
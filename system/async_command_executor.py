@@ -0,0 +1,54 @@
+import asyncio
+from typing import Awaitable, List, Optional, Sequence
+
+from .command_executor import CommandResult
+from .metrics import command_name, metrics
+
+
+class AsyncCommandExecutor:
+    """Execute commands with asyncio, without a shell"""
+
+    @staticmethod
+    async def run(argv: Sequence[str], timeout: Optional[float] = 10) -> CommandResult:
+        """Execute command and return result, killing it on timeout"""
+        if not metrics.enabled:
+            return await AsyncCommandExecutor._run(argv, timeout)
+
+        with metrics.span(f"exec {command_name(list(argv))}") as span:
+            result = await AsyncCommandExecutor._run(argv, timeout)
+            span.exit_code = result.returncode
+            span.bytes = len(result.stdout)
+            return result
+
+    @staticmethod
+    async def _run(argv: Sequence[str], timeout: Optional[float]) -> CommandResult:
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except Exception as e:
+            return CommandResult("", str(e), 1)
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            return CommandResult("", "Command timed out", 1)
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+
+        return CommandResult(
+            stdout.decode(errors="replace"),
+            stderr.decode(errors="replace"),
+            process.returncode,
+        )
+
+    @staticmethod
+    async def gather(*commands: Awaitable[CommandResult]) -> List[CommandResult]:
+        """Run independent commands concurrently"""
+        return list(await asyncio.gather(*commands))
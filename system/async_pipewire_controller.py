@@ -0,0 +1,136 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .async_command_executor import AsyncCommandExecutor
+from .command_executor import CommandResult
+from .pipewire_controller import (
+    READY_INITIAL_DELAY,
+    READY_MAX_DELAY,
+    PipeWireController,
+)
+from .pulse_client import PulseClient
+
+
+class AsyncPipeWireController:
+    """Control PipeWire/PulseAudio with asyncio"""
+
+    def __init__(self, timeout: float = 10):
+        self.executor = AsyncCommandExecutor()
+        self.timeout = timeout
+
+    async def _run(self, *argv: str, timeout: Optional[float] = None) -> CommandResult:
+        return await self.executor.run(argv, timeout or self.timeout)
+
+    async def list_sources(self, timeout: Optional[float] = None) -> CommandResult:
+        """Get list of audio sources"""
+        return await self._run("pactl", "list", "sources", timeout=timeout)
+
+    async def list_modules(self, timeout: Optional[float] = None) -> CommandResult:
+        """Get list of loaded modules"""
+        return await self._run("pactl", "list", "modules", "short", timeout=timeout)
+
+    async def dump_graph(self, timeout: Optional[float] = None) -> CommandResult:
+        """Get JSON snapshot of the whole PipeWire graph"""
+        return await self._run("pw-dump", timeout=timeout)
+
+    async def load_loopback(
+        self,
+        source: str,
+        sink: str,
+        latency_ms: int = 20,
+        timeout: Optional[float] = None,
+    ) -> CommandResult:
+        """Load loopback module"""
+        return await self._run(
+            "pactl",
+            "load-module",
+            "module-loopback",
+            f"source={source}",
+            f"sink={sink}",
+            f"latency_msec={latency_ms}",
+            timeout=timeout,
+        )
+
+    async def unload_module(
+        self, module_id: str, timeout: Optional[float] = None
+    ) -> CommandResult:
+        """Unload module"""
+        return await self._run("pactl", "unload-module", module_id, timeout=timeout)
+
+    async def get_default_sink(self, timeout: Optional[float] = None) -> CommandResult:
+        """Get default sink"""
+        return await self._run("pactl", "get-default-sink", timeout=timeout)
+
+    async def get_node_id(
+        self, node_name: str, timeout: Optional[float] = None
+    ) -> Optional[str]:
+        """Get PipeWire object id of node by node.name"""
+        result = await self._run("pw-cli", "ls", "Node", timeout=timeout)
+        if not result.success:
+            return None
+        return PipeWireController.parse_node_id(result.stdout, node_name)
+
+    async def get_node_ids(
+        self, node_names: List[str], timeout: Optional[float] = None
+    ) -> Dict[str, str]:
+        """Get PipeWire object ids of several nodes with one query"""
+        result = await self._run("pw-cli", "ls", "Node", timeout=timeout)
+        if not result.success:
+            return {}
+
+        node_ids = {}
+        for name in node_names:
+            node_id = PipeWireController.parse_node_id(result.stdout, name)
+            if node_id:
+                node_ids[name] = node_id
+        return node_ids
+
+    async def set_node_control(
+        self, node_id: str, control: str, value: float, timeout: Optional[float] = None
+    ) -> CommandResult:
+        """Set filter-chain control on running node"""
+        params = f'{{ params = [ "{control}" {value} ] }}'
+        return await self._run(
+            "pw-cli", "set-param", node_id, "Props", params, timeout=timeout
+        )
+
+    async def restart_pipewire(self, timeout: Optional[float] = None) -> CommandResult:
+        """Restart PipeWire service"""
+        result = await self._run(
+            "systemctl",
+            "--user",
+            "restart",
+            "pipewire",
+            "pipewire-pulse",
+            "wireplumber",
+            timeout=timeout,
+        )
+        return result
+
+    async def wait_until_ready(
+        self, node_names: List[str], timeout: float = 10.0
+    ) -> Tuple[bool, float]:
+        """Wait for pipewire-pulse socket and nodes, return (ready, seconds waited)"""
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        deadline = start + timeout
+        delay = READY_INITIAL_DELAY
+
+        while True:
+            remaining = deadline - time.monotonic()
+            socket_ready = await loop.run_in_executor(None, PulseClient.probe)
+            if socket_ready:
+                result = await self._run(
+                    "pw-cli", "ls", "Node", timeout=max(remaining, 0.1)
+                )
+                if result.success and PipeWireController.has_nodes(
+                    result.stdout, node_names
+                ):
+                    return True, time.monotonic() - start
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, time.monotonic() - start
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, READY_MAX_DELAY)
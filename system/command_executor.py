@@ -1,6 +1,9 @@
+import shlex
 import subprocess
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Tuple
+
+from .metrics import command_name, metrics
 
 
 @dataclass
@@ -22,6 +25,17 @@ class CommandExecutor:
     @staticmethod
     def run(cmd: str, timeout: int = 10) -> CommandResult:
         """Execute command and return result"""
+        if not metrics.enabled:
+            return CommandExecutor._run(cmd, timeout)
+
+        with metrics.span(f"exec {command_name(cmd.split())}") as span:
+            result = CommandExecutor._run(cmd, timeout)
+            span.exit_code = result.returncode
+            span.bytes = len(result.stdout)
+            return result
+
+    @staticmethod
+    def _run(cmd: str, timeout: int) -> CommandResult:
         try:
             result = subprocess.run(
                 cmd, shell=True, capture_output=True, text=True, timeout=timeout
@@ -31,3 +45,45 @@ class CommandExecutor:
             return CommandResult("", "Command timed out", 1)
         except Exception as e:
             return CommandResult("", str(e), 1)
+
+    @staticmethod
+    def spawn(cmd: str) -> subprocess.Popen:
+        """Start long-running command with line-buffered stdout"""
+        return subprocess.Popen(
+            shlex.split(cmd),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+
+    @staticmethod
+    def spawn_raw(argv: List[str]) -> subprocess.Popen:
+        """Start long-running command with unbuffered binary stdout"""
+        return subprocess.Popen(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+        )
+
+    @staticmethod
+    def spawn_raw_writer(argv: List[str]) -> subprocess.Popen:
+        """Start long-running command fed with binary stdin"""
+        return subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    @staticmethod
+    def spawn_detached(argv: List[str]) -> subprocess.Popen:
+        """Start long-running command in own session, it outlives this process"""
+        return subprocess.Popen(
+            argv,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
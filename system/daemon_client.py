@@ -0,0 +1,178 @@
+import os
+import socket
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+# Call timeout meaning the client's own, None waits as long as the call runs
+DEFAULT_TIMEOUT: Any = object()
+
+
+class DaemonError(Exception):
+    """Error reply or broken connection to the control daemon"""
+
+    def __init__(self, message: str, code: int = SERVER_ERROR):
+        super().__init__(message)
+        self.code = code
+
+
+def default_socket_path() -> str:
+    """Unix socket of the control daemon in the user's runtime directory"""
+    return os.path.join(
+        os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/deepfilter_ui-{os.getuid()}",
+        "deepfilter_ui",
+        "control.sock",
+    )
+
+
+def running_daemon() -> Optional[str]:
+    """Socket of the running daemon, None if none or DEEPFILTER_DAEMON=0"""
+    if os.environ.get("DEEPFILTER_DAEMON") == "0":
+        return None
+    socket_path = default_socket_path()
+    if os.path.exists(socket_path) and DaemonClient.probe(socket_path):
+        return socket_path
+    return None
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    """One JSON-RPC message per line"""
+    import json
+
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class DaemonClient:
+    """JSON-RPC client for the control daemon's Unix socket
+
+    One connection serves calls in order. Notifications the daemon sends
+    while a call runs, e.g. progress, go to the call's callback.
+    """
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = 10.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def probe(socket_path: str, timeout: float = 0.5) -> bool:
+        """Check that a daemon accepts connections"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+            return True
+        except OSError:
+            return False
+        finally:
+            sock.close()
+
+    def connect(self):
+        if self._sock:
+            return
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise DaemonError(f"Daemon not reachable at {self.socket_path}: {e}")
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+    def close(self):
+        if self._sock:
+            self._reader.close()
+            self._sock.close()
+            self._sock = None
+            self._reader = None
+
+    def _read(self) -> Dict[str, Any]:
+        import json
+
+        try:
+            line = self._reader.readline()
+        except OSError as e:
+            self.close()
+            raise DaemonError(f"Daemon connection error: {e}")
+        if not line:
+            self.close()
+            raise DaemonError("Daemon closed the connection")
+        return json.loads(line)
+
+    def call(
+        self,
+        method: str,
+        notify: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        **params,
+    ) -> Any:
+        """Call method and return its result, raise DaemonError on error
+
+        Calls that may restart PipeWire pass timeout None, the daemon's
+        restart and ready wait can outlast the default.
+        """
+        with self._lock:
+            self.connect()
+            self._id += 1
+            request_id = self._id
+            self._sock.settimeout(
+                self.timeout if timeout is DEFAULT_TIMEOUT else timeout
+            )
+            try:
+                self._sock.sendall(
+                    encode(
+                        {
+                            "jsonrpc": "2.0",
+                            "id": request_id,
+                            "method": method,
+                            "params": params,
+                        }
+                    )
+                )
+            except OSError as e:
+                self.close()
+                raise DaemonError(f"Daemon connection error: {e}")
+
+            while True:
+                message = self._read()
+                if "id" not in message:
+                    if notify:
+                        notify(message.get("method", ""), message.get("params") or {})
+                    continue
+                if message["id"] != request_id:
+                    continue
+                error = message.get("error")
+                if error:
+                    raise DaemonError(
+                        error.get("message", "Unknown error"),
+                        error.get("code", SERVER_ERROR),
+                    )
+                return message.get("result")
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]) -> threading.Thread:
+        """Receive status notifications on this connection until it closes"""
+        self.call("subscribe")
+
+        def read_notifications():
+            # Subscribed connections get no further replies, only status
+            self._sock.settimeout(None)
+            while True:
+                try:
+                    message = self._read()
+                except (DaemonError, ValueError) as e:
+                    print(f"Daemon subscription ended: {e}")
+                    return
+                if message.get("method") == "status":
+                    callback(message.get("params") or {})
+
+        thread = threading.Thread(target=read_notifications, daemon=True)
+        thread.start()
+        return thread
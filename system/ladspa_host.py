@@ -0,0 +1,229 @@
+import ctypes
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Port descriptor bits
+PORT_INPUT = 0x1
+PORT_OUTPUT = 0x2
+PORT_CONTROL = 0x4
+PORT_AUDIO = 0x8
+
+# Range hint bits
+HINT_BOUNDED_BELOW = 0x1
+HINT_BOUNDED_ABOVE = 0x2
+HINT_SAMPLE_RATE = 0x8
+HINT_LOGARITHMIC = 0x10
+HINT_DEFAULT_MASK = 0x3C0
+HINT_DEFAULT_MINIMUM = 0x40
+HINT_DEFAULT_LOW = 0x80
+HINT_DEFAULT_MIDDLE = 0xC0
+HINT_DEFAULT_HIGH = 0x100
+HINT_DEFAULT_MAXIMUM = 0x140
+HINT_DEFAULT_FIXED = {0x200: 0.0, 0x240: 1.0, 0x280: 100.0, 0x2C0: 440.0}
+
+Handle = ctypes.c_void_p
+DataPointer = ctypes.POINTER(ctypes.c_float)
+
+
+class PortRangeHint(ctypes.Structure):
+    _fields_ = [
+        ("HintDescriptor", ctypes.c_int),
+        ("LowerBound", ctypes.c_float),
+        ("UpperBound", ctypes.c_float),
+    ]
+
+
+class Descriptor(ctypes.Structure):
+    """LADSPA_Descriptor from ladspa.h"""
+
+
+Descriptor._fields_ = [
+    ("UniqueID", ctypes.c_ulong),
+    ("Label", ctypes.c_char_p),
+    ("Properties", ctypes.c_int),
+    ("Name", ctypes.c_char_p),
+    ("Maker", ctypes.c_char_p),
+    ("Copyright", ctypes.c_char_p),
+    ("PortCount", ctypes.c_ulong),
+    ("PortDescriptors", ctypes.POINTER(ctypes.c_int)),
+    ("PortNames", ctypes.POINTER(ctypes.c_char_p)),
+    ("PortRangeHints", ctypes.POINTER(PortRangeHint)),
+    ("ImplementationData", ctypes.c_void_p),
+    (
+        "instantiate",
+        ctypes.CFUNCTYPE(Handle, ctypes.POINTER(Descriptor), ctypes.c_ulong),
+    ),
+    ("connect_port", ctypes.CFUNCTYPE(None, Handle, ctypes.c_ulong, DataPointer)),
+    ("activate", ctypes.CFUNCTYPE(None, Handle)),
+    ("run", ctypes.CFUNCTYPE(None, Handle, ctypes.c_ulong)),
+    ("run_adding", ctypes.CFUNCTYPE(None, Handle, ctypes.c_ulong)),
+    ("set_run_adding_gain", ctypes.CFUNCTYPE(None, Handle, ctypes.c_float)),
+    ("deactivate", ctypes.CFUNCTYPE(None, Handle)),
+    ("cleanup", ctypes.CFUNCTYPE(None, Handle)),
+]
+
+
+class LadspaError(Exception):
+    """Plugin could not be loaded or instantiated"""
+
+
+@dataclass
+class Port:
+    """Port of LADSPA plugin"""
+
+    index: int
+    name: str
+    descriptor: int
+    hint: int
+    lower: float
+    upper: float
+
+    @property
+    def is_input(self) -> bool:
+        return bool(self.descriptor & PORT_INPUT)
+
+    @property
+    def is_audio(self) -> bool:
+        return bool(self.descriptor & PORT_AUDIO)
+
+    @property
+    def is_control(self) -> bool:
+        return bool(self.descriptor & PORT_CONTROL)
+
+    def default(self, rate: int) -> float:
+        """Default value from range hints"""
+        lower, upper = self.lower, self.upper
+        if self.hint & HINT_SAMPLE_RATE:
+            lower, upper = lower * rate, upper * rate
+
+        default = self.hint & HINT_DEFAULT_MASK
+        if default in HINT_DEFAULT_FIXED:
+            return HINT_DEFAULT_FIXED[default]
+        if default == HINT_DEFAULT_MINIMUM:
+            return lower
+        if default == HINT_DEFAULT_MAXIMUM:
+            return upper
+
+        weight = {
+            HINT_DEFAULT_LOW: 0.25,
+            HINT_DEFAULT_MIDDLE: 0.5,
+            HINT_DEFAULT_HIGH: 0.75,
+        }.get(default)
+        if weight is None:
+            return lower if self.hint & HINT_BOUNDED_BELOW else 0.0
+        if self.hint & HINT_LOGARITHMIC and lower > 0 and upper > 0:
+            return math.exp(math.log(lower) * (1 - weight) + math.log(upper) * weight)
+        return lower * (1 - weight) + upper * weight
+
+
+class LadspaPlugin:
+    """Plugin descriptor loaded from LADSPA shared library"""
+
+    def __init__(self, path: str, label: str):
+        try:
+            self._library = ctypes.CDLL(path)
+        except OSError as e:
+            raise LadspaError(f"Cannot load {path}: {e}")
+
+        get_descriptor = self._library.ladspa_descriptor
+        get_descriptor.restype = ctypes.POINTER(Descriptor)
+        get_descriptor.argtypes = [ctypes.c_ulong]
+
+        index = 0
+        labels = []
+        while True:
+            pointer = get_descriptor(index)
+            if not pointer:
+                raise LadspaError(
+                    f"No plugin {label!r} in {path}, found {', '.join(labels)}"
+                )
+            if pointer.contents.Label.decode() == label:
+                break
+            labels.append(pointer.contents.Label.decode())
+            index += 1
+
+        self._pointer = pointer
+        self.descriptor = pointer.contents
+        self.label = label
+        self.ports = [
+            Port(
+                i,
+                self.descriptor.PortNames[i].decode(),
+                self.descriptor.PortDescriptors[i],
+                self.descriptor.PortRangeHints[i].HintDescriptor,
+                self.descriptor.PortRangeHints[i].LowerBound,
+                self.descriptor.PortRangeHints[i].UpperBound,
+            )
+            for i in range(self.descriptor.PortCount)
+        ]
+
+    @property
+    def audio_inputs(self) -> List[Port]:
+        return [p for p in self.ports if p.is_audio and p.is_input]
+
+    @property
+    def audio_outputs(self) -> List[Port]:
+        return [p for p in self.ports if p.is_audio and not p.is_input]
+
+    @property
+    def controls(self) -> List[Port]:
+        return [p for p in self.ports if p.is_control and p.is_input]
+
+    def instantiate(
+        self, rate: int, controls: Optional[Dict[str, float]] = None
+    ) -> "LadspaInstance":
+        return LadspaInstance(self, rate, controls or {})
+
+
+class LadspaInstance:
+    """Running plugin instance with its control values"""
+
+    def __init__(self, plugin: LadspaPlugin, rate: int, controls: Dict[str, float]):
+        self.plugin = plugin
+        descriptor = plugin.descriptor
+        self.handle = descriptor.instantiate(plugin._pointer, rate)
+        if not self.handle:
+            raise LadspaError(f"{plugin.label} rejected sample rate {rate}")
+
+        unknown = set(controls) - {port.name for port in plugin.controls}
+        if unknown:
+            raise LadspaError(f"Unknown controls: {', '.join(sorted(unknown))}")
+
+        # Control values must stay alive while connected
+        self.control_values: Dict[str, ctypes.c_float] = {}
+        for port in plugin.ports:
+            if not port.is_control:
+                continue
+            value = ctypes.c_float(controls.get(port.name, port.default(rate)))
+            self.control_values[port.name] = value
+            descriptor.connect_port(
+                self.handle, port.index, ctypes.cast(ctypes.byref(value), DataPointer)
+            )
+
+        if descriptor.activate:
+            descriptor.activate(self.handle)
+
+    def set_control(self, name: str, value: float):
+        self.control_values[name].value = value
+
+    def connect(self, port: Port, buffer: DataPointer):
+        """Point audio port at buffer of at least the run size"""
+        self.plugin.descriptor.connect_port(self.handle, port.index, buffer)
+
+    def run(self, frames: int):
+        self.plugin.descriptor.run(self.handle, frames)
+
+    def close(self):
+        descriptor = self.plugin.descriptor
+        if self.handle:
+            if descriptor.deactivate:
+                descriptor.deactivate(self.handle)
+            descriptor.cleanup(self.handle)
+            self.handle = None
+
+    def __enter__(self) -> "LadspaInstance":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
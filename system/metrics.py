@@ -0,0 +1,272 @@
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+CO_COROUTINE = 0x80
+
+# Latency bucket upper bounds in milliseconds
+BUCKETS_MS = [0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+PROMETHEUS_INTERVAL = 1.0
+
+
+class Histogram:
+    """Latency histogram with fixed buckets"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+        self.bytes = 0
+
+    def observe(self, latency_ms: float, exit_code: int, nbytes: int):
+        index = 0
+        while index < len(BUCKETS_MS) and latency_ms > BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        self.bytes += nbytes
+        if exit_code != 0:
+            self.errors += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate quantile as upper bound of bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "sum_ms": round(self.total_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "buckets": dict(zip([str(b) for b in BUCKETS_MS] + ["+Inf"], self.counts)),
+        }
+
+
+class Span:
+    """Timing of single operation"""
+
+    __slots__ = ("name", "start", "exit_code", "bytes")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.exit_code = 0
+        self.bytes = 0
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.exit_code = 1
+        metrics.record(
+            self.name,
+            (time.perf_counter() - self.start) * 1000,
+            self.exit_code,
+            self.bytes,
+        )
+
+
+class _NullSpan:
+    """Span used when metrics are disabled"""
+
+    __slots__ = ()
+    exit_code = 0
+    bytes = 0
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def __setattr__(self, name, value):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Metrics:
+    """In-memory latency histograms of PipeWire operations"""
+
+    def __init__(self):
+        self.enabled = os.environ.get("DEEPFILTER_METRICS", "") not in ("", "0")
+        self.prometheus_path: Optional[str] = os.environ.get("DEEPFILTER_METRICS_PROM")
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        # Samples recorded so far, the exporter writes when this changes
+        self._samples = 0
+        self._exporter: Optional[threading.Thread] = None
+        self._export_lock = threading.Lock()
+
+    def span(self, name: str):
+        """Start timing span, no-op when disabled"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(name)
+
+    def record(self, name: str, latency_ms: float, exit_code: int, nbytes: int):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(latency_ms, exit_code, nbytes)
+            self._samples += 1
+            if self.prometheus_path and self._exporter is None:
+                self._exporter = threading.Thread(target=self._export, daemon=True)
+                self._exporter.start()
+
+    def _export(self):
+        """Write the Prometheus file off the callers' threads, once per interval"""
+        import atexit
+
+        written = 0
+
+        def flush():
+            # Samples of the last interval before exit
+            if self._samples != written:
+                self._write_export()
+
+        atexit.register(flush)
+        while True:
+            samples = self._samples
+            if samples != written:
+                self._write_export()
+                written = samples
+            time.sleep(PROMETHEUS_INTERVAL)
+
+    def _write_export(self):
+        if self.prometheus_path:
+            self.write_prometheus(self.prometheus_path)
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: h.to_dict() for name, h in sorted(self.histograms.items())}
+
+    def to_json(self) -> str:
+        import json
+
+        return json.dumps(self.snapshot(), indent=2)
+
+    def dump_json(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            f.write(self.to_json())
+
+    def to_prometheus(self) -> str:
+        """Render histograms in Prometheus text format"""
+        lines: List[str] = [
+            "# HELP deepfilter_operation_latency_ms Latency of PipeWire operations",
+            "# TYPE deepfilter_operation_latency_ms histogram",
+        ]
+        errors: List[str] = []
+        nbytes: List[str] = []
+        for name, data in self.snapshot().items():
+            label = f'operation="{name}"'
+            cumulative = 0
+            for bucket, count in data["buckets"].items():
+                cumulative += count
+                lines.append(
+                    f'deepfilter_operation_latency_ms_bucket{{{label},le="{bucket}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(
+                f"deepfilter_operation_latency_ms_sum{{{label}}} {data['sum_ms']}"
+            )
+            lines.append(
+                f"deepfilter_operation_latency_ms_count{{{label}}} {data['count']}"
+            )
+            errors.append(
+                f"deepfilter_operation_errors_total{{{label}}} {data['errors']}"
+            )
+            nbytes.append(
+                f"deepfilter_operation_bytes_total{{{label}}} {data['bytes']}"
+            )
+
+        lines += ["# TYPE deepfilter_operation_errors_total counter"] + errors
+        lines += ["# TYPE deepfilter_operation_bytes_total counter"] + nbytes
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write Prometheus text file atomically for node_exporter textfile collector"""
+        tmp_path = f"{path}.tmp"
+        with self._export_lock:
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write(self.to_prometheus())
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Metrics export error: {e}")
+
+
+metrics = Metrics()
+
+
+def timed(name: str) -> Callable:
+    """Record latency of function; exit code and bytes come from its result"""
+
+    def decorator(func: Callable) -> Callable:
+        # Same check as inspect.iscoroutinefunction, without importing inspect
+        if func.__code__.co_flags & CO_COROUTINE:
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not metrics.enabled:
+                    return await func(*args, **kwargs)
+                with Span(name) as span:
+                    result = await func(*args, **kwargs)
+                    _describe(span, result)
+                    return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            with Span(name) as span:
+                result = func(*args, **kwargs)
+                _describe(span, result)
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def command_name(argv: List[str]) -> str:
+    """Short operation name of command, e.g. `pactl list sources`"""
+    return " ".join(arg for arg in argv[:3] if "=" not in arg and not arg.isdigit())
+
+
+def _describe(span: Span, result: Any):
+    """Fill exit code and bytes from CommandResult or (success, message) tuple"""
+    if hasattr(result, "returncode"):
+        span.exit_code = result.returncode
+        span.bytes = len(result.stdout)
+    elif isinstance(result, tuple) and result and isinstance(result[0], bool):
+        span.exit_code = 0 if result[0] else 1
+    elif result is False:
+        span.exit_code = 1
@@ -1,42 +1,402 @@
+import os
+import re
+import shlex
+import subprocess
 import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 from .command_executor import CommandExecutor, CommandResult
+from .metrics import timed
+
+if TYPE_CHECKING:
+    from .pulse_client import PulseClient
+
+BACKEND_SUBPROCESS = "subprocess"
+BACKEND_NATIVE = "native"
+READY_INITIAL_DELAY = 0.05
+READY_MAX_DELAY = 1.0
+FILTER_CHAIN_MODULE = "libpipewire-module-filter-chain"
 
 
 class PipeWireController:
     """Control PipeWire/PulseAudio"""
 
-    def __init__(self):
+    def __init__(self, backend: Optional[str] = None):
         self.executor = CommandExecutor()
+        self.pulse: Optional["PulseClient"] = None
+        self.backend = BACKEND_SUBPROCESS
+        self.set_backend(
+            backend or os.environ.get("DEEPFILTER_BACKEND", BACKEND_SUBPROCESS)
+        )
+
+    def set_backend(self, backend: str, socket_path: Optional[str] = None):
+        """Select pactl subprocess or native protocol backend"""
+        if self.pulse:
+            self.pulse.close()
+            self.pulse = None
+
+        self.backend = backend
+        if backend == BACKEND_NATIVE:
+            from .pulse_client import PulseClient
+
+            self.pulse = PulseClient(socket_path)
+
+    def _native(
+        self, request: Callable[["PulseClient"], str]
+    ) -> Optional[CommandResult]:
+        """Run request over native protocol, None means use subprocess"""
+        if not self.pulse:
+            return None
+
+        from .pulse_client import PulseError
 
+        try:
+            if not self.pulse.connected:
+                self.pulse.connect()
+            return CommandResult(request(self.pulse), "", 0)
+        except PulseError as e:
+            return CommandResult("", str(e), 1)
+        except OSError as e:
+            print(f"Native backend unavailable, using pactl: {e}")
+            return None
+
+    @timed("pipewire.list_sources")
     def list_sources(self) -> CommandResult:
         """Get list of audio sources"""
+        result = self._native(
+            lambda pulse: "".join(map(self._source_text, pulse.list_sources()))
+        )
+        if result:
+            return result
+        return self.executor.run("pactl list sources")
+
+    @timed("pipewire.get_source")
+    def get_source(self, index: str) -> CommandResult:
+        """Get source by pulse index, pactl lists all sources"""
+        result = self._native(
+            lambda pulse: self._source_text(pulse.get_source(int(index)))
+        )
+        if result:
+            return result
         return self.executor.run("pactl list sources")
 
+    @staticmethod
+    def _source_text(source: Tuple[int, str, str, int, int]) -> str:
+        """Source in `pactl list sources` format"""
+        index, name, description, rate, channels = source
+        return (
+            f"Source #{index}\n\tName: {name}\n\tDescription: {description}\n"
+            f"\tSample Specification: {channels}ch {rate}Hz\n"
+        )
+
+    @timed("pipewire.list_modules")
     def list_modules(self) -> CommandResult:
         """Get list of loaded modules"""
+        result = self._native(
+            lambda pulse: "".join(
+                f"{index}\t{name}\t{argument}\t\n"
+                for index, name, argument in pulse.list_modules()
+            )
+        )
+        if result:
+            return result
         return self.executor.run("pactl list modules short")
 
+    @timed("pipewire.get_module")
+    def get_module(self, index: str) -> CommandResult:
+        """Get module by pulse index, pactl lists all modules"""
+        result = self._native(
+            lambda pulse: "{}\t{}\t{}\t\n".format(*pulse.get_module(int(index)))
+        )
+        if result:
+            return result
+        return self.executor.run("pactl list modules short")
+
+    @timed("pipewire.load_loopback")
     def load_loopback(
         self, source: str, sink: str, latency_ms: int = 20
     ) -> CommandResult:
         """Load loopback module"""
+        argument = f"source={source} sink={sink} latency_msec={latency_ms}"
+        result = self._native(
+            lambda pulse: str(pulse.load_module("module-loopback", argument))
+        )
+        if result:
+            return result
         cmd = f"pactl load-module module-loopback source={source} sink={sink} latency_msec={latency_ms}"
         return self.executor.run(cmd)
 
+    @timed("pipewire.load_null_sink")
+    def load_null_sink(self, name: str, description: str) -> CommandResult:
+        """Load sink that discards its input"""
+        argument = (
+            f"sink_name={name} sink_properties='device.description=\"{description}\"'"
+        )
+        result = self._native(
+            lambda pulse: str(pulse.load_module("module-null-sink", argument))
+        )
+        if result:
+            return result
+        return self.executor.run(
+            f"pactl load-module module-null-sink {shlex.quote(argument)}"
+        )
+
+    @timed("pipewire.unload_module")
     def unload_module(self, module_id: str) -> CommandResult:
         """Unload module"""
+        result = self._native(lambda pulse: pulse.unload_module(int(module_id)) or "")
+        if result:
+            return result
         return self.executor.run(f"pactl unload-module {module_id}")
 
+    @timed("pipewire.move_sink_input")
+    def move_sink_input(self, stream_id: str, sink: str) -> CommandResult:
+        """Move playback stream, e.g. of a loopback, to another sink"""
+        result = self._native(
+            lambda pulse: pulse.move_sink_input(int(stream_id), sink) or ""
+        )
+        if result:
+            return result
+        return self.executor.run(
+            f"pactl move-sink-input {stream_id} {shlex.quote(sink)}"
+        )
+
+    @timed("pipewire.suspend_sink")
+    def suspend_sink(self, sink: str, suspend: bool = True) -> CommandResult:
+        """Suspend sink so its graph stops processing, or resume it"""
+        result = self._native(lambda pulse: pulse.suspend_sink(sink, suspend) or "")
+        if result:
+            return result
+        return self.executor.run(
+            f"pactl suspend-sink {shlex.quote(sink)} {1 if suspend else 0}"
+        )
+
+    @timed("pipewire.get_default_sink")
     def get_default_sink(self) -> CommandResult:
         """Get default sink"""
+        result = self._native(lambda pulse: pulse.get_default_sink() or "")
+        if result:
+            return result
         return self.executor.run("pactl get-default-sink")
 
+    @timed("pipewire.dump_graph")
+    def dump_graph(self) -> CommandResult:
+        """Get JSON snapshot of the whole PipeWire graph"""
+        return self.executor.run("pw-dump")
+
+    def subscribe(self) -> subprocess.Popen:
+        """Start pactl event subscription"""
+        return self.executor.spawn("pactl subscribe")
+
+    def record(
+        self, target: str, rate: int, channels: int = 1, monitor: bool = False
+    ) -> subprocess.Popen:
+        """Start raw float32 capture of node to stdout, of sink input if monitor"""
+        import shutil
+
+        if shutil.which("parec"):
+            argv = [
+                "parec",
+                f"--device={target}.monitor" if monitor else f"--device={target}",
+                "--format=float32le",
+                f"--rate={rate}",
+                f"--channels={channels}",
+                "--latency-msec=20",
+                "--raw",
+            ]
+        else:
+            argv = [
+                "pw-record",
+                f"--target={target}",
+                "--format=f32",
+                f"--rate={rate}",
+                f"--channels={channels}",
+            ]
+            if monitor:
+                argv += ["-P", "{ stream.capture.sink = true }"]
+            argv.append("-")
+        return self.executor.spawn_raw(argv)
+
+    def play(self, target: str, rate: int, channels: int = 1) -> subprocess.Popen:
+        """Start raw float32 playback from stdin into sink"""
+        import shutil
+
+        if shutil.which("pacat"):
+            argv = [
+                "pacat",
+                "--playback",
+                f"--device={target}",
+                "--format=float32le",
+                f"--rate={rate}",
+                f"--channels={channels}",
+                "--latency-msec=20",
+                "--raw",
+            ]
+        else:
+            argv = [
+                "pw-play",
+                f"--target={target}",
+                "--format=f32",
+                f"--rate={rate}",
+                f"--channels={channels}",
+                "-",
+            ]
+        return self.executor.spawn_raw_writer(argv)
+
+    @timed("pipewire.load_filter_chain")
+    def load_filter_chain(self, args: str) -> subprocess.Popen:
+        """Load filter-chain module hosted by pw-cli, unloaded when it exits"""
+        return self.executor.spawn_detached(
+            ["pw-cli", "-m", "load-module", FILTER_CHAIN_MODULE, args]
+        )
+
+    @timed("pipewire.create_adapter_node")
+    def create_adapter_node(self, props: str) -> subprocess.Popen:
+        """Create adapter node hosted by pw-cli, destroyed when it exits"""
+        return self.executor.spawn_detached(
+            ["pw-cli", "-m", "create-node", "adapter", props]
+        )
+
+    @timed("pipewire.list_filter_chains")
+    def list_filter_chains(self) -> Dict[str, str]:
+        """Get args of loaded filter-chain modules by module id"""
+        import json
+
+        result = self.dump_graph()
+        if not result.success:
+            return {}
+        try:
+            objects = json.loads(result.stdout)
+        except ValueError:
+            return {}
+
+        modules = {}
+        for obj in objects:
+            info = obj.get("info") or {}
+            if (
+                obj.get("type") == "PipeWire:Interface:Module"
+                and info.get("name") == FILTER_CHAIN_MODULE
+            ):
+                modules[str(obj["id"])] = info.get("args") or ""
+        return modules
+
+    @timed("pipewire.destroy_object")
+    def destroy_object(self, object_id: str) -> CommandResult:
+        """Destroy PipeWire object, a module is unloaded with its nodes"""
+        return self.executor.run(f"pw-cli destroy {object_id}")
+
+    @timed("pipewire.get_node_id")
+    def get_node_id(self, node_name: str) -> Optional[str]:
+        """Get PipeWire object id of node by node.name"""
+        result = self.executor.run("pw-cli ls Node")
+        if not result.success:
+            return None
+        return self.parse_node_id(result.stdout, node_name)
+
+    @timed("pipewire.get_node_ids")
+    def get_node_ids(self, node_names: List[str]) -> Dict[str, str]:
+        """Get PipeWire object ids of several nodes with one query"""
+        result = self.executor.run("pw-cli ls Node")
+        if not result.success:
+            return {}
+
+        node_ids = {}
+        for name in node_names:
+            node_id = self.parse_node_id(result.stdout, name)
+            if node_id:
+                node_ids[name] = node_id
+        return node_ids
+
+    @staticmethod
+    def parse_node_id(output: str, node_name: str) -> Optional[str]:
+        """Find node id in `pw-cli ls Node` output"""
+        node_id = None
+        for line in output.split("\n"):
+            id_match = re.match(r"\s*id (\d+),", line)
+            if id_match:
+                node_id = id_match.group(1)
+                continue
+
+            name_match = re.search(r'node\.name = "(.+)"', line)
+            if name_match and name_match.group(1) == node_name:
+                return node_id
+        return None
+
+    @timed("pipewire.set_node_control")
+    def set_node_control(
+        self, node_id: str, control: str, value: float
+    ) -> CommandResult:
+        """Set filter-chain control on running node"""
+        params = f'{{ params = [ "{control}" {value} ] }}'
+        return self.executor.run(
+            f"pw-cli set-param {node_id} Props {shlex.quote(params)}"
+        )
+
+    @timed("pipewire.set_force_quantum")
+    def set_force_quantum(self, quantum: int) -> CommandResult:
+        """Force graph quantum at runtime, 0 restores the default"""
+        return self.executor.run(
+            f"pw-metadata -n settings 0 clock.force-quantum {int(quantum)}"
+        )
+
+    def get_node_errors(self) -> Optional[Dict[str, int]]:
+        """Get xrun/error counter of every node from `pw-top`, None on failure"""
+        from models.node_stats import NodeStats
+
+        result = self.top()
+        if not result.success:
+            return None
+        errors: Dict[str, int] = {}
+        for node in NodeStats.from_pw_top(result.stdout).values():
+            errors[node.name] = errors.get(node.name, 0) + node.errors
+        return errors
+
+    @timed("pipewire.top")
+    def top(self) -> CommandResult:
+        """Get two iterations of `pw-top` node timings"""
+        return self.executor.run("pw-top -b -n 2", timeout=10)
+
+    @timed("pipewire.restart_pipewire")
     def restart_pipewire(self) -> CommandResult:
         """Restart PipeWire service"""
         result = self.executor.run(
             "systemctl --user restart pipewire pipewire-pulse wireplumber"
         )
-        if result.success:
-            time.sleep(3)
+        if result.success and self.pulse:
+            self.pulse.close()
         return result
+
+    @timed("pipewire.wait_until_ready")
+    def wait_until_ready(
+        self, node_names: List[str], timeout: float = 10.0
+    ) -> Tuple[bool, float]:
+        """Wait for pipewire-pulse socket and nodes, return (ready, seconds waited)"""
+        start = time.monotonic()
+        deadline = start + timeout
+        delay = READY_INITIAL_DELAY
+
+        while True:
+            if self.is_ready(node_names):
+                return True, time.monotonic() - start
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, time.monotonic() - start
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, READY_MAX_DELAY)
+
+    def is_ready(self, node_names: List[str]) -> bool:
+        """Check that pipewire-pulse is up and all nodes exist"""
+        from .pulse_client import PulseClient
+
+        socket_path = self.pulse.socket_path if self.pulse else None
+        if not PulseClient.probe(socket_path):
+            return False
+
+        result = self.executor.run("pw-cli ls Node")
+        return result.success and self.has_nodes(result.stdout, node_names)
+
+    @classmethod
+    def has_nodes(cls, output: str, node_names: List[str]) -> bool:
+        """Check `pw-cli ls Node` output for all node names"""
+        return all(cls.parse_node_id(output, name) for name in node_names)
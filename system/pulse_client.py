@@ -0,0 +1,408 @@
+import os
+import socket
+import struct
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+PROTOCOL_VERSION = 32
+PROTOCOL_VERSION_MASK = 0x0000FFFF
+COMMAND_CHANNEL = 0xFFFFFFFF
+DESCRIPTOR_SIZE = 20
+COOKIE_SIZE = 256
+
+# Commands
+COMMAND_ERROR = 0
+COMMAND_REPLY = 2
+COMMAND_AUTH = 8
+COMMAND_SET_CLIENT_NAME = 9
+COMMAND_GET_SERVER_INFO = 20
+COMMAND_GET_SOURCE_INFO = 23
+COMMAND_GET_SOURCE_INFO_LIST = 24
+COMMAND_GET_MODULE_INFO = 25
+COMMAND_GET_MODULE_INFO_LIST = 26
+COMMAND_LOAD_MODULE = 51
+COMMAND_UNLOAD_MODULE = 52
+COMMAND_MOVE_SINK_INPUT = 67
+COMMAND_SUSPEND_SINK = 70
+INVALID_INDEX = 0xFFFFFFFF
+
+# Tags
+TAG_STRING = b"t"
+TAG_STRING_NULL = b"N"
+TAG_U32 = b"L"
+TAG_U8 = b"B"
+TAG_U64 = b"R"
+TAG_S64 = b"r"
+TAG_SAMPLE_SPEC = b"a"
+TAG_ARBITRARY = b"x"
+TAG_BOOLEAN_TRUE = b"1"
+TAG_BOOLEAN_FALSE = b"0"
+TAG_TIMEVAL = b"T"
+TAG_USEC = b"U"
+TAG_CHANNEL_MAP = b"m"
+TAG_CVOLUME = b"v"
+TAG_PROPLIST = b"P"
+TAG_VOLUME = b"V"
+TAG_FORMAT_INFO = b"f"
+
+
+class PulseError(Exception):
+    """Error from PulseAudio native protocol"""
+
+
+class TagWriter:
+    """Build PulseAudio tagstruct"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def u32(self, value: int) -> "TagWriter":
+        self.data += TAG_U32 + struct.pack(">I", value)
+        return self
+
+    def string(self, value: Optional[str]) -> "TagWriter":
+        if value is None:
+            self.data += TAG_STRING_NULL
+        else:
+            self.data += TAG_STRING + value.encode() + b"\0"
+        return self
+
+    def boolean(self, value: bool) -> "TagWriter":
+        self.data += TAG_BOOLEAN_TRUE if value else TAG_BOOLEAN_FALSE
+        return self
+
+    def arbitrary(self, value: bytes) -> "TagWriter":
+        self.data += TAG_ARBITRARY + struct.pack(">I", len(value)) + value
+        return self
+
+    def proplist(self, props: Dict[str, str]) -> "TagWriter":
+        self.data += TAG_PROPLIST
+        for key, value in props.items():
+            raw = value.encode() + b"\0"
+            self.string(key).u32(len(raw)).arbitrary(raw)
+        self.string(None)
+        return self
+
+
+class TagReader:
+    """Parse PulseAudio tagstruct"""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def eof(self) -> bool:
+        return self.pos >= len(self.data)
+
+    def _take(self, size: int) -> bytes:
+        if self.pos + size > len(self.data):
+            raise PulseError("Truncated tagstruct")
+        chunk = self.data[self.pos : self.pos + size]
+        self.pos += size
+        return chunk
+
+    def _tag(self) -> bytes:
+        return self._take(1)
+
+    def _expect(self, *tags: bytes) -> bytes:
+        tag = self._tag()
+        if tag not in tags:
+            raise PulseError(f"Unexpected tag {tag!r}, expected {tags!r}")
+        return tag
+
+    def u32(self) -> int:
+        self._expect(TAG_U32)
+        return struct.unpack(">I", self._take(4))[0]
+
+    def string(self) -> Optional[str]:
+        if self._expect(TAG_STRING, TAG_STRING_NULL) == TAG_STRING_NULL:
+            return None
+        end = self.data.index(b"\0", self.pos)
+        value = self.data[self.pos : end].decode(errors="replace")
+        self.pos = end + 1
+        return value
+
+    def proplist(self) -> Dict[str, str]:
+        self._expect(TAG_PROPLIST)
+        props = {}
+        while True:
+            key = self.string()
+            if key is None:
+                return props
+            self.u32()
+            props[key] = self.value().rstrip(b"\0").decode(errors="replace")
+
+    def value(self) -> Any:
+        """Read next value of any type"""
+        tag = self.data[self.pos : self.pos + 1]
+        if tag in (TAG_STRING, TAG_STRING_NULL):
+            return self.string()
+        if tag == TAG_PROPLIST:
+            return self.proplist()
+
+        self.pos += 1
+        if tag in (TAG_U32, TAG_VOLUME):
+            return struct.unpack(">I", self._take(4))[0]
+        if tag == TAG_U8:
+            return self._take(1)[0]
+        if tag in (TAG_U64, TAG_USEC):
+            return struct.unpack(">Q", self._take(8))[0]
+        if tag == TAG_S64:
+            return struct.unpack(">q", self._take(8))[0]
+        if tag == TAG_BOOLEAN_TRUE:
+            return True
+        if tag == TAG_BOOLEAN_FALSE:
+            return False
+        if tag == TAG_SAMPLE_SPEC:
+            return struct.unpack(">BBI", self._take(6))
+        if tag == TAG_TIMEVAL:
+            return struct.unpack(">II", self._take(8))
+        if tag == TAG_ARBITRARY:
+            size = struct.unpack(">I", self._take(4))[0]
+            return self._take(size)
+        if tag == TAG_CHANNEL_MAP:
+            return tuple(self._take(self._take(1)[0]))
+        if tag == TAG_CVOLUME:
+            channels = self._take(1)[0]
+            return struct.unpack(f">{channels}I", self._take(channels * 4))
+        if tag == TAG_FORMAT_INFO:
+            return self.value(), self.proplist()
+        raise PulseError(f"Unknown tag {tag!r}")
+
+    def skip(self, count: int = 1):
+        for _ in range(count):
+            self.value()
+
+
+class PulseClient:
+    """Persistent client for the pipewire-pulse native protocol socket"""
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 5.0):
+        self.socket_path = socket_path or self.default_socket_path()
+        self.timeout = timeout
+        self.version = PROTOCOL_VERSION
+        self._sock: Optional[socket.socket] = None
+        self._tag = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_socket_path() -> str:
+        """Get socket path the same way libpulse does"""
+        server = os.environ.get("PULSE_SERVER", "")
+        if server.startswith("unix:"):
+            return server[len("unix:") :]
+        runtime_dir = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+        return os.path.join(runtime_dir, "pulse", "native")
+
+    @staticmethod
+    def _read_cookie() -> bytes:
+        for path in (
+            os.environ.get("PULSE_COOKIE", ""),
+            os.path.expanduser("~/.config/pulse/cookie"),
+            os.path.expanduser("~/.pulse-cookie"),
+        ):
+            if path and os.path.isfile(path):
+                with open(path, "rb") as f:
+                    cookie = f.read(COOKIE_SIZE)
+                if len(cookie) == COOKIE_SIZE:
+                    return cookie
+        # pipewire-pulse does not check the cookie
+        return bytes(COOKIE_SIZE)
+
+    @staticmethod
+    def probe(socket_path: Optional[str] = None, timeout: float = 0.5) -> bool:
+        """Check that server socket accepts connections"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path or PulseClient.default_socket_path())
+            return True
+        except OSError:
+            return False
+        finally:
+            sock.close()
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def connect(self):
+        """Connect, authenticate and register client name"""
+        with self._lock:
+            if self._sock:
+                return
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+
+        try:
+            reply = self.request(
+                COMMAND_AUTH,
+                TagWriter().u32(PROTOCOL_VERSION).arbitrary(self._read_cookie()),
+            )
+            server_version = reply.u32() & PROTOCOL_VERSION_MASK
+            self.version = min(PROTOCOL_VERSION, server_version)
+            self.request(
+                COMMAND_SET_CLIENT_NAME,
+                TagWriter().proplist({"application.name": "DeepFilter UI"}),
+            )
+        except (OSError, PulseError):
+            self.close()
+            raise
+
+    def close(self):
+        """Close connection"""
+        with self._lock:
+            if self._sock:
+                self._sock.close()
+                self._sock = None
+
+    def request(self, command: int, payload: Optional[TagWriter] = None) -> TagReader:
+        """Send command and wait for its reply"""
+        with self._lock:
+            if not self._sock:
+                raise PulseError("Not connected")
+
+            self._tag = (self._tag + 1) & 0xFFFFFFFF
+            tag = self._tag
+            body = TagWriter().u32(command).u32(tag).data
+            if payload:
+                body += payload.data
+
+            try:
+                self._sock.sendall(self._descriptor(len(body)) + bytes(body))
+                while True:
+                    reader = TagReader(self._read_packet())
+                    reply_command = reader.u32()
+                    reply_tag = reader.u32()
+                    if reply_tag != tag:
+                        # Unsolicited packet, not for us
+                        continue
+                    if reply_command == COMMAND_ERROR:
+                        raise PulseError(f"Server error {reader.u32()}")
+                    if reply_command != COMMAND_REPLY:
+                        raise PulseError(f"Unexpected reply command {reply_command}")
+                    return reader
+            except OSError:
+                self._sock.close()
+                self._sock = None
+                raise
+
+    @staticmethod
+    def _descriptor(length: int) -> bytes:
+        return struct.pack(">IIIII", length, COMMAND_CHANNEL, 0, 0, 0)
+
+    def _recv_exact(self, size: int) -> bytes:
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Connection closed by server")
+            data += chunk
+        return bytes(data)
+
+    def _read_packet(self) -> bytes:
+        while True:
+            length, channel, _, _, _ = struct.unpack(
+                ">IIIII", self._recv_exact(DESCRIPTOR_SIZE)
+            )
+            payload = self._recv_exact(length)
+            if channel == COMMAND_CHANNEL:
+                return payload
+
+    def load_module(self, name: str, argument: str) -> int:
+        """Load module and return its index"""
+        reply = self.request(
+            COMMAND_LOAD_MODULE, TagWriter().string(name).string(argument)
+        )
+        return reply.u32()
+
+    def unload_module(self, index: int):
+        """Unload module by index"""
+        self.request(COMMAND_UNLOAD_MODULE, TagWriter().u32(index))
+
+    def move_sink_input(self, index: int, sink: str):
+        """Move playback stream to sink given by name"""
+        self.request(
+            COMMAND_MOVE_SINK_INPUT,
+            TagWriter().u32(index).u32(INVALID_INDEX).string(sink),
+        )
+
+    def suspend_sink(self, sink: str, suspend: bool):
+        """Suspend or resume sink given by name"""
+        self.request(
+            COMMAND_SUSPEND_SINK,
+            TagWriter().u32(INVALID_INDEX).string(sink).boolean(suspend),
+        )
+
+    def get_default_sink(self) -> Optional[str]:
+        """Get default sink name"""
+        reply = self.request(COMMAND_GET_SERVER_INFO)
+        reply.skip(4)  # package name/version, user name, host name
+        reply.skip()  # sample spec
+        return reply.string()
+
+    def list_modules(self) -> List[Tuple[int, str, str]]:
+        """Get (index, name, argument) of loaded modules"""
+        reply = self.request(COMMAND_GET_MODULE_INFO_LIST)
+        modules = []
+        while not reply.eof():
+            modules.append(self._read_module(reply))
+        return modules
+
+    def get_module(self, index: int) -> Tuple[int, str, str]:
+        """Get (index, name, argument) of module by index"""
+        return self._read_module(
+            self.request(COMMAND_GET_MODULE_INFO, TagWriter().u32(index))
+        )
+
+    @staticmethod
+    def _read_module(reply: TagReader) -> Tuple[int, str, str]:
+        index = reply.u32()
+        name = reply.string() or ""
+        argument = reply.string() or ""
+        reply.skip(2)  # n_used, proplist
+        return index, name, argument
+
+    def list_sources(self) -> List[Tuple[int, str, str, int, int]]:
+        """Get (index, name, description, rate, channels) of sources"""
+        reply = self.request(COMMAND_GET_SOURCE_INFO_LIST)
+        sources = []
+        while not reply.eof():
+            sources.append(self._read_source(reply))
+        return sources
+
+    def get_source(self, index: int) -> Tuple[int, str, str, int, int]:
+        """Get (index, name, description, rate, channels) of source by index"""
+        return self._read_source(
+            self.request(COMMAND_GET_SOURCE_INFO, TagWriter().u32(index).string(None))
+        )
+
+    def _read_source(self, reply: TagReader) -> Tuple[int, str, str, int, int]:
+        index = reply.u32()
+        name = reply.string() or ""
+        description = reply.string() or ""
+        _, channels, rate = reply.value()  # sample spec
+        # channel map, owner module, volume, mute, monitor of sink,
+        # monitor name, latency, driver, flags, proplist,
+        # configured latency, base volume, state, volume steps, card
+        reply.skip(15)
+        n_ports = reply.u32()
+        for _ in range(n_ports):
+            # name, description, priority, available,
+            # availability group, type
+            reply.skip(3)
+            if self.version >= 24:
+                reply.skip()
+            if self.version >= 34:
+                reply.skip(2)
+        reply.skip()  # active port
+        if self.version >= 22:
+            n_formats = reply.value()
+            reply.skip(n_formats)
+        return index, name, description, rate, channels
@@ -0,0 +1,45 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from benchmarks.batch import build_passthrough, write_signal
+from core.batch_processor import output_path_for, process_file
+from models.batch_job import BatchJob
+
+
+@pytest.fixture(scope="module")
+def passthrough(tmp_path_factory):
+    if not shutil.which(os.environ.get("CC", "cc")):
+        pytest.skip("no C compiler for the pass-through plugin")
+    directory = tmp_path_factory.mktemp("ladspa")
+    try:
+        return build_passthrough(str(directory))
+    except subprocess.CalledProcessError:
+        pytest.skip("pass-through plugin does not build")
+
+
+@pytest.mark.parametrize("channels", [1, 2])
+def test_passthrough_reproduces_input(tmp_path, passthrough, channels):
+    path = os.path.join(tmp_path, "talk.wav")
+    write_signal(path, 0.5, channels)
+    # Block size not dividing the file exercises the short last block
+    job = BatchJob(path, output_path_for(path), passthrough, block_size=1000)
+    result = process_file(job)
+
+    assert result.success, result.error
+    assert result.frames == 24000
+    with open(path, "rb") as a, open(result.output_path, "rb") as b:
+        assert a.read() == b.read()
+
+
+def test_missing_plugin_is_reported(tmp_path):
+    path = os.path.join(tmp_path, "talk.wav")
+    write_signal(path, 0.1)
+    result = process_file(BatchJob(path, output_path_for(path), "/nonexistent.so"))
+
+    assert not result.success
+    assert not os.path.exists(result.output_path)
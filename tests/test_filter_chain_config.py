@@ -0,0 +1,58 @@
+from models.filter_chain_config import (
+    STEREO_LABEL,
+    FilterChainConfig,
+    chain_id_for,
+    diff_chains,
+)
+
+PLUGIN = "/usr/lib/ladspa/libdeep_filter_ladspa.so"
+MIC = "alsa_input.usb-mic"
+
+
+def config(**kwargs) -> FilterChainConfig:
+    return FilterChainConfig(
+        PLUGIN, controls={"Attenuation Limit (dB)": 100.0}, **kwargs
+    )
+
+
+def test_identical_chains_have_no_changes():
+    diff = diff_chains([config(), config(device=MIC)], [config(device=MIC), config()])
+
+    assert diff.empty
+    assert not diff.controls_only
+    assert diff.changed_chains == set()
+
+
+def test_control_change_is_live():
+    new = config()
+    new.controls["Attenuation Limit (dB)"] = 30.0
+    diff = diff_chains([new], [config()])
+
+    assert diff.changes == {"control:Attenuation Limit (dB)": (100.0, 30.0)}
+    assert diff.controls_only
+    assert diff.changed_chains == {""}
+    assert diff.structural_chains == set()
+
+
+def test_format_change_needs_reload_of_that_chain_only():
+    chain_id = chain_id_for(MIC)
+    new_dedicated = config(device=MIC, label=STEREO_LABEL, channels=2)
+    new_shared = config()
+    new_shared.controls["Attenuation Limit (dB)"] = 30.0
+    diff = diff_chains([new_shared, new_dedicated], [config(), config(device=MIC)])
+
+    assert diff.changes[f"{chain_id}/channels"] == (1, 2)
+    assert not diff.controls_only
+    assert diff.changed_chains == {"", chain_id}
+    assert diff.structural_chains == {chain_id}
+
+
+def test_added_and_removed_chains():
+    profile = config(profile="meeting")
+    diff = diff_chains([config(), profile], [config(), config(device=MIC)])
+
+    assert diff.changes == {
+        f"chain/{chain_id_for(MIC)}": (MIC, None),
+        f"chain/{profile.chain_id}": (None, "meeting"),
+    }
+    assert diff.structural_chains == {chain_id_for(MIC), profile.chain_id}
@@ -0,0 +1,65 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.latency_probe import (
+    RATE,
+    chirp,
+    estimate_delays,
+    matched_filter,
+    probe_train,
+    refine_peak,
+)
+
+INTERVAL = int(0.3 * RATE)
+LEAD = int(0.5 * RATE)
+
+
+def delayed(signal: np.ndarray, frames: int) -> np.ndarray:
+    return np.concatenate([np.zeros(frames, dtype=np.float32), signal])
+
+
+def test_matched_filter_peaks_at_probe_start():
+    probe = chirp()
+    signal = delayed(probe, 1234)
+
+    assert int(np.argmax(matched_filter(signal, probe))) == 1234
+
+
+def test_refine_peak_interpolates_between_frames():
+    correlation = np.array([0.0, 1.0, 3.0, 3.0, 1.0, 0.0])
+
+    assert refine_peak(correlation, 2) == 2.5
+    assert refine_peak(correlation, 0) == 0.0
+
+
+def test_estimates_delay_of_every_probe():
+    probe = chirp()
+    reference = probe_train(probe, 5, INTERVAL, LEAD)
+    # 20 ms of processing, output capture started 100 frames before reference
+    output = delayed(reference, int(0.02 * RATE) + 100)
+    delays = estimate_delays(reference, output, probe, 100, 5, INTERVAL)
+
+    assert len(delays) == 5
+    assert np.allclose(delays, 20.0, atol=0.05)
+
+
+def test_skips_probes_lost_in_noise():
+    probe = chirp()
+    reference = probe_train(probe, 4, INTERVAL, LEAD)
+    output = delayed(reference, 480)
+    # Last two probes never reach the output
+    output[LEAD + 2 * INTERVAL :] = 0
+    noise = np.random.default_rng(0).standard_normal(len(output)) * 1e-3
+    delays = estimate_delays(
+        reference, output + noise.astype(np.float32), probe, 0, 4, INTERVAL
+    )
+
+    assert np.allclose(delays, [10.0, 10.0], atol=0.05)
+
+
+def test_silent_reference_has_no_delays():
+    probe = chirp()
+    silence = np.zeros(LEAD + INTERVAL, dtype=np.float32)
+
+    assert estimate_delays(silence, silence, probe, 0, 1, INTERVAL) == []
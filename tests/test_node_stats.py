@@ -0,0 +1,45 @@
+from models.node_stats import NodeStats
+
+HEADER = "S   ID  QUANT   RATE    WAIT    BUSY   W/Q   B/Q  ERR FORMAT           NAME"
+
+OUTPUT = "\n".join(
+    [
+        HEADER,
+        "S   30      0      0     ---     ---   ---   ---    0                  Dummy-Driver",
+        HEADER,
+        "R   42   1024  48000  10.7us   2.1ms  0.00  0.10    3   F32P 1 48000 alsa_input.usb-mic",
+        "R   57      0      0  12.0us 5333.3us  0.02  0.25    5    F32P 1 48000  + effect_input.deep_filter",
+        "S   60      0      0     ---     ---   ---   ---    0                  effect_output.deep_filter",
+        "",
+    ]
+)
+
+
+def test_parses_last_iteration():
+    stats = NodeStats.from_pw_top(OUTPUT)
+
+    assert set(stats) == {42, 57, 60}
+    assert stats[42].name == "alsa_input.usb-mic"
+    assert stats[42].busy_us == 2100.0
+    assert stats[42].errors == 3
+
+
+def test_followers_run_in_driver_cycle():
+    follower = NodeStats.from_pw_top(OUTPUT)[57]
+
+    assert follower.name == "effect_input.deep_filter"
+    assert (follower.quantum, follower.rate) == (1024, 48000)
+    # 5333.3 us of a 1024 frame cycle at 48 kHz
+    assert round(follower.load_percent, 1) == 25.0
+
+
+def test_load_falls_back_to_busy_ratio():
+    idle = NodeStats.from_pw_top(OUTPUT)[60]
+
+    assert idle.busy_us == 0.0
+    assert idle.load_percent == 0.0
+    assert NodeStats(1, "n", 0, 0, 0.0, 0.25, 0).load_percent == 25.0
+
+
+def test_ignores_output_without_header():
+    assert NodeStats.from_pw_top("R 42 1024 48000 1us 1us 0 0 0 F32P x") == {}
@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from benchmarks.fake_pulse_server import FakePulseServer
+from benchmarks.fake_tools import generate_state, serial
+from system.pulse_client import PulseClient, PulseError, TagReader, TagWriter
+
+
+def test_tagstruct_round_trip():
+    writer = TagWriter().u32(7).string("name").string(None).boolean(True)
+    writer.arbitrary(b"\x00\x01").proplist({"application.name": "DeepFilter UI"})
+    reader = TagReader(bytes(writer.data))
+
+    assert reader.u32() == 7
+    assert reader.string() == "name"
+    assert reader.string() is None
+    assert reader.value() is True
+    assert reader.value() == b"\x00\x01"
+    assert reader.proplist() == {"application.name": "DeepFilter UI"}
+    assert reader.eof()
+
+
+def test_tag_mismatch_and_truncation_raise():
+    with pytest.raises(PulseError):
+        TagReader(bytes(TagWriter().string("x").data)).u32()
+    with pytest.raises(PulseError):
+        TagReader(bytes(TagWriter().u32(1).data[:3])).u32()
+
+
+@pytest.fixture
+def state():
+    return generate_state(3, 2)
+
+
+def serve(tmp_path, state, version):
+    server = FakePulseServer(os.path.join(tmp_path, "native"), state, version)
+    server.start()
+    client = PulseClient(server.socket_path)
+    client.connect()
+    return server, client
+
+
+@pytest.mark.parametrize("version", [21, 22, 24, 32, 35])
+def test_sources_parse_in_every_layout(tmp_path, state, version):
+    server, client = serve(tmp_path, state, version)
+    try:
+        assert client.version == min(version, 32)
+        sources = client.list_sources()
+        assert [(index, name) for index, name, _, _, _ in sources] == [
+            (serial(node_id), name) for node_id, name, _ in state["sources"]
+        ]
+        assert sources[0][3:] == (48000, 1)
+        assert client.get_source(sources[1][0]) == sources[1]
+    finally:
+        client.close()
+        server.stop()
+
+
+def test_modules_load_and_unload(tmp_path, state):
+    server, client = serve(tmp_path, state, 32)
+    try:
+        index = client.load_module("module-null-sink", "sink_name=test")
+        assert client.get_module(index) == (index, "module-null-sink", "sink_name=test")
+        assert (index, "module-null-sink", "sink_name=test") in client.list_modules()
+
+        client.unload_module(index)
+        with pytest.raises(PulseError):
+            client.get_module(index)
+        assert client.get_default_sink() == state["default_sink"]
+    finally:
+        client.close()
+        server.stop()
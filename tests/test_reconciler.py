@@ -0,0 +1,73 @@
+from core.reconciler import plan
+from models.filter_chain_config import INPUT_NODE, OUTPUT_NODE
+from models.module_info import ModuleInfo
+from models.routing_state import Route
+
+MIC = "alsa_input.usb-mic"
+SPEAKERS = "alsa_output.speakers"
+
+
+def loopback(module_id, source, sink, latency=None):
+    args = {"source": source, "sink": sink}
+    if latency is not None:
+        args["latency_msec"] = str(latency)
+    return ModuleInfo(module_id, "module-loopback", args)
+
+
+def test_loads_missing_routes():
+    route = Route(MIC, INPUT_NODE, 20)
+    result = plan([route], [])
+
+    assert result.load == [route]
+    assert not result.keep and not result.unload
+
+
+def test_keeps_matching_loopback():
+    route = Route(MIC, INPUT_NODE, 20)
+    result = plan([route], [loopback("7", MIC, INPUT_NODE, 20)])
+
+    assert result.keep == {route: "7"}
+    assert result.empty
+
+
+def test_unloads_loopbacks_not_desired():
+    modules = [
+        loopback("3", MIC, INPUT_NODE),
+        loopback("4", OUTPUT_NODE, SPEAKERS),
+    ]
+    result = plan([], modules)
+
+    assert result.unload == {"3": "not desired", "4": "not desired"}
+
+
+def test_reloads_on_sink_or_latency_change():
+    routes = [
+        Route(MIC, f"{INPUT_NODE}.abcd1234", 20),
+        Route(OUTPUT_NODE, SPEAKERS, 30),
+    ]
+    modules = [
+        loopback("3", MIC, INPUT_NODE, 20),
+        loopback("4", OUTPUT_NODE, SPEAKERS, 50),
+    ]
+    result = plan(routes, modules)
+
+    assert result.unload == {"3": "not desired", "4": "latency changed"}
+    assert result.load == routes
+
+
+def test_keeps_lowest_id_of_duplicates():
+    route = Route(MIC, INPUT_NODE, 20)
+    modules = [loopback("12", MIC, INPUT_NODE, 20), loopback("9", MIC, INPUT_NODE)]
+    result = plan([route], modules)
+
+    assert result.keep == {route: "9"}
+    assert result.unload == {"12": "duplicate"}
+    assert result.load == []
+
+
+def test_ignores_unmanaged_modules():
+    modules = [
+        loopback("5", MIC, SPEAKERS),
+        ModuleInfo("6", "module-null-sink", {"sink_name": INPUT_NODE}),
+    ]
+    assert plan([], modules).empty
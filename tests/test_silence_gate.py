@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from core.silence_gate import EnergyDetector, block_power
+
+BLOCK = 160
+
+
+def blocks(*levels: float) -> np.ndarray:
+    """Constant blocks of the given amplitudes"""
+    return np.repeat(np.array(levels, dtype=np.float32), BLOCK)
+
+
+def test_block_power_drops_partial_block():
+    samples = np.concatenate([blocks(0.5, 0.1), np.ones(10, dtype=np.float32)])
+
+    assert np.allclose(block_power(samples, BLOCK), [0.25, 0.01])
+
+
+def test_threshold_in_db_of_mean_square():
+    # -20 dB is a mean square of 0.01, amplitude 0.1
+    detector = EnergyDetector(-20.0, hold_ms=10)
+
+    assert detector.block_size == BLOCK
+    assert detector.update(blocks(0.11))
+    assert not detector.update(blocks(0.09))
+
+
+def test_speech_is_held_after_last_loud_block():
+    detector = EnergyDetector(-20.0, hold_ms=50)
+
+    # Loud block followed by three quiet ones within one read
+    assert detector.update(blocks(0.5, 0.0, 0.0, 0.0))
+    assert detector.update(blocks(0.0))
+    assert not detector.update(blocks(0.0))
+    assert not detector.update(blocks(0.0, 0.0))
+
+
+def test_loud_block_resets_hold():
+    detector = EnergyDetector(-20.0, hold_ms=30)
+
+    assert not detector.update(blocks(0.0, 0.0, 0.0))
+    assert detector.update(blocks(0.0, 0.5))
+    assert detector.update(blocks(0.0, 0.0))
+    assert not detector.update(blocks(0.0))
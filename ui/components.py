@@ -0,0 +1,99 @@
+import flet as ft
+
+METER_FLOOR_DB = -90.0
+SPECTRUM_HEIGHT = 60
+SPARKLINE_HEIGHT = 40
+
+
+class LevelMeterView:
+    """RMS bar, level text and optional spectrum of one signal"""
+
+    def __init__(self, label: str):
+        self.bar = ft.ProgressBar(value=0, width=300, color=ft.Colors.GREEN_400)
+        self.level_text = ft.Text("—", size=12, color=ft.Colors.GREY_400)
+        self.spectrum_row = ft.Row(
+            [],
+            spacing=2,
+            height=SPECTRUM_HEIGHT,
+            vertical_alignment=ft.CrossAxisAlignment.END,
+            visible=False,
+        )
+        self.control = ft.Column(
+            [
+                ft.Text(label, size=13, color=ft.Colors.BLUE_200),
+                ft.Row([self.bar, self.level_text]),
+                self.spectrum_row,
+            ],
+            spacing=4,
+        )
+
+    def _scale(self, db: float) -> float:
+        return min(1.0, max(0.0, (db - METER_FLOOR_DB) / -METER_FLOOR_DB))
+
+    def set_spectrum_visible(self, visible: bool):
+        self.spectrum_row.visible = visible
+
+    def show(self, reading):
+        """Show LevelReading, caller schedules update of control"""
+        self.bar.value = self._scale(reading.rms_db)
+        self.bar.color = (
+            ft.Colors.RED_400 if reading.peak_db > -1 else ft.Colors.GREEN_400
+        )
+        self.level_text.value = (
+            f"RMS {reading.rms_db:.0f} dB, peak {reading.peak_db:.0f} dB"
+        )
+
+        if reading.spectrum is not None:
+            bands = self.spectrum_row.controls
+            if len(bands) != len(reading.spectrum):
+                # Built once, then only heights change
+                bands[:] = [
+                    ft.Container(width=6, height=1, bgcolor=ft.Colors.BLUE_400)
+                    for _ in reading.spectrum
+                ]
+            for band, db in zip(bands, reading.spectrum):
+                band.height = max(1, self._scale(db) * SPECTRUM_HEIGHT)
+
+    def reset(self):
+        self.bar.value = 0
+        self.level_text.value = "—"
+        self.spectrum_row.controls.clear()
+
+
+class SparklineView:
+    """Bar sparkline of recent DSP load of one node"""
+
+    def __init__(self, label: str, alert_percent: float):
+        self.alert_percent = alert_percent
+        self.bars = ft.Row(
+            [],
+            spacing=1,
+            height=SPARKLINE_HEIGHT,
+            vertical_alignment=ft.CrossAxisAlignment.END,
+        )
+        self.summary_text = ft.Text("—", size=12, color=ft.Colors.GREY_400)
+        self.control = ft.Column(
+            [
+                ft.Text(label, size=13, color=ft.Colors.BLUE_200),
+                self.bars,
+                self.summary_text,
+            ],
+            spacing=4,
+        )
+
+    def show(self, series):
+        """Show DspSeries, caller schedules update of control"""
+        values = list(series.load)
+        bars = self.bars.controls
+        while len(bars) < len(values):
+            bars.append(ft.Container(width=4, height=1))
+        # Load is mostly a few percent, so scale to the peak seen
+        ceiling = max(series.peak, 1.0)
+        for bar, value in zip(bars, values):
+            bar.height = max(1, value / ceiling * SPARKLINE_HEIGHT)
+            bar.bgcolor = (
+                ft.Colors.RED_400
+                if value >= self.alert_percent
+                else ft.Colors.GREEN_400
+            )
+        self.summary_text.value = series.summary().partition(": ")[2]
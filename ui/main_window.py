@@ -1,16 +1,40 @@
+import os
 import threading
+import time
 
 import flet as ft
-from core.connector import DeepFilterConnector
+from core.remote_connector import open_connector
+from models.filter_chain_config import PROFILE_DESCRIPTION
+from system.metrics import metrics, timed
+
+from ui.components import LevelMeterView, SparklineView
+from ui.update_scheduler import Throttle, UpdateScheduler
+
+METRICS_JSON_PATH = os.path.expanduser("~/.cache/deepfilter_ui/metrics.json")
+# Dropdown entry for the microphone's own chain
+NO_PROFILE = "No profile"
 
 
 class MainWindow:
     """Main application window"""
 
     def __init__(self, page: ft.Page):
+        self._started = time.perf_counter()
         self.page = page
-        self.connector = DeepFilterConnector()
+        self.updates = UpdateScheduler(page)
+        # Routing lives in the daemon, so it outlives the window
+        self.connector = open_connector(autostart=True)
+        # Shown until the first refresh, also seeds the attenuation slider
+        self.cached_state = self.connector.warm_start()
+        self._refreshed = False
         self.test_loopback_id = None
+        self.level_meters = []
+        self.dsp_monitor = None
+        self.dsp_views = {}
+        # Slider ticks store the value and save state, throttled to spare disk
+        # writes. Running chains get it on Apply.
+        self._set_attenuation = Throttle(self.connector.set_attenuation)
+        self.connector.device_monitor.add_listener(self._on_devices_changed)
 
         self.page.title = "DeepFilterNet Microphone Connector"
         self.page.theme_mode = ft.ThemeMode.DARK
@@ -35,7 +59,14 @@ class MainWindow:
         self.progress_bar = ft.ProgressBar(visible=False, width=400)
 
         self.devices_dropdown = ft.Dropdown(
-            label="Select microphone", options=[], width=400
+            label="Select microphone",
+            options=[],
+            width=400,
+            on_change=lambda _: self._on_device_selected(),
+        )
+
+        self.dedicated_checkbox = ft.Checkbox(
+            label="Separate filter chain", value=False
         )
 
         # Buttons
@@ -65,10 +96,28 @@ class MainWindow:
         self.refresh_btn = ft.ElevatedButton(
             text="Refresh Devices",
             icon=ft.Icons.REFRESH,
-            on_click=lambda _: self._refresh_devices(),
+            on_click=lambda _: self._on_refresh_clicked(),
             style=ft.ButtonStyle(color=ft.Colors.WHITE, bgcolor=ft.Colors.ORANGE_600),
         )
 
+        self.tune_btn = ft.ElevatedButton(
+            text="Auto-tune Latency",
+            icon=ft.Icons.SPEED,
+            on_click=lambda _: self._tune_latency(),
+            style=ft.ButtonStyle(color=ft.Colors.WHITE, bgcolor=ft.Colors.TEAL_600),
+        )
+
+        self.measure_btn = ft.ElevatedButton(
+            text="Measure Latency",
+            icon=ft.Icons.TIMER,
+            on_click=lambda _: self._measure_latency(),
+            style=ft.ButtonStyle(color=ft.Colors.WHITE, bgcolor=ft.Colors.INDIGO_600),
+        )
+        self.latency_text = ft.Text("Not measured yet", size=14)
+        self.latency_history_text = ft.Text(
+            "", size=11, font_family="monospace", selectable=True
+        )
+
         self.attenuation_value_text = ft.Text(
             f"Attenuation Limit: {self.connector.settings.noise_attenuation} dB",
             size=14,
@@ -84,8 +133,21 @@ class MainWindow:
             on_change=lambda e: self._update_attenuation(e.control.value),
         )
 
+        self.profile_dropdown = ft.Dropdown(
+            label="Noise profile",
+            options=[],
+            width=250,
+            on_change=lambda e: self._switch_profile(e.control.value),
+        )
+        self.profile_name_field = ft.TextField(label="Profile name", width=180)
+        self.save_profile_btn = ft.ElevatedButton(
+            text="Save Profile",
+            icon=ft.Icons.SAVE,
+            on_click=lambda _: self._save_profile(),
+        )
+
         self.apply_settings_btn = ft.ElevatedButton(
-            text="Apply Settings (PipeWire Restart)",
+            text="Apply Settings",
             icon=ft.Icons.SETTINGS_APPLICATIONS,
             on_click=lambda _: self._apply_settings(),
             style=ft.ButtonStyle(color=ft.Colors.WHITE, bgcolor=ft.Colors.PURPLE_600),
@@ -101,61 +163,182 @@ class MainWindow:
             border_color=ft.Colors.BLUE_GREY_400,
         )
 
+        self.mic_meter = LevelMeterView("Microphone (raw)")
+        self.output_meter = LevelMeterView("DeepFilter output")
+        self.meters_switch = ft.Switch(
+            label="Level meters",
+            value=False,
+            on_change=lambda e: self._toggle_meters(e.control.value),
+        )
+        self.dsp_switch = ft.Switch(
+            label="Sample",
+            value=False,
+            on_change=lambda e: self._toggle_dsp(e.control.value),
+        )
+        self.dsp_column = ft.Column([], spacing=8)
+        self.dsp_hint = ft.Text(
+            f"Alert above {self.connector.settings.dsp_alert_percent:g}% "
+            "of the cycle, sampled from pw-top",
+            size=11,
+            color=ft.Colors.GREY_400,
+        )
+        self.gate_switch = ft.Switch(
+            label="Bypass during silence",
+            value=False,
+            on_change=lambda e: self._toggle_gate(e.control.value),
+        )
+        self.gate_text = ft.Text("", size=11, color=ft.Colors.GREY_400)
+        self.spectrum_switch = ft.Switch(
+            label="Spectrum",
+            value=False,
+            on_change=lambda e: self._toggle_spectrum(e.control.value),
+        )
+
+        self.file_picker = ft.FilePicker(on_result=self._on_files_picked)
+        self.batch_btn = ft.ElevatedButton(
+            text="Denoise Files...",
+            icon=ft.Icons.AUDIO_FILE,
+            on_click=lambda _: self.file_picker.pick_files(
+                allow_multiple=True, allowed_extensions=["wav", "flac"]
+            ),
+        )
+        self.batch_progress = ft.ProgressBar(value=0, width=400, visible=False)
+        self.batch_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+
+        self.metrics_text = ft.Text(
+            "", size=11, font_family="monospace", selectable=True
+        )
+
     def _show_snackbar(self, message: str, color=ft.Colors.BLUE_200):
         """Show snackbar notification"""
         self.page.snack_bar = ft.SnackBar(ft.Text(message), bgcolor=color)
         self.page.snack_bar.open = True
-        self.page.update()
+        self.updates.schedule()
 
     def _update_attenuation(self, value: float):
-        """Update attenuation value"""
-        self.connector.settings.noise_attenuation = round(value, 1)
-        self.attenuation_value_text.value = (
-            f"Attenuation Limit: {self.connector.settings.noise_attenuation} dB"
-        )
-        self.page.update()
+        """Update attenuation of selected device's chain"""
+        self.updates.begin_action("attenuation")
+        device = self._selected_device()
+        value = round(value, 1)
+        self._set_attenuation(value, device.name if device else None)
+        self.attenuation_value_text.value = f"Attenuation Limit: {value} dB"
+        self.updates.schedule(self.attenuation_value_text)
+
+    def _on_refresh_clicked(self):
+        """Refresh devices on user request"""
+        self.updates.begin_action("refresh")
+        self._refresh_devices()
 
     def _refresh_devices(self):
         """Refresh device list"""
         self.progress_bar.visible = True
-        self.status_text.value = "Updating device list..."
-        self.page.update()
+        # Keep showing the cached connections during the first refresh
+        if self._refreshed or self.cached_state is None:
+            self.status_text.value = "Updating device list..."
+        self.updates.schedule()
 
         def do_refresh():
-            devices = self.connector.get_devices()
-            self.page.run_thread(lambda: self._on_devices_refreshed(devices))
+            devices, connected_source = self.connector.refresh()
+            self.connector.start_device_monitor()
+            self.connector.start_auto_reconcile()
+            self.page.run_thread(
+                lambda: self._on_devices_refreshed(devices, connected_source)
+            )
 
         threading.Thread(target=do_refresh, daemon=True).start()
 
-    def _on_devices_refreshed(self, devices):
+    def _selected_device(self):
+        """Get device selected in dropdown"""
+        if not self.devices_dropdown.value:
+            return None
+        return self.connector.device_manager.find_device_by_display(
+            self.devices_dropdown.value
+        )
+
+    def _update_buttons(self):
+        """Enable buttons for connection state of selected device"""
+        device = self._selected_device()
+        connected = bool(device and device.name in self.connector.sessions)
+        self.connect_btn.disabled = connected
+        self.disconnect_btn.disabled = not connected
+        self.test_btn.disabled = not self.connector.current_loopback_id
+        self.updates.schedule()
+
+    def _on_device_selected(self):
+        """Handle dropdown selection"""
+        self.updates.begin_action("select device")
+        self._update_buttons()
+        self._refresh_profiles()
+        if self.level_meters:
+            self._stop_meters()
+            self._start_meters()
+
+    def _update_status(self):
+        """Show connected microphones"""
+        sessions = self.connector.sessions
+        if sessions:
+            self.status_text.value = f"Connected: {', '.join(sorted(sessions))}"
+        else:
+            self.status_text.value = "Ready to connect"
+        self.status_text.color = ft.Colors.GREEN_200
+
+    def _on_devices_changed(self):
+        """Handle device or module change from monitor"""
+        devices, connected_source = self.connector.refresh()
+        self.page.run_thread(
+            lambda: self._on_devices_refreshed(devices, connected_source)
+        )
+
+    def _show_cached_state(self):
+        """Fill device list and status from the last known state"""
+        state = self.cached_state
+        devices = self.connector.device_manager.get_devices()
+        if state is None or not devices:
+            return
+        self.devices_dropdown.options = [
+            ft.dropdown.Option(device.display) for device in devices
+        ]
+        connected = sorted(session.device_name for session in state.sessions)
+        selected = next((d for d in devices if d.name in connected), devices[0])
+        self.devices_dropdown.value = selected.display
+        if connected:
+            self.status_text.value = f"Last connected: {', '.join(connected)}"
+        # Enabled once the refresh confirms the connections
+        self.connect_btn.disabled = self.disconnect_btn.disabled = True
+        self.devices_info.value = "\n".join([f"• {d.display}" for d in devices])
+
+    def _record_startup(self, name: str):
+        """Record time since the window was created"""
+        if metrics.enabled:
+            elapsed_ms = (time.perf_counter() - self._started) * 1000
+            metrics.record(name, elapsed_ms, 0, 0)
+
+    @timed("ui._on_devices_refreshed")
+    def _on_devices_refreshed(self, devices, connected_source):
         """Handle refreshed devices"""
         self.progress_bar.visible = False
+        if not self._refreshed:
+            self._refreshed = True
+            self._record_startup("ui.startup refreshed")
 
         if devices:
             self.devices_dropdown.options = [
                 ft.dropdown.Option(device.display) for device in devices
             ]
 
-            connected_source = self.connector.check_existing_connection()
-
-            if connected_source:
-                for device in devices:
-                    if device.name == connected_source:
-                        self.devices_dropdown.value = device.display
-                        self.status_text.value = f"Connected: {device.display}"
-                        self.status_text.color = ft.Colors.GREEN_200
-                        self.connect_btn.disabled = True
-                        self.disconnect_btn.disabled = False
-                        self.test_btn.disabled = False
-                        break
-            else:
-                if devices:
-                    self.devices_dropdown.value = devices[0].display
-                self.status_text.value = "Ready to connect"
-                self.status_text.color = ft.Colors.GREEN_200
-                self.connect_btn.disabled = False
-                self.disconnect_btn.disabled = True
-                self.test_btn.disabled = True
+            self._show_monitoring(self.connector.monitor_loopback_id)
+
+            selected = devices[0]
+            for device in devices:
+                if device.name == connected_source:
+                    selected = device
+                    break
+            if not self._selected_device():
+                self.devices_dropdown.value = selected.display
+
+            self._update_status()
+            self._update_buttons()
+            self._refresh_profiles()
 
             self.devices_info.value = "\n".join([f"• {d.display}" for d in devices])
         else:
@@ -163,90 +346,95 @@ class MainWindow:
             self.status_text.color = ft.Colors.RED_200
             self._show_snackbar("Failed to get device list", ft.Colors.RED_400)
 
-        self.page.update()
+        self.updates.schedule()
 
     def _connect_mic(self):
         """Connect microphone"""
+        self.updates.begin_action("connect")
         if not self.devices_dropdown.value:
             self._show_snackbar("Select microphone from list", ft.Colors.RED_400)
             return
 
-        device = self.connector.device_manager.find_device_by_display(
-            self.devices_dropdown.value
-        )
+        device = self._selected_device()
         if not device:
             self._show_snackbar("Device not found", ft.Colors.RED_400)
             return
 
+        dedicated = bool(self.dedicated_checkbox.value)
         self.progress_bar.visible = True
         self.status_text.value = "Connecting..."
-        self.page.update()
+        self.updates.schedule()
 
         def do_connect():
-            success, message = self.connector.connect_microphone(device)
+            if not dedicated and self.connector.current_loopback_id:
+                # Shared chain takes one microphone
+                self.connector.disconnect_microphone()
+            success, message = self.connector.connect_microphone(
+                device, dedicated=dedicated
+            )
             self.page.run_thread(
                 lambda: self._on_connect_complete(success, message, device)
             )
 
         threading.Thread(target=do_connect, daemon=True).start()
 
+    @timed("ui._on_connect_complete")
     def _on_connect_complete(self, success, message, device):
         """Handle connection complete"""
         self.progress_bar.visible = False
 
         if success:
-            self.status_text.value = f"Connected: {device.display}"
-            self.status_text.color = ft.Colors.GREEN_200
-            self.connect_btn.disabled = True
-            self.disconnect_btn.disabled = False
-            self.test_btn.disabled = False
+            self._update_status()
+            self._update_buttons()
             self._show_snackbar("Successfully connected", ft.Colors.GREEN_400)
         else:
             self.status_text.value = "Connection error"
             self.status_text.color = ft.Colors.RED_200
             self._show_snackbar(f"Error: {message}", ft.Colors.RED_400)
 
-        self.page.update()
+        self.updates.schedule()
 
     def _disconnect_mic(self):
-        """Disconnect microphone"""
+        """Disconnect selected microphone"""
+        self.updates.begin_action("disconnect")
+        device = self._selected_device()
         self.progress_bar.visible = True
         self.status_text.value = "Disconnecting..."
-        self.page.update()
+        self.updates.schedule()
 
         def do_disconnect():
-            if self.test_loopback_id:
+            session = self.connector.sessions.get(device.name) if device else None
+            if self.test_loopback_id and session and not session.dedicated:
                 self.connector.stop_monitoring(self.test_loopback_id)
+                self.test_loopback_id = None
 
-            success, message = self.connector.disconnect_microphone()
+            success, message = self.connector.disconnect_microphone(device)
             self.page.run_thread(lambda: self._on_disconnect_complete(success, message))
 
         threading.Thread(target=do_disconnect, daemon=True).start()
 
+    @timed("ui._on_disconnect_complete")
     def _on_disconnect_complete(self, success, message):
         """Handle disconnection complete"""
         self.progress_bar.visible = False
 
         if success:
-            self.status_text.value = "Ready to connect"
-            self.status_text.color = ft.Colors.GREEN_200
-            self.connect_btn.disabled = False
-            self.disconnect_btn.disabled = True
-            self.test_btn.disabled = True
-            self.test_loopback_id = None
+            self._update_status()
+            self._update_buttons()
             self._show_snackbar(message, ft.Colors.BLUE_400)
         else:
             self.status_text.value = "Disconnection error"
             self.status_text.color = ft.Colors.RED_200
             self._show_snackbar(f"Error: {message}", ft.Colors.RED_400)
 
-        self.page.update()
+        self.updates.schedule()
 
     def _apply_settings(self):
         """Apply settings"""
+        self.updates.begin_action("apply settings")
         self.progress_bar.visible = True
         self.status_text.value = "Applying settings..."
-        self.page.update()
+        self.updates.schedule()
 
         def do_apply():
             success, message = self.connector.apply_settings()
@@ -254,6 +442,7 @@ class MainWindow:
 
         threading.Thread(target=do_apply, daemon=True).start()
 
+    @timed("ui._on_settings_applied")
     def _on_settings_applied(self, success, message):
         """Handle settings applied"""
         self.progress_bar.visible = False
@@ -266,10 +455,124 @@ class MainWindow:
             self.status_text.color = ft.Colors.RED_200
             self._show_snackbar(f"Error: {message}", ft.Colors.RED_400)
 
-        self.page.update()
+        self.updates.schedule()
+
+    def _refresh_profiles(self):
+        """Fill profile dropdown, select profile of selected device"""
+        device = self._selected_device()
+        settings = self.connector.settings
+        self.profile_dropdown.options = [ft.dropdown.Option(NO_PROFILE)] + [
+            ft.dropdown.Option(name) for name in sorted(settings.profiles)
+        ]
+        self.profile_dropdown.value = (
+            settings.active_profiles.get(device.name, NO_PROFILE)
+            if device
+            else NO_PROFILE
+        )
+        self.updates.schedule(self.profile_dropdown)
+
+    def _switch_profile(self, name: str):
+        """Move selected microphone to chain of profile"""
+        self.updates.begin_action("switch profile")
+        device = self._selected_device()
+        if not device:
+            self._show_snackbar("Select microphone from list", ft.Colors.RED_400)
+            self._refresh_profiles()
+            return
+
+        profile = None if name == NO_PROFILE else name
+
+        def do_switch():
+            success, message = self.connector.switch_profile(device.name, profile)
+            self.page.run_thread(lambda: self._on_profile_switched(success, message))
+
+        threading.Thread(target=do_switch, daemon=True).start()
+
+    def _on_profile_switched(self, success, message):
+        """Handle profile switch complete"""
+        if success:
+            self._update_status()
+            self._show_snackbar(message, ft.Colors.GREEN_400)
+        else:
+            self._show_snackbar(f"Error: {message}", ft.Colors.RED_400)
+        self._refresh_profiles()
+
+    def _save_profile(self):
+        """Store slider attenuation as named profile with its own chain"""
+        self.updates.begin_action("save profile")
+        name = (self.profile_name_field.value or "").strip()
+        attenuation = round(self.noise_attenuation_slider.value, 1)
+        self.progress_bar.visible = True
+        self.status_text.value = f"Saving profile {name}..."
+        self.updates.schedule()
+
+        def do_save():
+            success, message = self.connector.save_profile(name, attenuation)
+            self.page.run_thread(lambda: self._on_profile_saved(success, message))
+
+        threading.Thread(target=do_save, daemon=True).start()
+
+    def _on_profile_saved(self, success, message):
+        """Handle profile saved"""
+        self.progress_bar.visible = False
+        if success:
+            self._update_status()
+            self._show_snackbar(message, ft.Colors.GREEN_400)
+        else:
+            self.status_text.value = "Error saving profile"
+            self.status_text.color = ft.Colors.RED_200
+            self._show_snackbar(f"Error: {message}", ft.Colors.RED_400)
+        self._refresh_profiles()
+
+    def _tune_latency(self):
+        """Find lowest stable latency for selected microphone"""
+        self.updates.begin_action("tune")
+        device = self._selected_device()
+        if not device:
+            self._show_snackbar("Select microphone from list", ft.Colors.RED_400)
+            return
+
+        self.progress_bar.visible = True
+        self.tune_btn.disabled = True
+        self.status_text.value = "Tuning latency..."
+        self.updates.schedule()
+
+        def show_progress(message):
+            self.page.run_thread(lambda: self._on_tune_progress(message))
+
+        def do_tune():
+            success, message = self.connector.tune_latency(
+                device, progress=show_progress
+            )
+            self.page.run_thread(lambda: self._on_tune_complete(success, message))
+
+        threading.Thread(target=do_tune, daemon=True).start()
+
+    def _on_tune_progress(self, message):
+        """Show current tuning or measuring step"""
+        self.status_text.value = message
+        self.updates.schedule()
+
+    @timed("ui._on_tune_complete")
+    def _on_tune_complete(self, success, message):
+        """Handle latency tuning complete"""
+        self.progress_bar.visible = False
+        self.tune_btn.disabled = False
+
+        if success:
+            self._update_status()
+            self._update_buttons()
+            self._show_snackbar(message, ft.Colors.GREEN_400)
+        else:
+            self.status_text.value = "Latency tuning error"
+            self.status_text.color = ft.Colors.RED_200
+            self._show_snackbar(f"Error: {message}", ft.Colors.RED_400)
+
+        self.updates.schedule()
 
     def _toggle_monitoring(self):
         """Toggle monitoring"""
+        self.updates.begin_action("monitoring")
         if self.test_loopback_id:
             self._stop_monitoring()
         else:
@@ -283,7 +586,7 @@ class MainWindow:
 
         self.progress_bar.visible = True
         self.status_text.value = "Starting monitoring..."
-        self.page.update()
+        self.updates.schedule()
 
         def do_start():
             success, result = self.connector.start_monitoring()
@@ -291,29 +594,41 @@ class MainWindow:
 
         threading.Thread(target=do_start, daemon=True).start()
 
+    @timed("ui._on_monitoring_start")
     def _on_monitoring_start(self, success, result):
         """Handle monitoring started"""
         self.progress_bar.visible = False
 
         if success:
-            self.test_loopback_id = result
-            self.status_text.value = "Monitoring in progress..."
-            self.status_text.color = ft.Colors.BLUE_200
-            self.test_btn.text = "Stop Test"
-            self.test_btn.icon = ft.Icons.STOP
+            self._show_monitoring(result)
             self._show_snackbar("Monitoring started", ft.Colors.GREEN_400)
         else:
             self.status_text.value = "Error starting monitoring"
             self.status_text.color = ft.Colors.RED_200
             self._show_snackbar(f"Error: {result}", ft.Colors.RED_400)
 
-        self.page.update()
+        self.updates.schedule()
+
+    def _show_monitoring(self, loopback_id):
+        """Show test state, also when it was started by another client"""
+        if loopback_id == self.test_loopback_id:
+            return
+        self.test_loopback_id = loopback_id
+        if loopback_id:
+            self.status_text.value = "Monitoring in progress..."
+            self.status_text.color = ft.Colors.BLUE_200
+            self.test_btn.text = "Stop Test"
+            self.test_btn.icon = ft.Icons.STOP
+        else:
+            self._update_status()
+            self.test_btn.text = "Real-time Test"
+            self.test_btn.icon = ft.Icons.HEARING
 
     def _stop_monitoring(self):
         """Stop monitoring"""
         self.progress_bar.visible = True
         self.status_text.value = "Stopping monitoring..."
-        self.page.update()
+        self.updates.schedule()
 
         def do_stop():
             success, message = self.connector.stop_monitoring(self.test_loopback_id)
@@ -321,23 +636,459 @@ class MainWindow:
 
         threading.Thread(target=do_stop, daemon=True).start()
 
+    @timed("ui._on_monitoring_stop")
     def _on_monitoring_stop(self, success, message):
         """Handle monitoring stopped"""
         self.progress_bar.visible = False
 
         if success:
-            self.test_loopback_id = None
-            self.status_text.value = f"Connected: {self.devices_dropdown.value}"
-            self.status_text.color = ft.Colors.GREEN_200
-            self.test_btn.text = "Real-time Test"
-            self.test_btn.icon = ft.Icons.HEARING
+            self._show_monitoring(None)
             self._show_snackbar("Monitoring stopped", ft.Colors.BLUE_400)
         else:
             self.status_text.value = "Error stopping monitoring"
             self.status_text.color = ft.Colors.RED_200
             self._show_snackbar(f"Error: {message}", ft.Colors.RED_400)
 
-        self.page.update()
+        self.updates.schedule()
+
+    def _measure_latency(self):
+        """Play probes through chain of selected microphone"""
+        self.updates.begin_action("measure latency")
+        device = self._selected_device()
+        self.progress_bar.visible = True
+        self.measure_btn.disabled = True
+        self.status_text.value = "Measuring latency..."
+        self.updates.schedule()
+
+        def show_progress(message):
+            self.page.run_thread(lambda: self._on_tune_progress(message))
+
+        def do_measure():
+            measurement, message = self.connector.measure_latency(
+                device.name if device else None, progress=show_progress
+            )
+            self.page.run_thread(
+                lambda: self._on_measure_complete(measurement, message)
+            )
+
+        threading.Thread(target=do_measure, daemon=True).start()
+
+    @timed("ui._on_measure_complete")
+    def _on_measure_complete(self, measurement, message):
+        """Show measured delay next to earlier measurements"""
+        self.progress_bar.visible = False
+        self.measure_btn.disabled = False
+        self._update_status()
+
+        if measurement:
+            self.latency_text.value = message
+            self._show_snackbar(
+                f"Chain delay {measurement.delay_ms:.1f} ms", ft.Colors.GREEN_400
+            )
+        else:
+            self._show_snackbar(f"Error: {message}", ft.Colors.RED_400)
+        self._refresh_latency_history()
+        self.updates.schedule()
+
+    def _refresh_latency_history(self):
+        """Compare stored measurements per latency setting"""
+        from models.latency_measurement import group_by_settings
+
+        measurements = self.connector.config_manager.load_latency_measurements()
+        lines = [f"{'settings':<36}{'runs':>5}{'delay':>9}{'jitter':>8}"]
+        for key, group in group_by_settings(measurements).items():
+            latest = group[-1]
+            lines.append(
+                f"{key:<36}{len(group):>5}"
+                f"{latest.delay_ms:>9.1f}{latest.jitter_ms:>8.2f}"
+            )
+        self.latency_history_text.value = (
+            "\n".join(lines) + "\n(latest run per setting, ms)" if measurements else ""
+        )
+
+    def _create_latency_card(self) -> ft.Card:
+        """Create panel with measured chain delay"""
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Column(
+                    [
+                        ft.Row(
+                            [
+                                ft.Text(
+                                    "Measured Latency",
+                                    size=18,
+                                    weight=ft.FontWeight.BOLD,
+                                    color=ft.Colors.BLUE_200,
+                                ),
+                                self.measure_btn,
+                            ]
+                        ),
+                        ft.Divider(height=1, thickness=1),
+                        self.latency_text,
+                        self.latency_history_text,
+                        ft.Text(
+                            "Chirps are played into the filter chain and found in "
+                            "its output; you may hear them while monitoring",
+                            size=11,
+                            color=ft.Colors.GREY_400,
+                            italic=True,
+                        ),
+                    ]
+                ),
+                padding=15,
+            ),
+            elevation=2,
+        )
+
+    def _toggle_meters(self, enabled: bool):
+        """Start or stop level meters"""
+        self.updates.begin_action("meters")
+        if enabled:
+            self._start_meters()
+        else:
+            self._stop_meters()
+        self.updates.schedule()
+
+    def _start_meters(self):
+        """Capture raw microphone and filter output of selected device"""
+        device = self._selected_device()
+        if not device:
+            self.meters_switch.value = False
+            self._show_snackbar("Select microphone from list", ft.Colors.RED_400)
+            return
+
+        try:
+            from core.level_meter import LevelMeter
+        except ImportError:
+            self.meters_switch.value = False
+            self._show_snackbar("Install numpy to show level meters", ft.Colors.RED_400)
+            return
+
+        output_node = self.connector._chain_for(device.name).output_node
+        for target, view in (
+            (device.name, self.mic_meter),
+            (output_node, self.output_meter),
+        ):
+            meter = LevelMeter(
+                target,
+                lambda reading, view=view: self._show_reading(view, reading),
+                self.connector.controller,
+                spectrum=bool(self.spectrum_switch.value),
+            )
+            if meter.start():
+                self.level_meters.append(meter)
+
+    def _show_reading(self, view: LevelMeterView, reading):
+        """Show meter reading with the next UI frame"""
+        view.show(reading)
+        self.updates.schedule(view.control)
+
+    def _stop_meters(self):
+        """Stop level meters"""
+        for meter in self.level_meters:
+            meter.stop()
+        self.level_meters = []
+        self.mic_meter.reset()
+        self.output_meter.reset()
+
+    def _toggle_spectrum(self, enabled: bool):
+        """Show or hide spectrum of running meters"""
+        self.updates.begin_action("spectrum")
+        for meter in self.level_meters:
+            meter.spectrum = enabled
+        for view in (self.mic_meter, self.output_meter):
+            view.set_spectrum_visible(enabled)
+            if not enabled:
+                view.spectrum_row.controls.clear()
+        self.updates.schedule()
+
+    def _toggle_dsp(self, enabled: bool):
+        """Start or stop DSP load sampling"""
+        self.updates.begin_action("dsp")
+        if enabled:
+            from core.dsp_monitor import DspMonitor
+
+            self.dsp_monitor = DspMonitor(
+                self.connector.controller,
+                self.connector.dsp_targets,
+                self.connector.settings.dsp_alert_percent,
+                on_sample=self._show_dsp,
+                on_alert=self._on_dsp_alert,
+            )
+            self.dsp_monitor.start()
+        elif self.dsp_monitor:
+            self.dsp_monitor.stop()
+            self.dsp_monitor = None
+            self.dsp_views = {}
+            self.dsp_column.controls.clear()
+        self.updates.schedule()
+
+    def _show_dsp(self, series):
+        """Show sampled DSP load with the next UI frame"""
+        alert_percent = self.connector.settings.dsp_alert_percent
+        for label, data in sorted(series.items()):
+            view = self.dsp_views.get(label)
+            if view is None:
+                view = self.dsp_views[label] = SparklineView(label, alert_percent)
+                self.dsp_column.controls.append(view.control)
+            view.show(data)
+        self.updates.schedule(self.dsp_column)
+
+    def _on_dsp_alert(self, series):
+        self._show_snackbar(
+            f"{series.label}: DSP load {series.load.last():.0f}%", ft.Colors.RED_400
+        )
+
+    def _toggle_gate(self, enabled: bool):
+        """Start or stop bypassing chains of silent microphones"""
+        self.updates.begin_action("gate")
+
+        def do_toggle():
+            if enabled:
+                success, message = self.connector.start_gate(
+                    on_change=lambda: self.page.run_thread(self._show_gate)
+                )
+            else:
+                success, message = self.connector.stop_gate()
+            self.page.run_thread(lambda: self._on_gate_toggled(success, message))
+
+        threading.Thread(target=do_toggle, daemon=True).start()
+
+    def _on_gate_toggled(self, success, message):
+        if not success:
+            self.gate_switch.value = False
+            self._show_snackbar(f"Error: {message}", ft.Colors.RED_400)
+        self._show_gate()
+
+    def _show_gate(self):
+        """Show bypass share and CPU saved per microphone"""
+        if self.gate_switch.value:
+            stats = self.connector.gate_stats()
+            self.gate_text.value = "\n".join(s.summary() for s in stats)
+        else:
+            self.gate_text.value = ""
+        self.updates.schedule(self.gate_text)
+
+    def _create_dsp_card(self) -> ft.Card:
+        """Create panel with DSP load history of chains and loopbacks"""
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Column(
+                    [
+                        ft.Row(
+                            [
+                                ft.Text(
+                                    "DSP Load",
+                                    size=18,
+                                    weight=ft.FontWeight.BOLD,
+                                    color=ft.Colors.BLUE_200,
+                                ),
+                                self.dsp_switch,
+                            ]
+                        ),
+                        ft.Divider(height=1, thickness=1),
+                        self.dsp_hint,
+                        self.dsp_column,
+                        self.gate_switch,
+                        self.gate_text,
+                    ]
+                ),
+                padding=15,
+            ),
+            elevation=2,
+        )
+
+    def _create_meters_card(self) -> ft.Card:
+        """Create panel with live input and output levels"""
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Column(
+                    [
+                        ft.Row(
+                            [
+                                ft.Text(
+                                    "Levels",
+                                    size=18,
+                                    weight=ft.FontWeight.BOLD,
+                                    color=ft.Colors.BLUE_200,
+                                ),
+                                self.meters_switch,
+                                self.spectrum_switch,
+                            ]
+                        ),
+                        ft.Divider(height=1, thickness=1),
+                        self.mic_meter.control,
+                        self.output_meter.control,
+                    ]
+                ),
+                padding=15,
+            ),
+            elevation=2,
+        )
+
+    def _on_files_picked(self, e):
+        """Denoise picked files next to the originals"""
+        self.updates.begin_action("batch")
+        if not e.files:
+            return
+        paths = [f.path for f in e.files if f.path]
+
+        self.batch_btn.disabled = True
+        self.batch_progress.visible = True
+        self.batch_progress.value = 0
+        self.batch_text.value = f"Denoising {len(paths)} files..."
+        self.updates.schedule()
+
+        def show_progress(progress):
+            self.page.run_thread(lambda: self._on_batch_progress(progress, len(paths)))
+
+        def do_batch():
+            from core.batch_processor import BatchProcessor, output_path_for
+            from models.batch_job import BatchJob
+
+            config = self.connector.config_manager.desired_config()
+            jobs = [
+                BatchJob(
+                    path,
+                    output_path_for(path),
+                    config.plugin,
+                    config.label,
+                    config.controls,
+                )
+                for path in paths
+            ]
+            results = BatchProcessor().run(jobs, show_progress)
+            self.page.run_thread(lambda: self._on_batch_complete(results))
+
+        threading.Thread(target=do_batch, daemon=True).start()
+
+    def _on_batch_progress(self, progress, total: int):
+        """Show progress of file being denoised"""
+        self.batch_progress.value = progress.fraction
+        self.batch_text.value = (
+            f"File {progress.index + 1}/{total}: {progress.fraction:.0%}, "
+            f"real-time factor {progress.realtime_factor:.3f}"
+        )
+        self.updates.schedule()
+
+    @timed("ui._on_batch_complete")
+    def _on_batch_complete(self, results):
+        """Handle batch denoising complete"""
+        self.batch_btn.disabled = False
+        self.batch_progress.visible = False
+
+        failed = [r for r in results if not r.success]
+        done = [r for r in results if r.success]
+        audio = sum(r.duration for r in done)
+        seconds = sum(r.seconds for r in done)
+        self.batch_text.value = (
+            f"Denoised {len(done)} files, {audio:.0f} s of audio "
+            f"(real-time factor {seconds / audio if audio else 0:.3f})"
+        )
+        if failed:
+            self._show_snackbar(
+                f"Error: {failed[0].input_path}: {failed[0].error}", ft.Colors.RED_400
+            )
+        else:
+            self._show_snackbar("Batch denoising finished", ft.Colors.GREEN_400)
+        self.updates.schedule()
+
+    def _create_batch_card(self) -> ft.Card:
+        """Create panel for offline denoising of audio files"""
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Column(
+                    [
+                        ft.Text(
+                            "Batch Denoising",
+                            size=18,
+                            weight=ft.FontWeight.BOLD,
+                            color=ft.Colors.BLUE_200,
+                        ),
+                        ft.Divider(height=1, thickness=1),
+                        self.batch_btn,
+                        self.batch_progress,
+                        self.batch_text,
+                        ft.Text(
+                            "Files are processed in-process with the LADSPA plugin "
+                            "and saved as <name>.denoised.<ext>",
+                            size=11,
+                            color=ft.Colors.GREY_400,
+                            italic=True,
+                        ),
+                    ]
+                ),
+                padding=15,
+            ),
+            elevation=2,
+        )
+
+    def _refresh_metrics(self):
+        """Show latency histograms in debug panel"""
+        lines = [
+            f"{'operation':<40}{'count':>7}{'err':>5}{'p50':>8}{'p95':>8}{'max':>9}"
+        ]
+        for name, data in metrics.snapshot().items():
+            lines.append(
+                f"{name:<40}{data['count']:>7}{data['errors']:>5}"
+                f"{data['p50_ms']:>8}{data['p95_ms']:>8}{data['max_ms']:>9.1f}"
+            )
+        lines.append("(latency in ms)")
+
+        stats = self.updates.action_stats()
+        if stats:
+            lines.append("")
+            lines.append(f"{'user action':<40}{'count':>7}{'msgs':>8}{'ms':>9}")
+            for action, data in sorted(stats.items()):
+                lines.append(
+                    f"{action:<40}{data['actions']:>7}"
+                    f"{data['messages']:>8}{data['ms']:>9}"
+                )
+            lines.append("(client messages and update ms per action)")
+        self.metrics_text.value = "\n".join(lines)
+        self.updates.schedule()
+
+    def _export_metrics(self):
+        """Dump latency histograms to JSON file"""
+        metrics.dump_json(METRICS_JSON_PATH)
+        if metrics.prometheus_path:
+            metrics.write_prometheus(metrics.prometheus_path)
+        self._show_snackbar(f"Metrics saved to {METRICS_JSON_PATH}", ft.Colors.BLUE_400)
+
+    def _create_debug_panel(self) -> ft.Card:
+        """Create panel with operation latency histograms"""
+        return ft.Card(
+            content=ft.Container(
+                content=ft.Column(
+                    [
+                        ft.Text(
+                            "Debug: Operation Latency",
+                            size=18,
+                            weight=ft.FontWeight.BOLD,
+                            color=ft.Colors.BLUE_200,
+                        ),
+                        ft.Divider(height=1, thickness=1),
+                        self.metrics_text,
+                        ft.Row(
+                            [
+                                ft.TextButton(
+                                    "Refresh",
+                                    icon=ft.Icons.REFRESH,
+                                    on_click=lambda _: self._refresh_metrics(),
+                                ),
+                                ft.TextButton(
+                                    "Export JSON",
+                                    icon=ft.Icons.SAVE,
+                                    on_click=lambda _: self._export_metrics(),
+                                ),
+                            ]
+                        ),
+                    ]
+                ),
+                padding=15,
+            ),
+            elevation=2,
+        )
 
     def initialize(self):
         """Initialize and build UI"""
@@ -349,7 +1100,7 @@ class MainWindow:
             padding=10,
         )
 
-        controls_row = ft.Row([self.devices_dropdown])
+        controls_row = ft.Row([self.devices_dropdown, self.dedicated_checkbox])
 
         buttons_row1 = ft.Row(
             [
@@ -359,7 +1110,7 @@ class MainWindow:
             ]
         )
 
-        buttons_row2 = ft.Row([self.refresh_btn])
+        buttons_row2 = ft.Row([self.refresh_btn, self.tune_btn])
 
         settings_card = ft.Card(
             content=ft.Container(
@@ -380,10 +1131,24 @@ class MainWindow:
                             color=ft.Colors.GREY_400,
                         ),
                         ft.Container(height=10),
+                        ft.Row(
+                            [
+                                self.profile_dropdown,
+                                self.profile_name_field,
+                                self.save_profile_btn,
+                            ]
+                        ),
+                        ft.Text(
+                            "Profiles keep their chains running, switching is instant. "
+                            f'Record from "{PROFILE_DESCRIPTION}" to follow them.',
+                            size=11,
+                            color=ft.Colors.GREY_400,
+                        ),
+                        ft.Container(height=10),
                         self.apply_settings_btn,
                         ft.Text(
-                            "Settings require PipeWire restart.\n"
-                            "Connection will be restored automatically.",
+                            "Settings are applied live when possible.\n"
+                            "Otherwise PipeWire is restarted and the connection restored.",
                             size=11,
                             color=ft.Colors.GREY_400,
                             italic=True,
@@ -402,12 +1167,25 @@ class MainWindow:
                 buttons_row1,
                 buttons_row2,
                 settings_card,
+                self._create_meters_card(),
+                self._create_dsp_card(),
+                self._create_latency_card(),
+                self._create_batch_card(),
                 self.devices_info,
             ],
             spacing=15,
+            scroll=ft.ScrollMode.AUTO,
         )
 
+        if metrics.enabled:
+            main_column.controls.append(self._create_debug_panel())
+
+        self.page.overlay.append(self.file_picker)
+        self._refresh_latency_history()
+        self._refresh_profiles()
+        self._show_cached_state()
         self.page.add(main_column)
+        self._record_startup("ui.startup first frame")
 
-        # Auto-refresh on startup
+        # Reconcile cached state with the graph in the background
         self._refresh_devices()
@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from system.metrics import metrics
+
+FRAME_INTERVAL = 1 / 30
+SLIDER_INTERVAL = 0.15
+
+
+class UpdateScheduler:
+    """Collect dirty controls and send them to the client once per frame"""
+
+    def __init__(self, page, frame_interval: float = FRAME_INTERVAL):
+        self.page = page
+        self.frame_interval = frame_interval
+        self._lock = threading.Lock()
+        self._dirty: Dict[int, object] = {}
+        self._page_dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self._last_flush = 0.0
+        self.action = "startup"
+        # User action -> times it was taken
+        self.actions: Dict[str, int] = {"startup": 1}
+
+    def begin_action(self, name: str):
+        """Attribute following messages to user action"""
+        self.action = name
+        self.actions[name] = self.actions.get(name, 0) + 1
+
+    def schedule(self, *controls):
+        """Mark controls dirty, the whole page if none given"""
+        with self._lock:
+            if controls:
+                for control in controls:
+                    self._dirty[id(control)] = control
+            else:
+                self._page_dirty = True
+            if self._timer is not None:
+                return
+            delay = max(0.0, self._last_flush + self.frame_interval - time.monotonic())
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Send pending changes in one message"""
+        with self._lock:
+            self._timer = None
+            page_dirty, self._page_dirty = self._page_dirty, False
+            controls = [] if page_dirty else list(self._dirty.values())
+            self._dirty.clear()
+            self._last_flush = time.monotonic()
+        if not page_dirty and not controls:
+            return
+
+        start = time.perf_counter()
+        try:
+            self.page.update(*controls)
+        except Exception as e:
+            print(f"UI update error: {e}")
+            return
+        if metrics.enabled:
+            metrics.record(
+                f"ui.update {self.action}", (time.perf_counter() - start) * 1000, 0, 0
+            )
+
+    def action_stats(self) -> Dict[str, Dict[str, float]]:
+        """Client messages and update time per user action"""
+        snapshot = metrics.snapshot()
+        stats = {}
+        for action, count in self.actions.items():
+            updates = snapshot.get(f"ui.update {action}", {"count": 0, "sum_ms": 0.0})
+            stats[action] = {
+                "actions": count,
+                "messages": round(updates["count"] / count, 2),
+                "ms": round(updates["sum_ms"] / count, 2),
+            }
+        return stats
+
+
+class Throttle:
+    """Call at most once per interval, always ending with the latest arguments"""
+
+    def __init__(self, callback: Callable, interval: float = SLIDER_INTERVAL):
+        self.callback = callback
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._pending: Optional[List] = None
+        self._timer: Optional[threading.Timer] = None
+        self._last_call = 0.0
+
+    def __call__(self, *args):
+        with self._lock:
+            self._pending = list(args)
+            if self._timer is not None:
+                return
+            delay = max(0.0, self._last_call + self.interval - time.monotonic())
+            self._timer = threading.Timer(delay, self._fire)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self):
+        with self._lock:
+            args, self._pending = self._pending, None
+            self._timer = None
+            self._last_call = time.monotonic()
+        if args is not None:
+            self.callback(*args)